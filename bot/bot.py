@@ -1,17 +1,28 @@
 import atexit
 import subprocess
+import threading
+import time
 
 import os
-from telegram.ext import Updater, PicklePersistence, CommandHandler, CallbackQueryHandler, MessageHandler, Filters
-from telegram import TelegramError
+from telegram import Update
+from telegram.ext import Updater, CommandHandler, CallbackQueryHandler, MessageHandler, Filters, CallbackContext, \
+    TypeHandler
 
-from constants.constants import JOB_INTERVAL_IN_SECONDS, session_data_path
-from constants.env_variables import TELEGRAM_BOT_TOKEN, SLACK_WEBHOOK, SENTRY_NODES, DEBUG, LCD_ENDPOINT, NODE_IP
+from constants.constants import session_data_path, session_database_path
+from constants.env_variables import TELEGRAM_BOT_TOKEN, SLACK_WEBHOOK, SENTRY_NODES, DEBUG, LCD_ENDPOINT, NODE_IP, \
+    NODE_WEBSOCKET
 from constants.logger import logger
 from constants.messages import BOT_STARTUP_MSG, BOT_RESTARTED_MSG
 from jobs.sentry_jobs import setup_sentry_jobs
-from jobs.jobs import node_checks
+from jobs.jobs import setup_monitoring_jobs
 from handlers.message_handlers import start, cancel, dispatch_query, plain_input
+from helpers import try_message
+from service.block_stream_service import block_stream
+from service.message_queue_service import message_queue, NOTICE_PRIORITY
+from service.metrics_service import set_gauge
+from service.persistence_service import SqlitePersistence, compact_user_data
+from service.slack_service import slack_outbox
+from service.subscription_service import subscription_index
 
 """
 ######################################################################################################################################################
@@ -26,14 +37,20 @@ if DEBUG:
     increase_block_height_path = os.sep.join([test_dir, "increase_block_height.py"])
     update_local_price_feed_path = os.sep.join([test_dir, "update_price_feed.py"])
 
+    block_stream_stand_in_path = os.sep.join([test_dir, "block_stream_stand_in.py"])
+
     increase_block_height_process = subprocess.Popen(['python3', increase_block_height_path], cwd=test_dir)
     update_local_price_feed = subprocess.Popen(['python3', update_local_price_feed_path], cwd=test_dir)
+    block_stream_stand_in_process = subprocess.Popen(['python3', block_stream_stand_in_path], cwd=test_dir) \
+        if NODE_WEBSOCKET else None
 
 
     def cleanup():
         mock_api_process.terminate()
         increase_block_height_process.terminate()
         update_local_price_feed.terminate()
+        if block_stream_stand_in_process:
+            block_stream_stand_in_process.terminate()
 
 
     atexit.register(cleanup)
@@ -46,38 +63,33 @@ BOT RESTART SETUP
 
 def setup_existing_user(dispatcher):
     """
-    Tasks to ensure smooth user experience for existing users upon Bot restart
+    Tasks to ensure smooth user experience for existing users upon Bot restart.
+    The restart notices are queued with the lowest priority and sent in the background by the rate limited
+    message queue, so replies to users are not held up. Users that blocked the bot are removed when sending.
+    """
+
+    context = CallbackContext(dispatcher)
+    for chat_id in list(dispatcher.user_data.keys()):
+        try_message(context=context, chat_id=chat_id, text=BOT_RESTARTED_MSG, priority=NOTICE_PRIORITY)
+
+
+def measure_time_to_first_update(dispatcher, startup_start):
+    """
+    Record how long after startup the bot handles the first update of a user
     """
 
-    chat_ids = dispatcher.user_data.keys()
-    delete_chat_ids = []
-    for chat_id in chat_ids:
-        try:
-            dispatcher.bot.send_message(chat_id, BOT_RESTARTED_MSG)
-            dispatcher.job_queue.run_repeating(node_checks,
-                                               interval=JOB_INTERVAL_IN_SECONDS,
-                                               context={
-                                                   'chat_id': chat_id,
-                                                   'user_data': dispatcher.user_data[chat_id]
-                                               })
-        except TelegramError as e:
-            if 'bot was blocked by the user' in e.message:
-                delete_chat_ids.append(chat_id)
-                continue
-            else:
-                logger.error("Got Error\n" + str(e) + "\nwith telegram user " + str(chat_id))
-
-    for chat_id in delete_chat_ids:
-        logger.info("Telegram user " + str(chat_id) + " blocked me; removing him from the user list")
-        del dispatcher.user_data[chat_id]
-        del dispatcher.chat_data[chat_id]
-        del dispatcher.persistence.user_data[chat_id]
-        del dispatcher.persistence.chat_data[chat_id]
-
-        # Somehow session.data does not get updated if all users block the bot.
-        # That's why we delete the file ourselves.
-        if len(dispatcher.persistence.user_data) == 0 and os.path.exists(session_data_path):
-            os.remove(session_data_path)
+    handled = threading.Event()
+
+    def on_update(_, __):
+        if handled.is_set():
+            return
+        handled.set()
+        seconds = time.monotonic() - startup_start
+        set_gauge('startup.seconds_to_first_update', seconds)
+        logger.info(f"Handling the first update {seconds:.2f}s after startup")
+
+    # Handlers in a lower group run before the actual handlers
+    dispatcher.add_handler(TypeHandler(Update, on_update), group=-1)
 
 
 def main():
@@ -85,20 +97,30 @@ def main():
     Init telegram bot, attach handlers and wait for incoming requests.
     """
 
+    startup_start = time.monotonic()
+
     # Init telegram bot
-    bot = Updater(TELEGRAM_BOT_TOKEN, persistence=PicklePersistence(filename=session_data_path), use_context=True)
+    persistence = SqlitePersistence(filename=session_database_path, pickle_filename=session_data_path)
+    bot = Updater(TELEGRAM_BOT_TOKEN, persistence=persistence, use_context=True)
     dispatcher = bot.dispatcher
 
-    setup_existing_user(dispatcher=dispatcher)
-    setup_sentry_jobs(dispatcher=dispatcher)
+    compact_user_data(dispatcher.user_data)
+    subscription_index.rebuild(dispatcher.user_data)
 
+    measure_time_to_first_update(dispatcher, startup_start)
     dispatcher.add_handler(CommandHandler('start', start, run_async=True))
     dispatcher.add_handler(CommandHandler('cancel', cancel, run_async=True))
     dispatcher.add_handler(CallbackQueryHandler(dispatch_query, run_async=True))
     dispatcher.add_handler(MessageHandler(Filters.text, plain_input, run_async=True))
 
-    # Start the bot
+    # Start polling first so that users get answers right away, everything else happens in the background
     bot.start_polling()
+    set_gauge('startup.seconds_to_polling', time.monotonic() - startup_start)
+
+    setup_existing_user(dispatcher=dispatcher)
+    setup_monitoring_jobs(dispatcher=dispatcher)
+    setup_sentry_jobs(dispatcher=dispatcher)
+
     logger.info(BOT_STARTUP_MSG)
     logger.info(f"""
     ==========================================================================
@@ -109,6 +131,7 @@ def main():
     LCD endpoint: {LCD_ENDPOINT}
     Sentry nodes: {SENTRY_NODES}
     Node IP: {NODE_IP}
+    Node websocket: {NODE_WEBSOCKET}
     ==========================================================================
     ==========================================================================
     """)
@@ -117,6 +140,11 @@ def main():
     # start_polling() is non-blocking and will stop the bot gracefully.
     bot.idle()
 
+    # Deliver the messages that are still queued before exiting
+    message_queue.join(timeout=10)
+    slack_outbox.join(timeout=10)
+    block_stream.stop(timeout=10)
+
 
 if __name__ == '__main__':
     main()
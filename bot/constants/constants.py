@@ -4,6 +4,11 @@ from constants.env_variables import DEBUG, LCD_ENDPOINT, NETWORK, NODE_IP
 
 VALIDATORS_ENDPOINT = 'http://localhost:8000/validators.json' if DEBUG else f'{LCD_ENDPOINT}staking/validators'
 NODE_STATUS_ENDPOINT = 'http://localhost:8000/status.json' if DEBUG else 'http://' + str(NODE_IP) + ':26657/status'
+NODE_WEBSOCKET_ENDPOINT = 'ws://localhost:8001/websocket' if DEBUG else 'ws://' + str(NODE_IP) + ':26657/websocket'
+ORACLE_VOTER_PREVOTES_ENDPOINT = 'http://localhost:8000/prevotes.json' if DEBUG \
+    else f'{LCD_ENDPOINT}oracle/voters/{{}}/prevotes'
+ORACLE_DENOM_PREVOTES_ENDPOINT = f'{LCD_ENDPOINT}oracle/denoms/{{}}/prevotes'
+ORACLE_ACTIVE_DENOMS_ENDPOINT = f'{LCD_ENDPOINT}oracle/denoms/actives'
 NODE_INFO_ENDPOINT = 'http://localhost:8000/node_info.json' if DEBUG else f'{LCD_ENDPOINT}node_info'
 BLOCK42_TERRA_BOT_USERNAME = '@terranode_bot'
 WEBSITE_URL = 'https://terra-bot.b42.tech/'
@@ -13,8 +18,95 @@ TERRA_STATION_URL = 'https://station.terra.money/'
 
 storage_path = os.sep.join([os.path.dirname(os.path.realpath(__file__)), os.path.pardir, os.path.pardir, 'storage'])
 session_data_path = os.sep.join([storage_path, 'session.data'])
+session_database_path = os.sep.join([storage_path, 'session.db'])
 
 NODE_STATUSES = ["Unbonded", "Unbonding", "Bonded"]
+NODE_STATUS_BONDED = NODE_STATUSES.index("Bonded")
+# The LCD only returns bonded validators by default, so the validator snapshot queries every status explicitly
+VALIDATOR_QUERY_STATUSES = ["bonded", "unbonding", "unbonded"]
+VALIDATOR_QUERY_LIMIT = 1000
+
+# A price feed is unhealthy if one of its prevotes is older than this
+ORACLE_PREVOTE_MAX_AGE_IN_BLOCKS = 10
+ORACLE_ACTIVE_DENOMS_MAX_AGE_IN_SECONDS = 3600
+
+HTTP_POOL_SIZE = 20
+HTTP_RETRY_BACKOFF_FACTOR = 0.3
+HTTP_RETRY_STATUS_CODES = (502, 503, 504)
+FETCH_CONCURRENCY = 10
+
+LCD_FAILURE_THRESHOLD = 2
+# While the LCD is reachable it is probed at the job interval, not on every monitoring tick
+LCD_PROBE_INTERVAL_IN_SECONDS = 15
+LCD_PROBE_INITIAL_BACKOFF_IN_SECONDS = 15
+LCD_PROBE_MAX_BACKOFF_IN_SECONDS = 300
+
+# Telegram allows about 30 messages per second overall and one message per second per chat
+TELEGRAM_SEND_CONCURRENCY = 8
+TELEGRAM_MESSAGES_PER_SECOND = 25
+TELEGRAM_CHAT_MESSAGE_INTERVAL_IN_SECONDS = 1
+
+SLACK_DEDUP_WINDOW_IN_SECONDS = 60
+SLACK_BATCH_DELAY_IN_SECONDS = 2
+SLACK_BATCH_SIZE = 20
+SLACK_MAX_ATTEMPTS = 5
+SLACK_RETRY_INITIAL_BACKOFF_IN_SECONDS = 1
+SLACK_RETRY_MAX_BACKOFF_IN_SECONDS = 60
+
+# Without new blocks for this long, the block stream reports the block height as stuck
+NO_NEW_BLOCK_ALERT_IN_SECONDS = 20
+BLOCK_STREAM_CHECK_INTERVAL_IN_SECONDS = 1
+# A node that receives blocks much later than their block time is catching up
+CATCH_UP_BLOCK_LAG_IN_SECONDS = 60
+BLOCK_STREAM_INITIAL_BACKOFF_IN_SECONDS = 1
+BLOCK_STREAM_MAX_BACKOFF_IN_SECONDS = 60
+BLOCK_STREAM_HEARTBEAT_IN_SECONDS = 30
 
 JOB_INTERVAL_IN_SECONDS = 15
 SENTRY_JOB_INTERVAL_IN_SECONDS = 30
+METRICS_LOG_INTERVAL_IN_SECONDS = 300
+# Terra produces a block about every 6 seconds
+BLOCK_TIME_IN_SECONDS = 6
+# Every monitoring tick only polls the data sources that are due
+MONITORING_TICK_IN_SECONDS = 3
+# Per data source: interval, interval while an incident is open and the maximum interval while nothing changes.
+# Validators change at most once per block of about 6 seconds, governance proposals over days.
+# Validators have no incidents of their own. The node status is polled at least two block times apart during an
+# incident, as the same block height in two polls in a row means that the block height is stuck.
+POLLING_INTERVALS_IN_SECONDS = {
+    'validators': (JOB_INTERVAL_IN_SECONDS, JOB_INTERVAL_IN_SECONDS, 30),
+    'governance': (60, 60, 600),
+    'price_feeds': (30, 10, 60),
+    'node_status': (JOB_INTERVAL_IN_SECONDS, 2 * BLOCK_TIME_IN_SECONDS, JOB_INTERVAL_IN_SECONDS),
+    'sentry_nodes': (SENTRY_JOB_INTERVAL_IN_SECONDS, 10, 120),
+}
+POLLING_BACKOFF_AFTER_UNCHANGED_POLLS = 4
+# The governance proposals are polled less often while they do not change, so the list of active proposals is
+# synced again when a menu shows it after this long
+ACTIVE_PROPOSALS_MAX_AGE_IN_SECONDS = 60
+# A monitoring tick ends within this budget. It is longer than the tick interval, as a tick that polls the validators
+# or the governance proposals takes several LCD round trips; the runs that are due in the meantime are skipped.
+MONITORING_TICK_BUDGET_IN_SECONDS = 8
+# Deadlines of the checks of a monitoring tick. The checks run concurrently, so none of them exceeds the tick budget.
+# Checks that miss their deadline are recorded as unknown for the tick instead of blocking it.
+MONITORING_CHECK_DEADLINES_IN_SECONDS = {
+    'lcd_probe': 3,
+    'validators': MONITORING_TICK_BUDGET_IN_SECONDS,
+    'governance': MONITORING_TICK_BUDGET_IN_SECONDS,
+    'price_feeds': 5,
+    'node_status': 3,
+}
+# Sentry nodes are probed concurrently, each probe has its own timeout and the whole round a deadline
+SENTRY_PROBE_CONCURRENCY = 50
+SENTRY_PROBE_TIMEOUT_IN_SECONDS = 2
+SENTRY_CHECK_DEADLINE_IN_SECONDS = 5
+# The syncing status of a sentry node only changes once this many probes in a row agree, so one bad probe does not
+# alert every chat. Probes that failed neither confirm nor reset a change.
+SENTRY_STATE_CHANGE_AFTER_PROBES = 3
+SENTRY_PROBE_HISTORY_LENGTH = 20
+# Delays of the first job runs after startup, so that the jobs run at different phases of the interval
+# instead of all firing in the same second
+JOB_FIRST_RUN_IN_SECONDS = 5
+SENTRY_JOB_FIRST_RUN_IN_SECONDS = 10
+# A job run that is due while the previous run is still running is skipped, and missed runs are coalesced into one
+SINGLE_RUN_JOB_KWARGS = {'coalesce': True, 'max_instances': 1}
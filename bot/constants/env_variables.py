@@ -46,3 +46,8 @@ SLACK_WEBHOOK = os.environ.get('SLACK_WEBHOOK')
 SENTRY_NODES = read_list_from_env('SENTRY_NODES', str)
 LCD_ENDPOINT = get_lcd_url(network_mode=NETWORK, debug=DEBUG)
 NODE_IP = get_node_ip(debug=DEBUG)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 3.05))
+HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 10))
+HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', 2))
+STREAM_VALIDATORS = bool(os.environ.get('STREAM_VALIDATORS') == "True")
+NODE_WEBSOCKET = bool(os.environ.get('NODE_WEBSOCKET') == "True")
@@ -3,13 +3,13 @@ from typing import Callable
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, LoginUrl
 from terra_sdk.core.gov import MsgVote
 
-from constants.constants import WEBSITE_URL, BLOCK42_TERRA_BOT_USERNAME, TERRA_FINDER_URL
+from constants.constants import WEBSITE_URL, BLOCK42_TERRA_BOT_USERNAME, TERRA_FINDER_URL, \
+    ACTIVE_PROPOSALS_MAX_AGE_IN_SECONDS
 from constants.env_variables import NETWORK
 from constants.logger import logger
 from constants.messages import NO_PROPOSALS_MSG, NETWORK_ERROR_MSG, YOU_WILL_BE_REDIRECTED_MSG, BACK_BUTTON_MSG
 from helpers import try_message
-from service.governance_service import get_active_proposals, get_proposal, proposal_to_text, get_vote, \
-    get_governance_proposals
+from service.governance_service import get_proposal, proposal_to_text, get_vote, get_synced_proposal_store
 from service.vote_delegation_service import get_wallet_addr, vote_delegated
 
 
@@ -45,7 +45,7 @@ def on_show_all_proposals_clicked(update, context):
     _ = query.data.split("-")
 
     try:
-        proposals = get_governance_proposals()
+        proposals = get_synced_proposal_store().all_proposals()
     except Exception as e:
         logger.error(e, exc_info=True)
         try_message(context=context, chat_id=query['message']['chat']['id'], text=NETWORK_ERROR_MSG)
@@ -67,7 +67,7 @@ def on_show_active_proposals_clicked(update, context):
     _ = query.data.split("-")
 
     try:
-        active_proposals = get_active_proposals()
+        active_proposals = get_synced_proposal_store(max_age=ACTIVE_PROPOSALS_MAX_AGE_IN_SECONDS).active_proposals()
     except Exception as e:
         logger.error(e, exc_info=True)
         try_message(context=context, chat_id=query['message']['chat']['id'], text=NETWORK_ERROR_MSG)
@@ -108,7 +108,7 @@ def on_proposal_clicked(update, context):
     previous_view = 'proposals_show_active' if votable else 'proposals_show_all'
 
     try:
-        proposal = get_proposal(int(proposal_id))
+        proposal = get_synced_proposal_store().get(proposal_id) or get_proposal(int(proposal_id))
         context.user_data.setdefault('proposals_cache', {})[proposal_id] = {
             'title': proposal['content']['value']['title']}
     except Exception as e:
@@ -1,15 +1,16 @@
 from telegram import ReplyKeyboardMarkup, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.error import BadRequest
 
-from constants.constants import JOB_INTERVAL_IN_SECONDS
+from constants.constants import NODE_STATUS_BONDED
 from constants.messages import HELLO_MSG
 from handlers.governance_handlers import on_authorize_voting_clicked, on_show_governance_menu_clicked, \
     on_vote_option_clicked, \
     on_proposal_clicked, on_show_active_proposals_clicked, on_show_all_proposals_clicked, \
     on_vote_send_clicked
 from helpers import try_message_with_home_menu, show_my_nodes_paginated, show_detail_menu, get_home_menu_buttons, \
-    get_validator, add_node_to_user_data, show_confirmation_menu, get_validators
-from jobs.jobs import node_checks
+    get_validator, add_node_to_user_data, show_confirmation_menu
+from service.subscription_service import subscription_index
+from service.validator_service import get_cached_validator_snapshot
 
 
 def start(update, context):
@@ -19,16 +20,10 @@ def start(update, context):
 
     context.user_data['expected'] = None
 
-    # Start job for user
+    # Enable monitoring for user, the global monitoring job picks him up on its next run
     if 'job_started' not in context.user_data:
-        context.job_queue.run_repeating(node_checks,
-                                        interval=JOB_INTERVAL_IN_SECONDS,
-                                        context={
-                                            'chat_id': update.message.chat.id,
-                                            'user_data': context.user_data
-                                        })
         context.user_data['job_started'] = True
-        context.user_data['nodes'] = {}
+        context.user_data['nodes'] = set()
 
     text = HELLO_MSG
 
@@ -177,7 +172,8 @@ def handle_add_node(update, context):
         return update.message.reply_text('⛔️ I have not found a Node with this address! ⛔\n'
                                          'Please try another one. (enter /cancel to return to the menu)')
 
-    add_node_to_user_data(context.user_data, address, node)
+    add_node_to_user_data(context.user_data, address)
+    subscription_index.subscribe(update.effective_chat.id, address)
     context.bot.send_message(update.effective_chat.id, 'Got it! 👌')
     return show_my_nodes_paginated(context=context, chat_id=update.effective_chat.id)
 
@@ -217,12 +213,16 @@ def add_all_nodes(update, context):
 
     query = update.callback_query
 
-    nodes = get_validators()
+    try:
+        validator_snapshot = get_cached_validator_snapshot()
+    except ConnectionError:
+        query.edit_message_text('⛔️ I cannot reach the LCD server!⛔\nPlease try again later.')
+        return show_my_nodes_paginated(context, chat_id=update.effective_chat.id)
 
-    for node in nodes:
-        address = node['operator_address']
-        if address not in context.user_data['nodes']:
-            add_node_to_user_data(context.user_data, address, node)
+    new_addresses = validator_snapshot.addresses_with_status(NODE_STATUS_BONDED) - context.user_data['nodes']
+    for address in new_addresses:
+        add_node_to_user_data(context.user_data, address)
+        subscription_index.subscribe(update.effective_chat.id, address)
 
     # Send message
     query.edit_message_text('Added all Terra Nodes! 👌')
@@ -236,6 +236,7 @@ def delete_all_nodes(update, context):
 
     query = update.callback_query
 
+    subscription_index.unsubscribe(update.effective_chat.id, list(context.user_data['nodes']))
     context.user_data['nodes'].clear()
 
     text = '❌ Deleted all Terra Nodes! ❌'
@@ -283,7 +284,8 @@ def delete_node(update, context):
     query = update.callback_query
     address = context.user_data['selected_node_address']
 
-    del context.user_data['nodes'][address]
+    context.user_data['nodes'].discard(address)
+    subscription_index.unsubscribe(update.effective_chat.id, [address])
 
     text = "❌ Node address got deleted! ❌\n" + address
     query.answer(text)
@@ -1,15 +1,17 @@
-import json
-import os
+from functools import partial
 
 import math
-import requests
-from requests.exceptions import RequestException
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, TelegramError, KeyboardButton, ReplyKeyboardMarkup
+from telegram.error import RetryAfter
 
-from constants.constants import NODE_STATUSES, VALIDATORS_ENDPOINT, NODE_INFO_ENDPOINT, NODE_STATUS_ENDPOINT
-from constants.env_variables import SLACK_WEBHOOK, DEBUG
+from constants.constants import NODE_STATUSES
+from constants.env_variables import SLACK_WEBHOOK
 from constants.logger import logger
 from constants.messages import BACK_BUTTON_MSG
+from service.message_queue_service import message_queue, ALERT_PRIORITY, REPLY_PRIORITY
+from service.slack_service import slack_outbox
+from service.subscription_service import subscription_index
+from service.validator_service import get_cached_validator_snapshot, Validator
 
 """
 ######################################################################################################################################################
@@ -18,13 +20,13 @@ Helpers
 """
 
 
-def try_message_with_home_menu(context, chat_id, text, remove_job_when_blocked=True):
+def try_message_with_home_menu(context, chat_id, text, priority=REPLY_PRIORITY):
     keyboard = get_home_menu_buttons()
     try_message(context=context,
                 chat_id=chat_id,
                 text=text,
                 reply_markup=ReplyKeyboardMarkup(keyboard, resize_keyboard=True),
-                remove_job_when_blocked=remove_job_when_blocked)
+                priority=priority)
 
 
 def show_my_nodes_paginated(context, chat_id):
@@ -68,7 +70,7 @@ def get_my_nodes_menu_buttons(user_data):
     keyboard = [[]]
 
     count = 0
-    for address in user_data['nodes'].keys():
+    for address in sorted(user_data['nodes']):
         new_button = InlineKeyboardButton("📡 " + address, callback_data='node_details-' + address)
 
         if count % 2 == 0:
@@ -95,10 +97,19 @@ def show_detail_menu(update, context):
     query = update.callback_query
     address = context.user_data['selected_node_address']
 
-    text = 'Node: *' + address + '*\n' + \
-           'Status: *' + NODE_STATUSES[context.user_data['nodes'][address]['status']] + '*\n' + \
-           'Jailed: *' + str(context.user_data['nodes'][address]['jailed']) + '*\n' + \
-           'Delegator Shares: *' + str(int(float(context.user_data['nodes'][address]['delegator_shares']))) + '*\n\n'
+    # The node details are read from the shared validator snapshot and not stored per user
+    try:
+        node = get_validator(address)
+    except ConnectionError:
+        node = None
+
+    text = 'Node: *' + address + '*\n'
+    if node is not None:
+        text += 'Status: *' + NODE_STATUSES[node.status] + '*\n' + \
+                'Jailed: *' + str(node.jailed) + '*\n' + \
+                'Delegator Shares: *' + str(int(float(node.delegator_shares))) + '*\n\n'
+    else:
+        text += '⛔️ I cannot get the details of this Node right now! ⛔\n\n'
 
     text += "What do you want to do with that Node?"
 
@@ -121,176 +132,83 @@ def show_confirmation_menu(update, text, keyboard):
     query.edit_message_text(text, parse_mode='markdown', reply_markup=InlineKeyboardMarkup(keyboard))
 
 
-def try_message_to_all_platforms(context, chat_id, text):
-    try_message_with_home_menu(context=context, chat_id=chat_id, text=text)
-    send_slack_message(text)
-
+def try_message_to_all_chats_and_platforms(context, text):
+    for chat_id in list(context.dispatcher.chat_data.keys()):
+        try_message_with_home_menu(context, chat_id=chat_id, text=text, priority=ALERT_PRIORITY)
 
-def try_message_to_all_chats_and_platforms(context, text, remove_job_when_blocked=True):
-    for chat_id in context.dispatcher.chat_data.keys():
-        try_message_with_home_menu(context, chat_id=chat_id, text=text, remove_job_when_blocked=remove_job_when_blocked)
 
+def send_slack_message(text, key=None):
+    """
+    Queue a message for the Slack webhook. It is posted in the background, unless it repeats the previous message
+    of the same key within the dedup window.
+    """
 
-def send_slack_message(text):
     if SLACK_WEBHOOK:
-        try:
-            requests.post(SLACK_WEBHOOK, data=json.dumps({'text': text}), headers={'Content-Type': 'application/json'})
-        except RequestException as e:
-            logger.error(f"Slack Webhook post request failed with:\n{e}")
+        slack_outbox.put(text, key=key)
 
 
-def try_message(context, chat_id, text, reply_markup=None, remove_job_when_blocked=True):
+def try_message(context, chat_id, text, reply_markup=None, priority=REPLY_PRIORITY):
+    """
+    Queue a message to a user. It is sent in the background by the rate limited message queue.
+    """
+
+    message_queue.put(chat_id, partial(send_message, context, chat_id, text, reply_markup), priority=priority)
+
+
+def send_message(context, chat_id, text, reply_markup=None):
     """
     Send a message to a user.
+    Users that blocked the bot are removed, which also stops monitoring for them.
+    RetryAfter is raised to the message queue, which sends the message again later.
     """
 
     try:
         context.bot.send_message(chat_id, text, parse_mode='markdown', reply_markup=reply_markup,
                                  disable_web_page_preview=True)
+    except RetryAfter:
+        raise
     except TelegramError as e:
         if 'bot was blocked by the user' in e.message:
             logger.info("Telegram user " + str(chat_id) + " blocked me; removing him from the user list")
-            del context.dispatcher.user_data[chat_id]
-            del context.dispatcher.chat_data[chat_id]
-            del context.dispatcher.persistence.user_data[chat_id]
-            del context.dispatcher.persistence.chat_data[chat_id]
-
-            # Somehow session.data does not get updated if all users block the bot.
-            # That makes problems on bot restart. That's why we delete the file ourselves.
-            if len(context.dispatcher.persistence.user_data) == 0 and os.path.exists("./storage/session.data"):
-                os.remove("./storage/session.data")
-
-            if remove_job_when_blocked:
-                context.job.schedule_removal()
+            # A single monitoring tick can send several messages to the same user, so he might be removed already
+            user_data = context.dispatcher.user_data.pop(chat_id, {})
+            subscription_index.unsubscribe(chat_id, list(user_data.get('nodes', ())))
+            context.dispatcher.chat_data.pop(chat_id, None)
+            context.dispatcher.persistence.drop_user_data(chat_id)
+            context.dispatcher.persistence.drop_chat_data(chat_id)
         else:
             logger.error(e, exc_info=True)
             logger.info("Telegram user " + str(chat_id))
 
 
-def add_node_to_user_data(user_data, address, node):
+def persist_job_data(context, chat_ids=()):
     """
-    Add a node in the user specific dictionary
+    Store the bot data and the user data of the given chats after a job changed them.
+    Jobs do not flush the persistence on their own, and a full flush would pickle the data of every user.
     """
 
-    user_data['nodes'][address] = {}
-    user_data['nodes'][address]['status'] = node['status']
-    user_data['nodes'][address]['jailed'] = node['jailed']
-    user_data['nodes'][address]['delegator_shares'] = node['delegator_shares']
+    persistence = context.dispatcher.persistence
+    if persistence is None:
+        return
 
-
-def get_validators() -> (dict, None):
-    """
-    Return json of all validator nodes
-    """
-
-    if DEBUG:
-        # Get local validator file
-        response = requests.get(VALIDATORS_ENDPOINT)
-        if response.status_code != 200:
-            logger.info("ConnectionError while requesting " + VALIDATORS_ENDPOINT)
-            raise ConnectionError
-        nodes = response.json()
-        return nodes['result']
-    else:
-        response = requests.get(VALIDATORS_ENDPOINT)
-        if response.status_code != 200:
-            if not is_lcd_reachable():
-                logger.info("ConnectionError while requesting " + NODE_INFO_ENDPOINT)
-                raise ConnectionError
-            else:
-                return None
-
-        nodes = response.json()
-        return nodes['result']
+    persistence.update_bot_data(context.dispatcher.bot_data)
+    for chat_id in chat_ids:
+        # Users that blocked the bot were dropped already
+        if chat_id in context.dispatcher.user_data:
+            persistence.update_user_data(chat_id, context.dispatcher.user_data[chat_id])
 
 
-def get_validator(address) -> (dict, None):
+def add_node_to_user_data(user_data, address):
     """
-    Return json of desired validator node
+    Add a node address to the user's monitoring list
     """
 
-    if DEBUG:
-        nodes = get_validators()
-        # Get the right node
-        node = next(filter(lambda node: node['operator_address'] == address, nodes), None)
-        return node
-    else:
-        response = requests.get(VALIDATORS_ENDPOINT + "/" + address)
-
-        if response.status_code != 200:
-            if response.status_code == 500 and ('validator does not exist' in response.json().get('error', '')):
-                return None
-            else:
-                logger.info("ConnectionError while requesting " + NODE_INFO_ENDPOINT)
-                raise ConnectionError
-
-        node = response.json()
-        return node['result']
-
-
-def is_node_catching_up():
-    response = requests.get(url=NODE_STATUS_ENDPOINT)
-    if response.status_code != 200:
-        logger.info("ConnectionError while requesting " + NODE_STATUS_ENDPOINT)
-        raise ConnectionError
+    user_data['nodes'].add(address)
 
-    status = response.json()
-    return status['result']['sync_info']['catching_up']
 
-
-def is_lcd_reachable():
-    """
-    Check whether the public Lite Client Daemon (LCD) is reachable
-    """
-
-    response = requests.get(NODE_INFO_ENDPOINT)
-    return True if response.status_code == 200 else False
-
-
-def get_node_block_height():
-    """
-    Return block height of your Terra Node
-    """
-
-    response = requests.get(url=NODE_STATUS_ENDPOINT)
-    if response.status_code != 200:
-        logger.info("ConnectionError while requesting " + NODE_STATUS_ENDPOINT)
-        raise ConnectionError
-
-    status = response.json()
-    return status['result']['sync_info']['latest_block_height']
-
-
-def is_price_feed_healthy(address):
-    """
-    Check whether price feed is working properly
-    """
-
-    prevotes = get_price_feed_prevotes(address)
-
-    for prevote in prevotes['result']:
-        if int(prevote['submit_block']) < int(prevotes['height']) - 10:
-            return False
-
-    return True
-
-
-def get_price_feed_prevotes(address):
+def get_validator(address) -> (Validator, None):
     """
-    Return the current prevotes oracle json
+    Return desired validator node or None if it does not exist
     """
 
-    if DEBUG:
-        # Get local prevotes file
-        response = requests.get('http://localhost:8000/prevotes.json')
-        if response.status_code != 200:
-            logger.info("ConnectionError while requesting http://localhost:8000/prevotes.json")
-            raise ConnectionError
-        return response.json()
-    else:
-        response = requests.get('https://lcd.terra.dev/oracle/voters/' + address + '/prevotes')
-        if response.status_code != 200:
-            logger.info("ConnectionError while requesting https://lcd.terra.dev/oracle/voters/" + address +
-                        "/prevotes")
-            raise ConnectionError
-        return response.json()
+    return get_cached_validator_snapshot().get(address)
@@ -0,0 +1,169 @@
+from typing import NamedTuple, Optional
+
+from constants.constants import NODE_STATUSES
+from constants.env_variables import NODE_IP
+from service.governance_service import proposal_to_text
+from service.validator_service import Validator
+
+"""
+######################################################################################################################################################
+Monitoring events
+######################################################################################################################################################
+
+Events are detected once per monitoring tick from the global state and rendered once for all chats.
+Events with an address go to the chats that monitor this address, events without one go to all chats.
+Events that are sent to all platforms also get the home menu and are posted to Slack.
+"""
+
+
+class ValidatorChanged(NamedTuple):
+    address: str
+    previous: Validator
+    current: Validator
+
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        text = f'Node: *{self.address}*\n' \
+               f'Status: *{NODE_STATUSES[self.previous.status]}*'
+        if self.previous.status != self.current.status:
+            text += f' ➡️ *{NODE_STATUSES[self.current.status]}*'
+        text += f'\nJailed: *{self.previous.jailed}*'
+        if self.previous.jailed != self.current.jailed:
+            text += f' ➡️ *{self.current.jailed}*'
+        previous_delegator_shares = int(float(self.previous.delegator_shares))
+        text += f'\nDelegator Shares: *{previous_delegator_shares}*'
+        if self.previous.delegator_shares != self.current.delegator_shares:
+            current_delegator_shares = int(float(self.current.delegator_shares))
+            delta = current_delegator_shares - previous_delegator_shares
+            delta = str(delta) if (delta < 0) else f"+{delta}"
+            text += f' ➡️ *{current_delegator_shares}* (*Δ* {delta})'
+
+        return text
+
+
+class ValidatorRemoved(NamedTuple):
+    address: str
+
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        return 'Node is not active anymore! 💀' + '\n' + \
+               'Address: ' + self.address + '\n\n' + \
+               'Please enter another Node address.'
+
+
+class PriceFeedHealthChanged(NamedTuple):
+    address: str
+    is_healthy: bool
+
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        if self.is_healthy:
+            return 'Price feed is healthy again! 👌' + '\n' + \
+                   'Address: ' + self.address + '\n'
+        return 'Price feed is not healthy anymore! 💀' + '\n' + \
+               'Address: ' + self.address
+
+
+class LcdReachabilityChanged(NamedTuple):
+    is_reachable: bool
+
+    address = None
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        if self.is_reachable:
+            return 'The public Lite Client Daemon (LCD) is reachable again! 👌' + '\n' + \
+                   'Monitoring of publicly available node attributes resumes.'
+        return 'The public Lite Client Daemon (LCD) cannot be reached! 💀' + '\n' + \
+               'Node monitoring will be restricted to node specific attributes until it is reachable again.'
+
+
+class NodeReachabilityChanged(NamedTuple):
+    is_reachable: bool
+
+    address = None
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        if self.is_reachable:
+            return 'The specified Node is reachable again! 👌' + '\n' + \
+                   'Monitoring of node specific attributes resumes.'
+        return 'The specified Node cannot be reached! 💀' + '\n' + \
+               'IP: ' + NODE_IP + '\n' + \
+               'Node monitoring will be restricted to publicly available node attributes until it is reachable ' \
+               'again.' + '\n\n' + \
+               'Please check your Terra Node immediately!'
+
+
+class NodeCatchUpChanged(NamedTuple):
+    is_catching_up: bool
+    block_height: int
+
+    address = None
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        if self.is_catching_up:
+            return 'The Node is behind the latest block height and catching up! 💀 ' + '\n' + \
+                   'IP: ' + NODE_IP + '\n' + \
+                   'Current block height: ' + str(self.block_height) + '\n\n' + \
+                   'Please check your Terra Node immediately!'
+        return 'The node caught up to the latest block height again! 👌' + '\n' + \
+               'IP: ' + NODE_IP + '\n' + \
+               'Current block height: ' + str(self.block_height)
+
+
+class BlockHeightStuckChanged(NamedTuple):
+    is_stuck: bool
+    block_height: int
+    # Only known when the blocks are streamed from the node
+    seconds_without_block: Optional[int] = None
+
+    address = None
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        if self.is_stuck and self.seconds_without_block is not None:
+            return 'No new block for ' + str(self.seconds_without_block) + ' seconds! 💀' + '\n' + \
+                   'IP: ' + NODE_IP + '\n' + \
+                   'Block height stuck at: ' + str(self.block_height) + '\n\n' + \
+                   'Please check your Terra Node immediately!'
+        if self.is_stuck:
+            return 'Block height is not increasing anymore! 💀' + '\n' + \
+                   'IP: ' + NODE_IP + '\n' + \
+                   'Block height stuck at: ' + str(self.block_height) + '\n\n' + \
+                   'Please check your Terra Node immediately!'
+        return 'Block height is increasing again! 👌' + '\n' + \
+               'IP: ' + NODE_IP + '\n' + \
+               'Block height now at: ' + str(self.block_height) + '\n'
+
+
+class ProposalSubmitted(NamedTuple):
+    proposal: dict
+
+    address = None
+    to_all_platforms = True
+
+    def to_text(self) -> str:
+        return 'A new governance proposal got submitted! 📣\n\n' + proposal_to_text(self.proposal)
+
+
+class ProposalEnded(NamedTuple):
+    proposal: dict
+
+    address = None
+    to_all_platforms = False
+
+    def to_text(self) -> str:
+        results = self.proposal['final_tally_result']
+
+        return "* ‼️ This proposal has ended ‼️*\n\n" \
+               f"{proposal_to_text(self.proposal)}\n\n" \
+               "*Results:*\n\n" \
+               f"*✅ Yes*: {results['yes']}\n" \
+               f"*❌ No*: {results['no']}\n" \
+               f"*❌❌ No with veto*: {results['no_with_veto']}\n" \
+               f"*🤷 Abstain*: {results['abstain']}\n"
@@ -1,13 +1,30 @@
-import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List
 
-import requests
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 
-from constants.constants import NODE_STATUS_ENDPOINT, NODE_STATUSES
-from constants.env_variables import NODE_IP
+from constants.constants import MONITORING_TICK_IN_SECONDS, METRICS_LOG_INTERVAL_IN_SECONDS, \
+    JOB_FIRST_RUN_IN_SECONDS, NO_NEW_BLOCK_ALERT_IN_SECONDS, BLOCK_STREAM_CHECK_INTERVAL_IN_SECONDS, \
+    MONITORING_CHECK_DEADLINES_IN_SECONDS, MONITORING_TICK_BUDGET_IN_SECONDS, SINGLE_RUN_JOB_KWARGS
+from constants.env_variables import NODE_IP, NODE_WEBSOCKET
 from constants.logger import logger
-from helpers import is_lcd_reachable, try_message_to_all_platforms, get_validator, is_price_feed_healthy, \
-    is_node_catching_up, get_node_block_height, try_message
-from service.governance_service import get_governance_proposals, proposal_to_text
+from helpers import try_message_with_home_menu, try_message, send_slack_message, persist_job_data
+from jobs.events import ValidatorChanged, ValidatorRemoved, PriceFeedHealthChanged, LcdReachabilityChanged, \
+    NodeReachabilityChanged, NodeCatchUpChanged, BlockHeightStuckChanged, ProposalSubmitted, ProposalEnded
+from service.block_stream_service import block_stream, Block
+from service.fetch_service import fetch_concurrently
+from service.governance_service import sync_governance_proposals, track_proposal_lifecycle, \
+    latest_proposal_change_time, terra_timestamp_to_datetime
+from service.lcd_health_service import is_lcd_available, should_probe_lcd, probe_lcd
+from service.message_queue_service import ALERT_PRIORITY
+from service.metrics_service import observe, increment, metrics_to_text
+from service.node_status_service import get_node_status, NodeStatus
+from service.oracle_service import oracle_monitor
+from service.polling_service import polling_cadences
+from service.subscription_service import subscription_index
+from service.validator_service import get_validator_snapshot
 
 """
 ######################################################################################################################################################
@@ -15,320 +32,448 @@ Jobs
 ######################################################################################################################################################
 """
 
+# The health checks of the LCD and the node get their own workers, so slow LCD data requests cannot starve them
+HEALTH_CHECKS = ('lcd_probe', 'node_status')
+_health_check_executor = ThreadPoolExecutor(max_workers=len(HEALTH_CHECKS), thread_name_prefix='health_check')
 
-def node_checks(context):
+
+class MonitoringState:
     """
-    Periodic checks of various node stats
+    Global data that is gathered once per monitoring tick and shared by the checks of all users
     """
 
-    if check_lcd_reachable(context):
-        check_node_status(context)
-        check_price_feeder(context)
-        check_governance_proposals(context)
-    if NODE_IP and check_node_reachable(context):
-        check_node_catch_up_status(context)
-        check_node_block_height(context)
+    def __init__(self):
+        self.is_lcd_reachable = False
+        self.validator_snapshot = None
+        self.governance_proposals = None
+        self.governance_proposals_version = None
+        self.node_status = None
+        # Whether the node status was polled or streamed in this tick
+        self.is_node_status_checked = False
+        # Whether the node status is derived from the block stream instead of being polled
+        self.is_node_status_streamed = False
+        self.price_feed_health = {}
+        # Checks that missed their deadline in this tick, their state is unknown
+        self.unknown_checks = set()
+
+
+def setup_monitoring_jobs(dispatcher):
+    """
+    Schedule the single monitoring job that serves all users.
+    A tick that is still running when the next one is due is not queued up behind it, the next run is skipped and
+    missed runs are coalesced into one.
+    """
 
+    scheduler = dispatcher.job_queue.scheduler
+    scheduler.add_listener(partial(count_skipped_job_run, scheduler), EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
 
-def check_lcd_reachable(context):
+    dispatcher.job_queue.run_repeating(node_checks, interval=MONITORING_TICK_IN_SECONDS,
+                                       first=JOB_FIRST_RUN_IN_SECONDS, job_kwargs=SINGLE_RUN_JOB_KWARGS)
+    if NODE_IP and NODE_WEBSOCKET and block_stream.start():
+        dispatcher.job_queue.run_repeating(block_stream_checks, interval=BLOCK_STREAM_CHECK_INTERVAL_IN_SECONDS,
+                                           job_kwargs=SINGLE_RUN_JOB_KWARGS)
+    dispatcher.job_queue.run_repeating(log_metrics, interval=METRICS_LOG_INTERVAL_IN_SECONDS,
+                                       first=METRICS_LOG_INTERVAL_IN_SECONDS)
+
+
+def count_skipped_job_run(scheduler, event):
     """
-    Returns whether the public Lite Client Daemon (LCD) is reachable and informs user
+    Count the runs the scheduler skipped because the previous run was still running or the run was too late.
+    Ticks that poll slow sources regularly take longer than the interval, so this is expected.
     """
 
-    chat_id = context.job.context['chat_id']
-    user_data = context.job.context['user_data']
+    job = scheduler.get_job(event.job_id)
+    name = job.name if job is not None else event.job_id
+    increment(f'jobs.{name}.skipped')
+    logger.debug(f"Skipped a run of job {name} as the previous run did not finish in time")
+
 
-    if 'is_lcd_reachable' not in user_data:
-        user_data['is_lcd_reachable'] = True
+def node_checks(context):
+    """
+    Periodic checks of various node stats for all users
+    """
+
+    tick_start = time.monotonic()
 
-    is_lcd_currently_reachable = is_lcd_reachable()
+    users = _monitoring_users(context)
+    monitored_addresses = subscription_index.addresses()
 
-    if user_data['is_lcd_reachable'] == True and not is_lcd_currently_reachable:
-        user_data['is_lcd_reachable'] = False
-        text = 'The public Lite Client Daemon (LCD) cannot be reached! 💀' + '\n' + \
-               'Node monitoring will be restricted to node specific attributes until it is reachable again.'
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
-    elif user_data['is_lcd_reachable'] == False and is_lcd_currently_reachable:
-        user_data['is_lcd_reachable'] = True
-        text = 'The public Lite Client Daemon (LCD) is reachable again! 👌' + '\n' + \
-               'Monitoring of publicly available node attributes resumes.'
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
+    state = gather_monitoring_state(monitored_addresses)
+    events = detect_events(context.dispatcher.bot_data, state, monitored_addresses)
+    changed_chat_ids = notify_subscribers(context, users, events)
+    # The monitoring state in the bot data would only be written on the next user update otherwise
+    persist_job_data(context, changed_chat_ids)
 
-    return is_lcd_currently_reachable
+    increment('monitoring.events', len(events))
+    tick_duration = time.monotonic() - tick_start
+    observe('monitoring.tick', tick_duration)
+    if tick_duration > MONITORING_TICK_BUDGET_IN_SECONDS:
+        increment('monitoring.tick_overrun')
+        logger.warning(f"Monitoring tick took {tick_duration:.1f}s which is longer than its budget of "
+                       f"{MONITORING_TICK_BUDGET_IN_SECONDS}s")
 
 
-def check_node_reachable(context):
+def block_stream_checks(context):
     """
-    Returns whether the specified node IP is reachable and informs user
+    Check the streamed blocks far more often than the node status is polled, to notice missing blocks early
     """
 
-    chat_id = context.job.context['chat_id']
-    user_data = context.job.context['user_data']
+    block = block_stream.latest_block()
+    if block is None:
+        # The stream is not connected, node_checks polls the node status
+        return
+
+    monitoring_data = context.dispatcher.bot_data.setdefault('monitoring', {})
+    events = check_new_blocks(monitoring_data, block, block_stream.clock())
+    if events:
+        persist_job_data(context, notify_subscribers(context, _monitoring_users(context), events))
+
 
-    if 'is_node_reachable' not in user_data:
-        user_data['is_node_reachable'] = True
+def _monitoring_users(context):
+    # Copy the items as users that blocked the bot get removed while we iterate
+    return [(chat_id, user_data) for chat_id, user_data in list(context.dispatcher.user_data.items())
+            if 'job_started' in user_data]
 
-    response = requests.get(NODE_STATUS_ENDPOINT)
-    if response.status_code == 200:
-        is_node_currently_reachable = True
+
+def gather_monitoring_state(monitored_addresses) -> MonitoringState:
+    """
+    Fetch the data of all sources whose polling cadence is due exactly once, with all independent requests running
+    concurrently. Data of sources that were not polled in this tick is left empty.
+    Every check has a deadline. Checks that miss it are not waited for and recorded as unknown, so a slow upstream
+    cannot hold up the tick. A check is not started again while its fetch from a previous tick still runs, it is
+    unknown then as well.
+    """
+
+    # While the LCD circuit is open, no LCD data is requested and the LCD is only probed at a backoff cadence
+    was_lcd_available = is_lcd_available()
+    due_sources = {source for source, cadence in polling_cadences.items() if cadence.is_due()}
+    poll_price_feeds = was_lcd_available and 'price_feeds' in due_sources and monitored_addresses
+
+    fetchers = {}
+    if should_probe_lcd():
+        fetchers['lcd_probe'] = probe_lcd
+    if was_lcd_available:
+        if 'validators' in due_sources:
+            fetchers['validators'] = partial(get_validator_snapshot, max_age=0)
+        if 'governance' in due_sources:
+            fetchers['governance'] = sync_governance_proposals
+    price_feed_fetchers = oracle_monitor.fetchers(monitored_addresses) if poll_price_feeds else {}
+    fetchers.update(price_feed_fetchers)
+    streamed_node_status = block_stream.node_status() if NODE_IP else None
+    if NODE_IP and streamed_node_status is None and 'node_status' in due_sources:
+        fetchers['node_status'] = partial(get_node_status, max_age=0)
+
+    sources = {key: 'price_feeds' if key in price_feed_fetchers else key for key in fetchers}
+    results = fetch_concurrently(fetchers,
+                                 deadlines={key: MONITORING_CHECK_DEADLINES_IN_SECONDS[source]
+                                            for key, source in sources.items()},
+                                 executors={key: _health_check_executor for key in HEALTH_CHECKS})
+
+    state = MonitoringState()
+    state.unknown_checks = {sources[key] for key, result in results.items() if isinstance(result, TimeoutError)}
+    for source in state.unknown_checks:
+        increment(f'monitoring.unknown.{source}')
+        logger.warning(f"The {source} check did not finish within its deadline of "
+                       f"{MONITORING_CHECK_DEADLINES_IN_SECONDS[source]}s, its state is unknown in this tick")
+    state.is_lcd_reachable = is_lcd_available()
+    # Results of LCD requests are dropped if the LCD became unreachable meanwhile
+    lcd_results = results if was_lcd_available and state.is_lcd_reachable else {}
+
+    if 'validators' in fetchers:
+        state.validator_snapshot = _result_or_none(lcd_results, 'validators')
+        _record_poll('validators', state.validator_snapshot, lambda snapshot: snapshot.version)
+
+    if 'governance' in fetchers:
+        governance_proposals = _result_or_none(lcd_results, 'governance')
+        if governance_proposals is not None:
+            state.governance_proposals, state.governance_proposals_version = governance_proposals
+        _record_poll('governance', governance_proposals, lambda proposals: proposals[1],
+                     changed_at=lambda proposals: latest_proposal_change_time(proposals[0]))
+
+    if poll_price_feeds:
+        state.price_feed_health = oracle_monitor.price_feed_health(
+            monitored_addresses, {key: lcd_results.get(key, ConnectionError()) for key in price_feed_fetchers})
+        _record_poll('price_feeds', state.price_feed_health or None,
+                     lambda health: frozenset(health.items()),
+                     is_incident=lambda health: not all(health.values()),
+                     requests=len(price_feed_fetchers))
+
+    if streamed_node_status is not None:
+        state.node_status = streamed_node_status
+        state.is_node_status_checked = True
+        state.is_node_status_streamed = True
+    elif 'node_status' in fetchers and 'node_status' not in state.unknown_checks:
+        state.node_status = _result_or_none(results, 'node_status')
+        state.is_node_status_checked = True
+        # The node not being reachable, catching up or not increasing its block height are incidents
+        previous_block_height = polling_cadences['node_status'].fingerprint
+        _record_poll('node_status', state.node_status, lambda node_status: node_status.latest_block_height,
+                     is_incident=lambda node_status: node_status.catching_up or
+                     node_status.latest_block_height == previous_block_height,
+                     is_failure_incident=True,
+                     changed_at=lambda node_status: terra_timestamp_to_datetime(
+                         node_status.latest_block_time).timestamp())
+    elif 'node_status' in fetchers:
+        # A slow node is retried at the normal cadence, only an unreachable node is an incident
+        polling_cadences['node_status'].failed()
+
+    return state
+
+
+def _record_poll(source, result, fingerprint, is_incident=lambda _: False, is_failure_incident=False, requests=1,
+                 changed_at=None):
+    cadence = polling_cadences[source]
+    if result is None:
+        cadence.failed(is_incident=is_failure_incident, requests=requests)
     else:
-        is_node_currently_reachable = False
+        cadence.polled(fingerprint(result), is_incident=is_incident(result), requests=requests,
+                       changed_at=partial(changed_at, result) if changed_at is not None else None)
 
-    if user_data['is_node_reachable'] == True and not is_node_currently_reachable:
-        user_data['is_node_reachable'] = False
-        text = 'The specified Node cannot be reached! 💀' + '\n' + \
-               'IP: ' + NODE_IP + '\n' + \
-               'Node monitoring will be restricted to publicly available node attributes until it is reachable again.' + '\n\n' + \
-               'Please check your Terra Node immediately!'
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
-    elif user_data['is_node_reachable'] == False and is_node_currently_reachable:
-        user_data['is_node_reachable'] = True
-        text = 'The specified Node is reachable again! 👌' + '\n' + \
-               'Monitoring of node specific attributes resumes.'
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
 
-    return is_node_currently_reachable
+def _result_or_none(results, key):
+    result = results.get(key)
+    if isinstance(result, (ConnectionError, TimeoutError)):
+        return None
+    elif isinstance(result, Exception):
+        logger.error(f"Fetching {key} failed: {result}", exc_info=result)
+        return None
+    else:
+        return result
 
 
-def check_node_status(context):
+def detect_events(bot_data, state: MonitoringState, monitored_addresses) -> List:
     """
-    Check all added Terra Nodes for any changes.
+    Compare the state with the previous tick once for all users. The previous values are kept in the bot data.
     """
 
-    chat_id = context.job.context['chat_id']
-    user_data = context.job.context['user_data']
+    monitoring_data = bot_data.setdefault('monitoring', {})
 
-    # List to delete entries after loop
-    delete_addresses = []
+    events = check_lcd_reachable(monitoring_data, state.is_lcd_reachable)
+    if state.is_lcd_reachable:
+        events += check_node_status(monitoring_data, state.validator_snapshot, monitored_addresses)
+        events += check_price_feeder(monitoring_data, state.price_feed_health, monitored_addresses)
+        events += check_governance_proposals(bot_data.setdefault('governance_proposals', {}),
+                                             state.governance_proposals, state.governance_proposals_version)
+    if NODE_IP and state.is_node_status_checked:
+        events += check_node_reachable(monitoring_data, state.node_status is not None)
+        if state.node_status is not None:
+            events += check_node_catch_up_status(monitoring_data, state.node_status)
+            # With streamed blocks, block_stream_checks detects a stuck block height
+            if not state.is_node_status_streamed:
+                events += check_node_block_height(monitoring_data, state.node_status)
 
-    # Iterate through all keys
-    for address in user_data.get('nodes', {}).keys():
-        try:
-            remote_node = get_validator(address=address)
-        except ConnectionError:
-            continue
+    return events
 
-        local_node = user_data['nodes'][address]
 
-        if remote_node is None:
-            text = 'Node is not active anymore! 💀' + '\n' + \
-                   'Address: ' + address + '\n\n' + \
-                   'Please enter another Node address.'
+def notify_subscribers(context, users, events):
+    """
+    Render every event once and send it to the chats it concerns. Return the chats whose user data changed.
+    """
 
-            delete_addresses.append(address)
+    changed_chat_ids = set()
+    for event in events:
+        if event.address is None:
+            subscribers = users
+        else:
+            # Only the chats that monitor the address are touched
+            subscribers = [(chat_id, context.dispatcher.user_data[chat_id])
+                           for chat_id in subscription_index.subscribers(event.address)
+                           if chat_id in context.dispatcher.user_data]
 
-            # Send message
-            try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
+        if not subscribers:
             continue
 
-        # Check which node fields have changed
-        changed_fields = [
-            field for field in ['status', 'jailed', 'delegator_shares'] if local_node[field] != remote_node[field]
-        ]
-
-        # Check if there are any changes
-        if len(changed_fields) > 0:
-            text = f'Node: *{address}*\n' \
-                   f'Status: *{NODE_STATUSES[local_node["status"]]}*'
-            if 'status' in changed_fields:
-                text += f' ➡️ *{NODE_STATUSES[remote_node["status"]]}*'
-            text += f'\nJailed: *{local_node["jailed"]}*'
-            if 'jailed' in changed_fields:
-                text += f' ➡️ *{remote_node["jailed"]}*'
-            local_delegator_shares = int(float(local_node["delegator_shares"]))
-            text += f'\nDelegator Shares: *{local_delegator_shares}*'
-            if 'delegator_shares' in changed_fields:
-                remote_delegator_shares = int(float(remote_node['delegator_shares']))
-                delta = remote_delegator_shares - local_delegator_shares
-                delta = str(delta) if (delta < 0) else f"+{delta}"
-                text += f' ➡️ *{remote_delegator_shares}* (*Δ* {delta})'
+        try:
+            text = event.to_text()
+        except Exception as e:
+            logger.error(f"Rendering {event} failed: {e}", exc_info=True)
+            continue
 
-            # Update data
-            local_node['status'] = remote_node['status']
-            local_node['jailed'] = remote_node['jailed']
-            local_node['delegator_shares'] = remote_node['delegator_shares']
+        for chat_id, user_data in subscribers:
+            if update_user_nodes(chat_id, user_data, event):
+                changed_chat_ids.add(chat_id)
+            if event.to_all_platforms:
+                try_message_with_home_menu(context=context, chat_id=chat_id, text=text, priority=ALERT_PRIORITY)
+            else:
+                try_message(context=context, chat_id=chat_id, text=text, priority=ALERT_PRIORITY)
 
-            # Send message
-            try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
+        if event.to_all_platforms:
+            send_slack_message(text, key=(type(event).__name__, event.address))
 
-    for address in delete_addresses:
-        del user_data['nodes'][address]
+    return changed_chat_ids
 
 
-def check_price_feeder(context):
+def update_user_nodes(chat_id, user_data, event) -> bool:
     """
-    Check Prevotes to make sure Price Feeder still works
+    Unsubscribe users from validators that do not exist anymore and return whether the user data changed
     """
 
-    chat_id = context.job.context['chat_id']
-    user_data = context.job.context['user_data']
+    if isinstance(event, ValidatorRemoved):
+        user_data['nodes'].discard(event.address)
+        subscription_index.unsubscribe(chat_id, [event.address])
+        return True
+    return False
 
-    for address in user_data.get('nodes', {}).keys():
-        if 'is_price_feed_healthy' not in user_data:
-            user_data['is_price_feed_healthy'] = True
 
-        try:
-            is_price_feed_currently_healthy = is_price_feed_healthy(address)
-        except ConnectionError:
-            continue
+def log_metrics(_):
+    logger.info("Monitoring metrics:\n" + metrics_to_text())
 
-        if user_data['is_price_feed_healthy'] == True and not is_price_feed_currently_healthy:
-            user_data['is_price_feed_healthy'] = False
-            text = 'Price feed is not healthy anymore! 💀' + '\n' + \
-                   'Address: ' + address
-            try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
-        elif user_data['is_price_feed_healthy'] == False and is_price_feed_currently_healthy:
-            user_data['is_price_feed_healthy'] = True
-            text = 'Price feed is healthy again! 👌' + '\n' + \
-                   'Address: ' + address + '\n'
-            try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
 
-
-def check_node_catch_up_status(context):
+def check_lcd_reachable(monitoring_data, is_lcd_currently_reachable) -> List:
     """
-    Check if node is some blocks behind with catch up status
+    Detect whether the public Lite Client Daemon (LCD) became unreachable or reachable again
     """
 
-    chat_id = context.job.context['chat_id']
-    user_data = context.job.context['user_data']
+    was_lcd_reachable = monitoring_data.get('is_lcd_reachable', True)
+    monitoring_data['is_lcd_reachable'] = is_lcd_currently_reachable
 
-    if 'is_catching_up' not in user_data:
-        user_data['is_catching_up'] = False
+    if was_lcd_reachable != is_lcd_currently_reachable:
+        return [LcdReachabilityChanged(is_reachable=is_lcd_currently_reachable)]
+    return []
 
-    try:
-        is_currently_catching_up = is_node_catching_up()
-        block_height = get_node_block_height()
-    except ConnectionError:
-        return
 
-    if user_data['is_catching_up'] == False and is_currently_catching_up:
-        user_data['is_catching_up'] = True
-        text = 'The Node is behind the latest block height and catching up! 💀 ' + '\n' + \
-               'IP: ' + NODE_IP + '\n' + \
-               'Current block height: ' + block_height + '\n\n' + \
-               'Please check your Terra Node immediately!'
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
-    elif user_data['is_catching_up'] == True and not is_currently_catching_up:
-        user_data['is_catching_up'] = False
-        text = 'The node caught up to the latest block height again! 👌' + '\n' + \
-               'IP: ' + NODE_IP + '\n' + \
-               'Current block height: ' + block_height
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
+def check_node_reachable(monitoring_data, is_node_currently_reachable) -> List:
+    """
+    Detect whether the specified node IP became unreachable or reachable again
+    """
+
+    was_node_reachable = monitoring_data.get('is_node_reachable', True)
+    monitoring_data['is_node_reachable'] = is_node_currently_reachable
 
+    if was_node_reachable != is_node_currently_reachable:
+        return [NodeReachabilityChanged(is_reachable=is_node_currently_reachable)]
+    return []
 
-def check_node_block_height(context):
+
+def check_node_status(monitoring_data, validator_snapshot, monitored_addresses) -> List:
     """
-    Make sure the block height increases
+    Detect changes of all monitored Terra Nodes since the previous validator snapshot
     """
 
-    chat_id = context.job.context['chat_id']
-    user_data = context.job.context['user_data']
+    if validator_snapshot is None:
+        return []
 
-    try:
-        block_height = get_node_block_height()
-    except ConnectionError:
-        return
+    # Monitored validators that are not part of the snapshot anymore. The statuses are queried separately, so a
+    # validator that changes its status between the queries can be missing from a single fetch. It only counts as
+    # removed once it is also missing from a later fetch, which updates the fetch time of the snapshot.
+    previously_missing = monitoring_data.get('missing_validators', {})
+    missing = {address for address in monitored_addresses if address not in validator_snapshot}
+    removed = {address for address in missing
+               if previously_missing.get(address, validator_snapshot.fetched_at) != validator_snapshot.fetched_at}
+    events = [ValidatorRemoved(address) for address in sorted(removed)]
+    monitoring_data['missing_validators'] = {address: previously_missing.get(address, validator_snapshot.fetched_at)
+                                             for address in missing - removed}
 
-    # Check if block height got stuck
-    if 'block_height' in user_data and block_height <= user_data['block_height']:
-        # Increase stuck count to know if we already sent a notification
-        user_data['block_height_stuck_count'] += 1
-    else:
-        # Check if we have to send a notification that the Height increases again
-        if 'block_height_stuck_count' in user_data and user_data['block_height_stuck_count'] > 0:
-            text = 'Block height is increasing again! 👌' + '\n' + \
-                   'IP: ' + NODE_IP + '\n' + \
-                   'Block height now at: ' + block_height + '\n'
-            try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
-            user_data['block_height_stuck_count'] = -1
-        else:
-            user_data['block_height_stuck_count'] = 0
+    # Skip the comparison if the validator data did not change since the previous tick
+    previous_validators = monitoring_data.get('validators')
+    if previous_validators is not None and \
+            monitoring_data.get('validator_snapshot_version') != validator_snapshot.version:
+        for address in monitored_addresses:
+            previous = previous_validators.get(address)
+            current = validator_snapshot.get(address)
+            if previous is None or current is None:
+                continue
 
-    # Set current block height
-    user_data['block_height'] = block_height
+            if previous != current:
+                events.append(ValidatorChanged(address, previous, current))
 
-    # If it just got stuck send a message
-    if user_data['block_height_stuck_count'] == 1:
-        text = 'Block height is not increasing anymore! 💀' + '\n' + \
-               'IP: ' + NODE_IP + '\n' + \
-               'Block height stuck at: ' + block_height + '\n\n' + \
-               'Please check your Terra Node immediately!'
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
+    monitoring_data['validators'] = validator_snapshot.validators
+    monitoring_data['validator_snapshot_version'] = validator_snapshot.version
 
-    # Show buttons if there were changes or block height just got (un)stuck
-    # Stuck count:
-    # 0 == everthings alright
-    # 1 == just got stuck
-    # -1 == just got unstuck
-    # > 1 == still stuck
+    return events
 
 
-def check_governance_proposals(context):
+def check_price_feeder(monitoring_data, price_feed_health, monitored_addresses) -> List:
     """
-    Monitoring related to governance proposals
+    Detect price feeders that stopped prevoting or recovered, separately for every monitored validator
     """
 
-    try:
-        governance_proposals = get_governance_proposals()
-    except ConnectionError as e:
-        logger.error(e)
-        return
+    previous_price_feed_health = monitoring_data.setdefault('price_feed_health', {})
+    # Forget validators nobody monitors anymore, so they start out healthy when they are added again
+    for address in previous_price_feed_health.keys() - monitored_addresses:
+        del previous_price_feed_health[address]
 
-    check_new_goverance_proposal(context, governance_proposals)
-    check_results_of_proposals(context, governance_proposals)
+    events = []
+    for address, is_price_feed_currently_healthy in price_feed_health.items():
+        if previous_price_feed_health.get(address, True) != is_price_feed_currently_healthy:
+            events.append(PriceFeedHealthChanged(address, is_price_feed_currently_healthy))
+        previous_price_feed_health[address] = is_price_feed_currently_healthy
 
+    return events
 
-def check_new_goverance_proposal(context, governance_proposals):
+
+def check_node_catch_up_status(monitoring_data, node_status: NodeStatus) -> List:
     """
-    Notify the user if there's a new governance proposals
+    Detect whether the node fell behind and is catching up, or caught up again
     """
 
-    chat_id = context.job.context['chat_id']
-    user_data = context.job.context['user_data']
+    was_catching_up = monitoring_data.get('is_catching_up', False)
+    monitoring_data['is_catching_up'] = node_status.catching_up
 
-    governance_proposals_count = len(governance_proposals)
+    if was_catching_up != node_status.catching_up:
+        return [NodeCatchUpChanged(is_catching_up=node_status.catching_up,
+                                   block_height=node_status.latest_block_height)]
+    return []
 
-    if 'governance_proposals_count' not in user_data:
-        user_data['governance_proposals_count'] = governance_proposals_count
 
-    new_proposals_count = governance_proposals_count - user_data['governance_proposals_count']
-    for i in range(new_proposals_count):
-        current_proposal = governance_proposals[user_data['governance_proposals_count'] + i]
+def check_node_block_height(monitoring_data, node_status: NodeStatus) -> List:
+    """
+    Make sure the block height increases
+    """
 
-        text = 'A new governance proposal got submitted! 📣\n\n'
-        text += proposal_to_text(current_proposal)
+    block_height = node_status.latest_block_height
+    events = []
 
-        try_message_to_all_platforms(context=context, chat_id=chat_id, text=text)
+    if 'block_height' in monitoring_data and block_height <= monitoring_data['block_height']:
+        monitoring_data['block_height_stuck_count'] += 1
+        # Only notify when it just got stuck
+        if monitoring_data['block_height_stuck_count'] == 1:
+            events.append(BlockHeightStuckChanged(is_stuck=True, block_height=block_height))
+    else:
+        if monitoring_data.get('block_height_stuck_count', 0) > 0:
+            events.append(BlockHeightStuckChanged(is_stuck=False, block_height=block_height))
+        monitoring_data['block_height_stuck_count'] = 0
 
-    user_data['governance_proposals_count'] = governance_proposals_count
+    monitoring_data['block_height'] = block_height
 
+    return events
 
-def check_results_of_proposals(context, governance_proposals):
-    user_data = context.job.context['user_data']
 
-    active_proposals = list(filter(lambda p: p['proposal_status'] == 'VotingPeriod', governance_proposals))
-    monitored_active_proposals = copy.deepcopy(user_data.setdefault('monitored_active_proposals', []))
+def check_new_blocks(monitoring_data, block: Block, now) -> List:
+    """
+    Detect that the node did not receive a new block for a while, or receives blocks again
+    """
 
-    # save new proposals
-    for proposal in active_proposals:
-        if proposal['id'] not in monitored_active_proposals:
-            user_data['monitored_active_proposals'].append(proposal['id'])
+    seconds_without_block = now - block.received_at
+    is_stuck = seconds_without_block >= NO_NEW_BLOCK_ALERT_IN_SECONDS
+    was_stuck = monitoring_data.get('block_height_stuck_count', 0) > 0
+    events = []
+
+    if is_stuck:
+        monitoring_data['block_height_stuck_count'] = monitoring_data.get('block_height_stuck_count', 0) + 1
+        # Only notify when it just got stuck
+        if not was_stuck:
+            events.append(BlockHeightStuckChanged(is_stuck=True, block_height=block.height,
+                                                  seconds_without_block=int(seconds_without_block)))
+    else:
+        if was_stuck and block.height > monitoring_data.get('block_height', 0):
+            events.append(BlockHeightStuckChanged(is_stuck=False, block_height=block.height))
+        monitoring_data['block_height_stuck_count'] = 0
+
+    monitoring_data['block_height'] = block.height
+
+    return events
 
-    # send notifications
-    for proposal_id in monitored_active_proposals:
-        is_past = proposal_id not in map(lambda p: p['id'], active_proposals)
 
-        if is_past:
-            past_proposal = next(filter(lambda p: p['id'] == proposal_id, governance_proposals), None)
-            user_data['monitored_active_proposals'].remove(proposal_id)
-            results = past_proposal['final_tally_result']
+def check_governance_proposals(tracking_data, governance_proposals, governance_proposals_version) -> List:
+    """
+    Detect new and ended governance proposals
+    """
+
+    if governance_proposals is None:
+        return []
 
-            message = "* ‼️ This proposal has ended ‼️*\n\n" \
-                      f"{proposal_to_text(past_proposal)}\n\n" \
-                      "*Results:*\n\n" \
-                      f"*✅ Yes*: {results['yes']}\n" \
-                      f"*❌ No*: {results['no']}\n" \
-                      f"*❌❌ No with veto*: {results['no_with_veto']}\n" \
-                      f"*🤷 Abstain*: {results['abstain']}\n"
+    proposal_events = track_proposal_lifecycle(tracking_data, governance_proposals, governance_proposals_version)
 
-            try_message(context=context, chat_id=context.job.context['chat_id'], text=message)
+    return [ProposalSubmitted(proposal) for proposal in proposal_events.new_proposals] + \
+           [ProposalEnded(proposal) for proposal in proposal_events.ended_proposals]
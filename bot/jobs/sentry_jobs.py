@@ -1,43 +1,37 @@
-from constants.constants import SENTRY_JOB_INTERVAL_IN_SECONDS
+from constants.constants import MONITORING_TICK_IN_SECONDS, SENTRY_JOB_FIRST_RUN_IN_SECONDS, SINGLE_RUN_JOB_KWARGS
 from constants.env_variables import SENTRY_NODES
-from constants.logger import logger
 from constants.messages import NODE_STARTED_SYNCING_MSG, NODE_FINISHED_SYNCING_MSG
-from helpers import try_message_to_all_chats_and_platforms
-from service.network_service import is_syncing
+from helpers import try_message_to_all_chats_and_platforms, persist_job_data
+from service.polling_service import polling_cadences
+from service.sentry_service import sentry_prober
 
 
 def setup_sentry_jobs(dispatcher):
     dispatcher.job_queue.run_repeating(check_sentry_nodes_statuses,
-                                       interval=SENTRY_JOB_INTERVAL_IN_SECONDS,
-                                       context={'bot_data': dispatcher.bot_data})
+                                       interval=MONITORING_TICK_IN_SECONDS,
+                                       first=SENTRY_JOB_FIRST_RUN_IN_SECONDS,
+                                       context={'bot_data': dispatcher.bot_data},
+                                       job_kwargs=SINGLE_RUN_JOB_KWARGS)
 
 
 def check_sentry_nodes_statuses(context):
-    sentry_nodes_data = context.job.context['bot_data'].setdefault('sentry_nodes', {})
-
-    for node_ip in SENTRY_NODES:
-        message = check_sentry_node_status(node_ip, sentry_nodes_data)
-        if message is not None:
-            try_message_to_all_chats_and_platforms(context, message, remove_job_when_blocked=False)
-
+    # The sentry nodes are polled faster while one of them is syncing or about to change its status
+    cadence = polling_cadences['sentry_nodes']
+    if not SENTRY_NODES or not cadence.is_due():
+        return
 
-def check_sentry_node_status(node_ip, sentry_nodes_data) -> [None, str]:
-    try:
-        is_currently_syncing = is_syncing(node_ip)
-    except Exception as e:
-        logger.error(e)
-        return None
-
-    was_syncing = sentry_nodes_data.setdefault(node_ip, {}).setdefault('syncing', False)
-
-    if was_syncing != is_currently_syncing:
-        sentry_nodes_data[node_ip]['syncing'] = is_currently_syncing
+    sentry_nodes_data = context.job.context['bot_data'].setdefault('sentry_nodes', {})
 
-        if is_currently_syncing:
+    changes = sentry_prober.probe(SENTRY_NODES, sentry_nodes_data)
+    for node_ip, is_syncing in changes:
+        if is_syncing:
             text = NODE_STARTED_SYNCING_MSG.format(node_ip)
         else:
             text = NODE_FINISHED_SYNCING_MSG.format(node_ip)
+        try_message_to_all_chats_and_platforms(context, text)
+    if changes:
+        persist_job_data(context)
 
-        return text
-    else:
-        return None
+    syncing = tuple(sentry_nodes_data[node_ip]['syncing'] for node_ip in SENTRY_NODES)
+    cadence.polled(syncing, is_incident=any(syncing) or bool(sentry_prober.pending_changes),
+                   requests=len(SENTRY_NODES))
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from constants.constants import NODE_WEBSOCKET_ENDPOINT, CATCH_UP_BLOCK_LAG_IN_SECONDS, \
+    BLOCK_STREAM_INITIAL_BACKOFF_IN_SECONDS, BLOCK_STREAM_MAX_BACKOFF_IN_SECONDS, BLOCK_STREAM_HEARTBEAT_IN_SECONDS
+from constants.logger import logger
+from service import json_service
+from service.governance_service import terra_timestamp_to_datetime
+from service.metrics_service import increment, observe, set_gauge
+from service.node_status_service import NodeStatus
+
+# aiohttp is installed together with terra-sdk, without it the node status is only polled
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+NEW_BLOCK_SUBSCRIPTION = {'jsonrpc': '2.0', 'method': 'subscribe', 'id': 0,
+                          'params': {'query': "tm.event='NewBlock'"}}
+
+
+class Block(NamedTuple):
+    height: int
+    time: str
+    # Monotonic time at which the block was received
+    received_at: float
+    # Seconds between the block time and receiving the block, which is large while the node catches up
+    lag: float
+
+
+class BlockStream:
+    """
+    Subscriber to the NewBlock events of the node's Tendermint RPC websocket.
+    It runs an asyncio loop in a background thread, reconnects with backoff and keeps the latest block for the
+    node checks. While no block was received on the current connection, the node status is polled instead.
+    """
+
+    def __init__(self, url, initial_backoff=BLOCK_STREAM_INITIAL_BACKOFF_IN_SECONDS,
+                 max_backoff=BLOCK_STREAM_MAX_BACKOFF_IN_SECONDS, heartbeat=BLOCK_STREAM_HEARTBEAT_IN_SECONDS,
+                 clock=time.monotonic, wall_clock=time.time):
+        self.url = url
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.heartbeat = heartbeat
+        self.clock = clock
+        self.wall_clock = wall_clock
+
+        self._lock = threading.Lock()
+        self._latest_block = None
+        self._backoff = initial_backoff
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    def start(self) -> bool:
+        """
+        Start streaming in the background and return whether the stream could be started
+        """
+
+        if aiohttp is None:
+            logger.warning("Streaming blocks needs aiohttp to be installed, the node status is polled instead")
+            return False
+
+        if self._thread is None:
+            started = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(started,), name='block_stream', daemon=True)
+            self._thread.start()
+            started.wait()
+        return True
+
+    def stop(self, timeout=None):
+        if self._thread is None:
+            return
+
+        self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def latest_block(self) -> Optional[Block]:
+        """
+        Return the latest block received on the current connection, or None while not connected
+        """
+
+        with self._lock:
+            return self._latest_block
+
+    def node_status(self) -> Optional[NodeStatus]:
+        """
+        Return the node status derived from the latest block, or None if the node status needs to be polled
+        """
+
+        block = self.latest_block()
+        if block is None:
+            return None
+
+        return NodeStatus(catching_up=block.lag > CATCH_UP_BLOCK_LAG_IN_SECONDS,
+                          latest_block_height=block.height,
+                          latest_block_time=block.time,
+                          fetched_at=block.received_at)
+
+    def _run(self, started: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self._stream_forever())
+        started.set()
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _stream_forever(self):
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    await self._stream(session)
+                    logger.info(f"Block stream {self.url} was closed")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.info(f"Block stream {self.url} failed: {e!r}")
+                finally:
+                    self._set_latest_block(None)
+
+                increment('block_stream.disconnects')
+                await asyncio.sleep(self._backoff)
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    async def _stream(self, session):
+        async with session.ws_connect(self.url, heartbeat=self.heartbeat) as websocket:
+            await websocket.send_json(NEW_BLOCK_SUBSCRIPTION)
+
+            async for message in websocket:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self._on_message(message.data)
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    raise websocket.exception() or ConnectionError
+
+    def _on_message(self, data):
+        message = json_service.loads(data)
+        if 'error' in message:
+            raise ConnectionError(f"Subscribing to new blocks failed: {message['error']}")
+
+        # The first message only confirms the subscription
+        block = message.get('result', {}).get('data', {}).get('value', {}).get('block')
+        if block is None:
+            return
+
+        header = block['header']
+        lag = self.wall_clock() - terra_timestamp_to_datetime(header['time']).timestamp()
+        self._set_latest_block(Block(height=int(header['height']), time=header['time'], received_at=self.clock(),
+                                     lag=lag))
+
+    def _set_latest_block(self, block: Optional[Block]):
+        with self._lock:
+            previous_block = self._latest_block
+            self._latest_block = block
+
+        set_gauge('block_stream.connected', int(block is not None))
+        if block is None:
+            return
+
+        self._backoff = self.initial_backoff
+        increment('block_stream.blocks')
+        if previous_block is not None:
+            observe('block_stream.block_interval', block.received_at - previous_block.received_at)
+
+
+block_stream = BlockStream(NODE_WEBSOCKET_ENDPOINT)
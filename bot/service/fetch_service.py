@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from constants.constants import FETCH_CONCURRENCY
+from service import http_service
+from service.metrics_service import increment
+
+# The fetchers use the pooled blocking http_service, so the event loop hands them to these worker threads
+_executor = ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY, thread_name_prefix='fetch')
+
+# Keys whose fetcher still runs in a worker thread, including fetchers whose result nobody waits for anymore
+_running_keys = set()
+_running_keys_lock = threading.Lock()
+
+
+def fetch_concurrently(fetchers: Dict[Hashable, Callable[[], Any]], concurrency=FETCH_CONCURRENCY,
+                       deadlines: Optional[Dict[Hashable, float]] = None,
+                       executor: Optional[Executor] = None,
+                       executors: Optional[Dict[Hashable, Executor]] = None) -> Dict[Hashable, Any]:
+    """
+    Run independent fetch functions concurrently, at most `concurrency` at a time, and return their results by key.
+    A fetcher that raises returns its exception as result, so one failing endpoint does not hide the others.
+    The fetchers run in the shared fetch worker threads unless another `executor` is given. Fetchers with their own
+    executor in `executors` do not count towards the concurrency, so they never wait for the other fetchers.
+
+    A fetcher that does not finish within its deadline in seconds returns a TimeoutError. Its worker thread cannot
+    be interrupted, so its requests get timeouts that end by the deadline. Until that worker is done, fetchers of
+    the same key are not started again and return a TimeoutError right away.
+    """
+
+    if not fetchers:
+        return {}
+
+    return asyncio.run(_fetch_all(fetchers, concurrency, deadlines or {}, executor or _executor, executors or {}))
+
+
+async def _fetch_all(fetchers: Dict[Hashable, Callable[[], Any]], concurrency, deadlines: Dict[Hashable, float],
+                     executor: Executor, executors: Dict[Hashable, Executor]) -> Dict[Hashable, Any]:
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.monotonic()
+
+    def submit(key, fetcher, deadline_at):
+        with _running_keys_lock:
+            _running_keys.add(key)
+        future = executors.get(key, executor).submit(_run, fetcher, deadline_at)
+        # Also called if the fetcher is cancelled before it started
+        future.add_done_callback(lambda _: _finished(key))
+        return asyncio.wrap_future(future, loop=loop)
+
+    async def run(key, fetcher, deadline_at):
+        if key in executors:
+            return await submit(key, fetcher, deadline_at)
+        async with semaphore:
+            return await submit(key, fetcher, deadline_at)
+
+    async def fetch(key, fetcher):
+        with _running_keys_lock:
+            is_running = key in _running_keys
+        if is_running:
+            increment('fetch.still_running')
+            return TimeoutError(f"Fetching {key} did not finish since a previous tick")
+
+        deadline = deadlines.get(key)
+        deadline_at = start + deadline if deadline is not None else None
+        try:
+            return await asyncio.wait_for(run(key, fetcher, deadline_at), deadline)
+        except asyncio.TimeoutError:
+            return TimeoutError(f"Fetching {key} did not finish within {deadline}s")
+
+    results = await asyncio.gather(*(fetch(key, fetcher) for key, fetcher in fetchers.items()),
+                                   return_exceptions=True)
+    return dict(zip(fetchers.keys(), results))
+
+
+def _run(fetcher: Callable[[], Any], deadline_at: Optional[float]):
+    with http_service.request_deadline(deadline_at):
+        return fetcher()
+
+
+def _finished(key):
+    with _running_keys_lock:
+        _running_keys.discard(key)
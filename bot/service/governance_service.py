@@ -1,51 +1,231 @@
-from datetime import datetime
-from typing import List
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Tuple, Optional, NamedTuple
 
 import dateutil.parser
-import requests
 from telegram.utils.helpers import escape_markdown
 
 from constants.constants import LCD_ENDPOINT, TERRA_STATION_URL
 from constants.env_variables import NETWORK
+from service import http_service
+from service.lcd_health_service import is_lcd_available
+
+
+OPEN_PROPOSAL_STATUSES = ('DepositPeriod', 'VotingPeriod')
+RENDERED_PROPOSALS_CACHE_SIZE = 1000
+
+_rendered_proposals = {}
+
+
+class ProposalStore:
+    """
+    Local copy of all governance proposals, shared by the monitoring job and the governance menus.
+    Only the first sync downloads the full history. Later syncs request the proposals that can still change
+    (deposit or voting period) and refetch single proposals once they left these periods.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._proposals = {}
+        self.version = None
+        self.is_synced = False
+        self.synced_at = None
+
+    def sync(self):
+        """
+        Bring the store up to date. Raises ConnectionError and keeps the previous state if the LCD fails.
+        The proposals are fetched without holding the lock, so the governance menus are not blocked by a sync.
+        """
+
+        with self._lock:
+            is_synced = self.is_synced
+            previous_proposals = self._proposals
+
+        if is_synced:
+            proposals = _synced_open_proposals(previous_proposals)
+        else:
+            proposals = {proposal['id']: proposal for proposal in get_governance_proposals()}
+
+        # The version only covers what the notifications depend on, not the changing tallies
+        version = hashlib.blake2b(
+            repr(sorted((proposal_id, proposal['proposal_status'])
+                        for proposal_id, proposal in proposals.items())).encode(),
+            digest_size=16).hexdigest()
+
+        with self._lock:
+            self._proposals = proposals
+            self.version = version
+            self.is_synced = True
+            self.synced_at = time.monotonic()
+
+    def all_proposals(self) -> List[dict]:
+        with self._lock:
+            return sorted(self._proposals.values(), key=lambda proposal: int(proposal['id']))
+
+    def active_proposals(self) -> List[dict]:
+        return [proposal for proposal in self.all_proposals() if proposal['proposal_status'] == 'VotingPeriod']
+
+    def get(self, proposal_id) -> Optional[dict]:
+        with self._lock:
+            return self._proposals.get(str(proposal_id))
+
+
+proposal_store = ProposalStore()
+
+
+def sync_governance_proposals() -> Tuple[List, str]:
+    """
+    Sync the shared proposal store and return all proposals together with the store version
+    """
+
+    proposal_store.sync()
+    return proposal_store.all_proposals(), proposal_store.version
+
+
+def get_synced_proposal_store(max_age=None) -> ProposalStore:
+    """
+    Return the shared proposal store, syncing it first if the monitoring job did not do so yet or if its last sync is
+    older than max_age seconds. While the LCD is unavailable it is not synced, and ConnectionError is raised if it was
+    never synced.
+    """
+
+    if proposal_store.is_synced and (max_age is None or time.monotonic() - proposal_store.synced_at < max_age):
+        return proposal_store
+
+    if not is_lcd_available():
+        if proposal_store.is_synced:
+            # Outdated proposals are better than none while the LCD is down
+            return proposal_store
+        raise ConnectionError("The LCD is unavailable and the governance proposals were not synced yet")
+
+    proposal_store.sync()
+    return proposal_store
+
+
+class ProposalEvents(NamedTuple):
+    """
+    Proposal lifecycle changes since the previous sync, each reported once for all users
+    """
+
+    new_proposals: List[dict]
+    ended_proposals: List[dict]
+
+
+def track_proposal_lifecycle(tracking_data: dict, proposals: List[dict], version: str) -> ProposalEvents:
+    """
+    Compare the proposals against the IDs seen so far, which are kept in tracking_data.
+    The first call only remembers the proposals, so that existing proposals are not reported as new.
+    """
+
+    if tracking_data.get('version') == version:
+        return ProposalEvents(new_proposals=[], ended_proposals=[])
+
+    proposals_by_id = {proposal['id']: proposal for proposal in proposals}
+    voting_ids = {proposal_id for proposal_id, proposal in proposals_by_id.items()
+                  if proposal['proposal_status'] == 'VotingPeriod'}
+
+    if 'known_ids' in tracking_data:
+        new_ids = proposals_by_id.keys() - tracking_data['known_ids']
+        # Proposals deleted on chain have no result to report
+        ended_ids = (tracking_data['voting_ids'] - voting_ids) & proposals_by_id.keys()
+    else:
+        new_ids = ended_ids = set()
+
+    tracking_data['known_ids'] = set(proposals_by_id.keys())
+    tracking_data['voting_ids'] = voting_ids
+    tracking_data['version'] = version
+
+    return ProposalEvents(new_proposals=[proposals_by_id[proposal_id] for proposal_id in sorted(new_ids, key=int)],
+                          ended_proposals=[proposals_by_id[proposal_id] for proposal_id in sorted(ended_ids, key=int)])
 
 
 def get_governance_proposals(params=None) -> List:
-    response = requests.get(f'{LCD_ENDPOINT}gov/proposals', params=params)
+    response = http_service.get_json(f'{LCD_ENDPOINT}gov/proposals', params=params)
 
     if not response.ok:
         raise ConnectionError
 
-    return response.json()['result']
+    return response.json['result'] or []
+
+
+def _fetch_closed_proposal(proposal_id) -> Optional[dict]:
+    response = http_service.get_json(f'{LCD_ENDPOINT}gov/proposals/{proposal_id}')
+
+    if response.ok:
+        return response.json['result']
+    elif response.status_code == 404 or 'unknown proposal' in str(response.json):
+        return None
+    else:
+        raise ConnectionError
+
 
+def _synced_open_proposals(previous_proposals: dict) -> dict:
+    proposals = dict(previous_proposals)
 
-def get_active_proposals() -> List:
-    return get_governance_proposals({"status": 'VotingPeriod'})
+    open_proposals = {
+        proposal['id']: proposal
+        for status in OPEN_PROPOSAL_STATUSES for proposal in get_governance_proposals({'status': status})
+    }
+    previously_open_ids = {
+        proposal_id
+        for proposal_id, proposal in proposals.items() if proposal['proposal_status'] in OPEN_PROPOSAL_STATUSES
+    }
+    proposals.update(open_proposals)
+
+    for proposal_id in previously_open_ids - open_proposals.keys():
+        closed_proposal = _fetch_closed_proposal(proposal_id)
+        if closed_proposal is None:
+            # Proposals that did not reach the minimum deposit get deleted on chain
+            del proposals[proposal_id]
+        else:
+            proposals[proposal_id] = closed_proposal
+
+    return proposals
 
 
 def get_proposal(proposal_id: int) -> dict:
-    response = requests.get(f'{LCD_ENDPOINT}gov/proposals/{proposal_id}')
+    response = http_service.get_json(f'{LCD_ENDPOINT}gov/proposals/{proposal_id}')
 
     if not response.ok:
         raise ConnectionError
 
-    return response.json()['result']
+    return response.json['result']
 
 
 def proposal_to_text(proposal: dict) -> str:
+    """
+    Return the markdown text of a proposal. The text only changes with the proposal status,
+    so each proposal is rendered once per status and reused for all chats.
+    """
+
+    key = (proposal['id'], proposal['proposal_status'])
+
+    text = _rendered_proposals.get(key)
+    if text is None:
+        text = _render_proposal(proposal)
+        if len(_rendered_proposals) >= RENDERED_PROPOSALS_CACHE_SIZE:
+            _rendered_proposals.clear()
+        _rendered_proposals[key] = text
+
+    return text
+
+
+def _render_proposal(proposal: dict) -> str:
     status = proposal['proposal_status']
+    voting_start_time = terra_timestamp_to_datetime(proposal['voting_start_time']).strftime('%A %B %d, %H:%M')
+    voting_end_time = terra_timestamp_to_datetime(proposal['voting_end_time']).strftime('%A %B %d, %H:%M')
 
     text = f"*Title:*\n{escape_markdown(proposal['content']['value']['title'])}\n" + \
            f"*Type:*\n{escape_markdown(proposal['content']['type'])}\n" + \
            f"*Description:*\n{escape_markdown(proposal['content']['value']['description'])}\n\n" + \
-           f"*Voting Start Time:" \
-           f"* {terra_timestamp_to_datetime(proposal['voting_start_time']).strftime('%A %B %d, %H:%M')} UTC\n" + \
-           f"*Voting End Time:" \
-           f"* {terra_timestamp_to_datetime(proposal['voting_end_time']).strftime('%A %B %d, %H:%M')} UTC\n\n"
+           f"*Voting Start Time:* {voting_start_time} UTC\n" + \
+           f"*Voting End Time:* {voting_end_time} UTC\n\n"
     if status == "Rejected" or status == "Passed":
         text += f"Result: *{status}*\n\n"
     else:
-        text += f"Make sure to vote on this governance proposal until" \
-                f" *{terra_timestamp_to_datetime(proposal['voting_end_time']).strftime('%A %B %d, %H:%M')} UTC*!"
+        text += f"Make sure to vote on this governance proposal until *{voting_end_time} UTC*!"
 
     text += f"\n\nClick here to see more details: [Terra Station]({TERRA_STATION_URL}proposal/{proposal['id']})\n" \
             f"Make sure to choose *{NETWORK}* network."
@@ -53,14 +233,40 @@ def proposal_to_text(proposal: dict) -> str:
     return text
 
 
+def latest_proposal_change_time(proposals: List[dict]) -> Optional[float]:
+    """
+    Return the Unix time of the latest submission, deposit or voting period change of the proposals that already
+    happened, i.e. when the proposals changed the last time
+    """
+
+    now = time.time()
+    change_times = [terra_timestamp_to_datetime(proposal[field]).timestamp()
+                    for proposal in proposals
+                    for field in ('submit_time', 'deposit_end_time', 'voting_start_time', 'voting_end_time')
+                    if proposal.get(field)]
+    return max((change_time for change_time in change_times if change_time <= now), default=None)
+
+
 def terra_timestamp_to_datetime(timestamp: str) -> datetime:
-    return dateutil.parser.parse(timestamp)
+    """
+    Parse the RFC 3339 UTC timestamps of the LCD, e.g. 2021-03-11T15:53:49.163387563Z.
+    Fractions beyond microseconds are cut off. Other formats are left to dateutil.
+    """
+
+    if len(timestamp) < 20 or timestamp[-1] != 'Z' or timestamp[10] != 'T':
+        return dateutil.parser.parse(timestamp)
+
+    fraction = timestamp[20:-1]
+    return datetime(int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+                    int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]),
+                    int(fraction[:6].ljust(6, '0')) if fraction else 0,
+                    tzinfo=timezone.utc)
 
 
 def get_vote(wallet_addr, proposal_id) -> [str, None]:
-    response = requests.get(f'{LCD_ENDPOINT}gov/proposals/{proposal_id}/votes/{wallet_addr}')
+    response = http_service.get_json(f'{LCD_ENDPOINT}gov/proposals/{proposal_id}/votes/{wallet_addr}')
 
     if not response.ok:
         return None
 
-    return response.json()['result'].get('option', None)
+    return response.json['result'].get('option', None)
@@ -0,0 +1,268 @@
+import hashlib
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
+
+from constants.constants import HTTP_POOL_SIZE, HTTP_RETRY_BACKOFF_FACTOR, HTTP_RETRY_STATUS_CODES
+from constants.env_variables import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES
+from service import json_service
+from service.metrics_service import observe, increment
+
+# Path segments that identify a single resource (addresses, proposal ids) are grouped into one endpoint
+_RESOURCE_ID_PATTERN = re.compile(r'^(\d+|terra[a-z]*1[0-9a-z]+)$')
+# The height that the legacy LCD puts in front of every result, it changes with every block even if the result does not
+_LCD_HEIGHT_PATTERN = re.compile(rb'^\s*\{\s*"height"\s*:\s*("\d+"|\d+)\s*,')
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+_in_flight_calls = {}
+_in_flight_calls_lock = threading.Lock()
+
+_tracked_responses = {}
+_tracked_responses_lock = threading.Lock()
+
+# Monotonic time by which the requests of the current thread have to be done, see request_deadline
+_deadline = threading.local()
+
+
+class JsonResponse(NamedTuple):
+    status_code: int
+    ok: bool
+    json: Any
+    # Whether the body differs from the previous response of the same request (always True if not tracked)
+    changed: bool = True
+    digest: str = None
+
+
+class _TrackedResponse(NamedTuple):
+    response: JsonResponse
+    etag: str
+    last_modified: str
+
+
+class _InFlightCall:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+@contextmanager
+def request_deadline(deadline: Optional[float]):
+    """
+    Shorten the timeouts of all requests of this thread within the block, so that they end by the given monotonic
+    time including their retries
+    """
+
+    previous_deadline = getattr(_deadline, 'at', None)
+    _deadline.at = deadline
+    try:
+        yield
+    finally:
+        _deadline.at = previous_deadline
+
+
+def current_request_deadline() -> Optional[float]:
+    """
+    Return the deadline of this thread's requests, to pass it on to requests sent from other threads
+    """
+
+    return getattr(_deadline, 'at', None)
+
+
+def get(url, params=None, **kwargs) -> requests.Response:
+    return request('GET', url, params=params, **kwargs)
+
+
+def post(url, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def request(method, url, **kwargs) -> requests.Response:
+    """
+    Send a request through the pooled session of the url's host.
+    Raises ConnectionError if the host cannot be reached within the timeouts and retries, which are shortened to
+    end by the deadline of the thread if there is one.
+    """
+
+    kwargs['timeout'] = _timeout_within_deadline(kwargs.get('timeout', (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)))
+    endpoint = endpoint_label(url)
+
+    start = time.monotonic()
+    try:
+        return _get_session(url).request(method, url, **kwargs)
+    except RequestException as e:
+        increment(f'http.{endpoint}.errors')
+        raise ConnectionError(f"{method} {url} failed: {e}") from e
+    finally:
+        observe(f'http.{endpoint}', time.monotonic() - start)
+
+
+def _timeout_within_deadline(timeout):
+    deadline = getattr(_deadline, 'at', None)
+    if deadline is None:
+        return timeout
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise ConnectionError("The deadline of the request passed before it was sent")
+
+    # Every attempt gets its share of the remaining time
+    attempt_timeout = remaining / (HTTP_RETRIES + 1)
+    if timeout is None:
+        return attempt_timeout
+    if isinstance(timeout, tuple):
+        return tuple(min(part, attempt_timeout) for part in timeout)
+    return min(timeout, attempt_timeout)
+
+
+def get_json(url, params=None, detect_changes=False, decode=json_service.loads) -> JsonResponse:
+    """
+    GET the url and parse its JSON body with `decode`.
+    Concurrent calls for the same url and params share one request and its parsed result,
+    so callers must not modify the returned json.
+
+    With detect_changes, the previous response is kept and an unchanged body is neither parsed again nor
+    reported as changed. Conditional request headers are sent if the upstream provided an ETag or Last-Modified.
+    """
+
+    key = (url, tuple(sorted(params.items())) if params else (), detect_changes, decode)
+
+    with _in_flight_calls_lock:
+        call = _in_flight_calls.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _in_flight_calls[key] = _InFlightCall()
+
+    if not is_leader:
+        increment('http.coalesced.hits')
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.response
+
+    increment('http.coalesced.misses')
+    try:
+        if detect_changes:
+            call.response = _fetch_tracked_json(key, url, params, decode)
+        else:
+            call.response = _fetch_json(url, params, decode)
+        return call.response
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _in_flight_calls_lock:
+            del _in_flight_calls[key]
+        call.done.set()
+
+
+def _fetch_json(url, params, decode) -> JsonResponse:
+    response = get(url, params=params)
+    return JsonResponse(status_code=response.status_code, ok=response.ok, json=_decode(response, decode))
+
+
+def _decode(response: requests.Response, decode):
+    if not response.ok and not response.content:
+        return None
+
+    try:
+        return decode(response.content)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _fetch_tracked_json(key, url, params, decode) -> JsonResponse:
+    with _tracked_responses_lock:
+        tracked = _tracked_responses.get(key)
+
+    headers = {}
+    if tracked is not None:
+        if tracked.etag:
+            headers['If-None-Match'] = tracked.etag
+        if tracked.last_modified:
+            headers['If-Modified-Since'] = tracked.last_modified
+
+    response = get(url, params=params, headers=headers)
+
+    if tracked is not None and response.status_code == 304:
+        increment('http.skipped_unchanged')
+        return tracked.response._replace(changed=False)
+
+    height, payload = _split_height(response.content)
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    if tracked is not None and response.status_code == tracked.response.status_code and \
+            digest == tracked.response.digest:
+        increment('http.skipped_unchanged')
+        return tracked.response._replace(json=_with_height(tracked.response.json, height), changed=False)
+
+    json_response = JsonResponse(status_code=response.status_code,
+                                 ok=response.ok,
+                                 json=_decode(response, decode),
+                                 digest=digest)
+
+    if response.ok:
+        with _tracked_responses_lock:
+            _tracked_responses[key] = _TrackedResponse(response=json_response,
+                                                       etag=response.headers.get('ETag'),
+                                                       last_modified=response.headers.get('Last-Modified'))
+
+    return json_response
+
+
+def _split_height(content: bytes):
+    """
+    Return the height in front of a legacy LCD response, if any, and the rest of the body
+    """
+
+    match = _LCD_HEIGHT_PATTERN.match(content)
+    if match is None:
+        return None, content
+    return json_service.loads(match.group(1)), content[match.end():]
+
+
+def _with_height(json, height):
+    # The unchanged result is served with the current height, which e.g. the age of oracle prevotes is measured by
+    if height is None or not isinstance(json, dict) or json.get('height') == height:
+        return json
+    return {**json, 'height': height}
+
+
+def endpoint_label(url) -> str:
+    parsed_url = urlparse(url)
+    segments = ['{}' if _RESOURCE_ID_PATTERN.match(segment) else segment for segment in parsed_url.path.split('/')]
+    return parsed_url.netloc + '/'.join(segments)
+
+
+def _get_session(url) -> requests.Session:
+    parsed_url = urlparse(url)
+    host = f'{parsed_url.scheme}://{parsed_url.netloc}'
+
+    with _sessions_lock:
+        if host not in _sessions:
+            _sessions[host] = _create_session()
+        return _sessions[host]
+
+
+def _create_session() -> requests.Session:
+    retry = Retry(total=HTTP_RETRIES,
+                  backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+                  status_forcelist=HTTP_RETRY_STATUS_CODES,
+                  raise_on_status=False,
+                  respect_retry_after_header=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -0,0 +1,66 @@
+import io
+import json
+from typing import Any, Iterator, List
+
+from constants.env_variables import STREAM_VALIDATORS
+
+# Faster JSON backends are optional, the standard library is used if none of them is installed
+try:
+    import orjson
+
+    JSON_BACKEND = 'orjson'
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        JSON_BACKEND = 'ujson'
+        _loads = ujson.loads
+    except ImportError:
+        JSON_BACKEND = 'json'
+        _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# The only validator attributes the bot works with
+VALIDATOR_FIELDS = ('operator_address', 'status', 'jailed', 'delegator_shares')
+_VALIDATOR_FIELD_PREFIXES = {f'result.item.{field}': field for field in VALIDATOR_FIELDS}
+
+
+def loads(data: (bytes, str)) -> Any:
+    """
+    Decode a JSON document with the fastest available backend. Raises ValueError for invalid JSON.
+    """
+
+    return _loads(data)
+
+
+def parse_validators(data: bytes, streaming=STREAM_VALIDATORS) -> List[dict]:
+    """
+    Return the validators of a staking/validators response, reduced to the VALIDATOR_FIELDS.
+    In streaming mode the document is never fully materialized, which needs ijson to be installed.
+    """
+
+    if streaming and ijson is not None:
+        return list(_stream_validators(data))
+
+    return [{field: validator[field] for field in VALIDATOR_FIELDS} for validator in loads(data)['result']]
+
+
+def _stream_validators(data: bytes) -> Iterator[dict]:
+    validator = None
+    try:
+        for prefix, event, value in ijson.parse(io.BytesIO(data)):
+            if prefix == 'result.item':
+                if event == 'start_map':
+                    validator = {}
+                elif event == 'end_map':
+                    yield validator
+            elif prefix in _VALIDATOR_FIELD_PREFIXES:
+                # ijson returns numbers as Decimal
+                validator[_VALIDATOR_FIELD_PREFIXES[prefix]] = int(value) if event == 'number' else value
+    except ijson.JSONError as e:
+        raise ValueError(e) from e
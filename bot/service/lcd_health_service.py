@@ -0,0 +1,129 @@
+import threading
+import time
+
+from constants.constants import NODE_INFO_ENDPOINT, LCD_FAILURE_THRESHOLD, LCD_PROBE_INITIAL_BACKOFF_IN_SECONDS, \
+    LCD_PROBE_MAX_BACKOFF_IN_SECONDS, LCD_PROBE_INTERVAL_IN_SECONDS
+from constants.logger import logger
+from service import http_service
+from service.metrics_service import increment
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of an upstream service.
+    The circuit opens after `failure_threshold` consecutive failures. While open, a single probe is let through
+    (half open) once the backoff has passed, and the backoff doubles with every failed probe.
+    While closed, the service is probed every `probe_interval` seconds.
+    """
+
+    def __init__(self, failure_threshold, initial_backoff, max_backoff, probe_interval=0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.probe_interval = probe_interval
+        self.clock = clock
+
+        self.state = CLOSED
+        self.failures = 0
+        self.backoff = initial_backoff
+        self.opened_at = None
+        self.probed_at = None
+        self._lock = threading.Lock()
+
+    def is_closed(self) -> bool:
+        return self.state == CLOSED
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.backoff:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def is_probe_due(self) -> bool:
+        """
+        Return whether the service should be probed now and, if so, count the probe as sent
+        """
+
+        with self._lock:
+            if self.state == CLOSED:
+                now = self.clock()
+                if self.probed_at is not None and now - self.probed_at < self.probe_interval:
+                    return False
+                self.probed_at = now
+                return True
+
+        return self.allow_request()
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.backoff = self.initial_backoff
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = self.clock()
+        increment('lcd.circuit_opened')
+
+
+lcd_circuit_breaker = CircuitBreaker(failure_threshold=LCD_FAILURE_THRESHOLD,
+                                     initial_backoff=LCD_PROBE_INITIAL_BACKOFF_IN_SECONDS,
+                                     max_backoff=LCD_PROBE_MAX_BACKOFF_IN_SECONDS,
+                                     probe_interval=LCD_PROBE_INTERVAL_IN_SECONDS)
+
+
+def is_lcd_available() -> bool:
+    """
+    Return whether LCD dependent checks should run, without any request
+    """
+
+    return lcd_circuit_breaker.is_closed()
+
+
+def should_probe_lcd() -> bool:
+    """
+    Return whether the LCD is due for a health probe. While it is up, it is probed at the probe interval and while
+    it is down, probes are spaced out by the backoff.
+    """
+
+    if lcd_circuit_breaker.is_probe_due():
+        return True
+
+    increment('lcd.probes_skipped')
+    return False
+
+
+def probe_lcd() -> bool:
+    """
+    Check whether the Lite Client Daemon (LCD) is reachable and feed the result into the circuit breaker
+    """
+
+    try:
+        is_reachable = http_service.get_json(NODE_INFO_ENDPOINT).status_code == 200
+    except ConnectionError:
+        is_reachable = False
+
+    if is_reachable:
+        lcd_circuit_breaker.record_success()
+    else:
+        logger.info("LCD probe failed for " + NODE_INFO_ENDPOINT)
+        lcd_circuit_breaker.record_failure()
+
+    return is_reachable
@@ -0,0 +1,164 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, Hashable
+
+from telegram.error import RetryAfter
+
+from constants.constants import TELEGRAM_SEND_CONCURRENCY, TELEGRAM_MESSAGES_PER_SECOND, \
+    TELEGRAM_CHAT_MESSAGE_INTERVAL_IN_SECONDS
+from constants.logger import logger
+from service.metrics_service import increment, observe, set_gauge
+
+# Lower values are sent first
+ALERT_PRIORITY = 0
+REPLY_PRIORITY = 1
+NOTICE_PRIORITY = 2
+
+
+class QueuedMessage(NamedTuple):
+    priority: int
+    sequence: int
+    chat_id: Hashable
+    send: Callable[[], None]
+    enqueued_at: float
+
+
+class MessageQueue:
+    """
+    Outbound message queue that sends with several workers while respecting a global and a per chat rate limit.
+    Messages of one chat are sent one at a time and in order. Across chats, lower priorities go first.
+    A RetryAfter pauses all sending for the requested time and the message is sent again afterwards.
+    """
+
+    def __init__(self, workers, messages_per_second, chat_message_interval, clock=time.monotonic, sleep=time.sleep):
+        self.workers = workers
+        self.message_interval = 1 / messages_per_second
+        self.chat_message_interval = chat_message_interval
+        self.clock = clock
+        self.sleep = sleep
+
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        # Messages of chats without a message in flight, ordered by priority
+        self._ready = []
+        # Messages that wait for the per chat interval, ordered by the time they may be sent
+        self._delayed = []
+        # Messages queued behind the message in flight of the same chat
+        self._waiting_by_chat = {}
+        self._last_sent_at_by_chat = {}
+        self._size = 0
+        self._next_send_at = 0.0
+        self._paused_until = 0.0
+        self._free_workers = threading.Semaphore(workers)
+        self._executor = None
+        self._dispatcher = None
+
+    def put(self, chat_id, send: Callable[[], None], priority=REPLY_PRIORITY):
+        """
+        Queue a message. `send` is called by a worker and may raise RetryAfter.
+        """
+
+        message = QueuedMessage(priority, next(self._sequence), chat_id, send, self.clock())
+
+        with self._condition:
+            self._start()
+            self._size += 1
+            if chat_id in self._waiting_by_chat:
+                self._waiting_by_chat[chat_id].append(message)
+            else:
+                self._waiting_by_chat[chat_id] = deque()
+                self._schedule(message)
+            set_gauge('telegram.queue_depth', self._size)
+            self._condition.notify()
+
+    def __len__(self):
+        with self._condition:
+            return self._size
+
+    def join(self, timeout=None) -> bool:
+        """
+        Wait until all queued messages are sent and return whether the queue is empty
+        """
+
+        with self._condition:
+            return self._condition.wait_for(lambda: self._size == 0, timeout)
+
+    def _start(self):
+        if self._dispatcher is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='telegram_send')
+            self._dispatcher = threading.Thread(target=self._dispatch, name='telegram_queue', daemon=True)
+            self._dispatcher.start()
+
+    def _schedule(self, message: QueuedMessage):
+        # Called with the condition held, for a chat that has no other message in _ready, _delayed or in flight
+        send_at = self._last_sent_at_by_chat.get(message.chat_id, float('-inf')) + self.chat_message_interval
+        if send_at > self.clock():
+            heapq.heappush(self._delayed, (send_at, message.sequence, message))
+        else:
+            heapq.heappush(self._ready, (message.priority, message.sequence, message))
+
+    def _dispatch(self):
+        while True:
+            self._free_workers.acquire()
+            message = self._next_message()
+
+            now = self.clock()
+            send_at = max(now, self._next_send_at, self._paused_until)
+            self._next_send_at = send_at + self.message_interval
+            if send_at > now:
+                self.sleep(send_at - now)
+
+            self._executor.submit(self._deliver, message)
+
+    def _next_message(self) -> QueuedMessage:
+        with self._condition:
+            while True:
+                now = self.clock()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, _, message = heapq.heappop(self._delayed)
+                    heapq.heappush(self._ready, (message.priority, message.sequence, message))
+
+                if self._ready:
+                    return heapq.heappop(self._ready)[2]
+
+                self._condition.wait(self._delayed[0][0] - now if self._delayed else None)
+
+    def _deliver(self, message: QueuedMessage):
+        try:
+            message.send()
+            increment('telegram.sent')
+        except RetryAfter as e:
+            logger.warning(f"Telegram flood limit reached, pausing all messages for {e.retry_after}s")
+            increment('telegram.retry_after')
+            self._free_workers.release()
+            with self._condition:
+                self._paused_until = max(self._paused_until, self.clock() + e.retry_after)
+                heapq.heappush(self._ready, (message.priority, message.sequence, message))
+                self._condition.notify()
+            return
+        except Exception as e:
+            increment('telegram.errors')
+            logger.error(f"Sending a message to telegram user {message.chat_id} failed: {e}", exc_info=True)
+
+        self._free_workers.release()
+        observe('telegram.send_latency', self.clock() - message.enqueued_at)
+
+        with self._condition:
+            self._size -= 1
+            self._last_sent_at_by_chat[message.chat_id] = self.clock()
+            waiting = self._waiting_by_chat[message.chat_id]
+            if waiting:
+                self._schedule(waiting.popleft())
+            else:
+                del self._waiting_by_chat[message.chat_id]
+            set_gauge('telegram.queue_depth', self._size)
+            self._condition.notify_all()
+
+
+message_queue = MessageQueue(workers=TELEGRAM_SEND_CONCURRENCY,
+                             messages_per_second=TELEGRAM_MESSAGES_PER_SECOND,
+                             chat_message_interval=TELEGRAM_CHAT_MESSAGE_INTERVAL_IN_SECONDS)
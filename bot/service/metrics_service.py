@@ -0,0 +1,76 @@
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_timings = {}
+_gauges = {}
+
+
+def increment(name: str, value: int = 1):
+    """
+    Increase the counter with the given name
+    """
+
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name: str, seconds: float):
+    """
+    Record one duration measurement of the given name
+    """
+
+    with _lock:
+        timing = _timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0})
+        timing['count'] += 1
+        timing['total'] += seconds
+        timing['max'] = max(timing['max'], seconds)
+        timing['last'] = seconds
+
+
+def set_gauge(name: str, value: float):
+    """
+    Set the current value of the gauge with the given name
+    """
+
+    with _lock:
+        _gauges[name] = value
+
+
+def get_counter(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def get_gauge(name: str) -> float:
+    with _lock:
+        return _gauges.get(name, 0)
+
+
+def get_timing(name: str) -> dict:
+    with _lock:
+        return dict(_timings.get(name, {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0}))
+
+
+def metrics_to_text() -> str:
+    """
+    Return a human readable summary of all counters, gauges and timings
+    """
+
+    with _lock:
+        lines = [f'{name}: {value}' for name, value in sorted(_counters.items())]
+        lines += [f'{name}: {value}' for name, value in sorted(_gauges.items())]
+        for name, timing in sorted(_timings.items()):
+            average = timing['total'] / timing['count'] if timing['count'] else 0.0
+            lines.append(f"{name}: count={timing['count']} avg={average:.3f}s max={timing['max']:.3f}s "
+                         f"last={timing['last']:.3f}s")
+
+    return '\n'.join(lines)
+
+
+def reset_metrics():
+    with _lock:
+        _counters.clear()
+        _timings.clear()
+        _gauges.clear()
@@ -1,15 +1,22 @@
-import requests
+from service import http_service, json_service
 
 
-def is_syncing(node_ip):
-    response = requests.get(f'{node_ip}/syncing')
+def is_syncing(node_ip, timeout=None) -> bool:
+    """
+    Return whether the node behind the LCD URL is syncing.
+    Raises ConnectionError if the node cannot be reached within the timeout in seconds.
+    """
+
+    # Sentry nodes are configured as host:port
+    url = node_ip if '://' in node_ip else f'http://{node_ip}'
+    response = http_service.get(f'{url}/syncing', **({'timeout': timeout} if timeout is not None else {}))
 
     if not response.ok:
-        raise ConnectionError
+        raise ConnectionError(f"{url}/syncing responded with {response.status_code}")
 
-    syncing = response.json().get('syncing', False)
+    try:
+        syncing = json_service.loads(response.content).get('syncing')
+    except (ValueError, AttributeError) as e:
+        raise ConnectionError(f"{url}/syncing returned invalid JSON") from e
 
-    if syncing is bool and syncing:
-        return True
-    else:
-        return False
+    return syncing is True
@@ -0,0 +1,54 @@
+import threading
+import time
+from typing import NamedTuple
+
+from constants.constants import NODE_STATUS_ENDPOINT, JOB_INTERVAL_IN_SECONDS
+from constants.logger import logger
+from service import http_service
+
+
+class NodeStatus(NamedTuple):
+    """
+    The parts of the Tendermint /status response the node checks need
+    """
+
+    catching_up: bool
+    latest_block_height: int
+    latest_block_time: str
+    fetched_at: float
+
+
+_node_status = None
+_node_status_lock = threading.Lock()
+
+
+def get_node_status(max_age=JOB_INTERVAL_IN_SECONDS) -> NodeStatus:
+    """
+    Return the status of your Terra Node shared by all users, refetching it if it is older than max_age seconds.
+    Raises ConnectionError if the node is not reachable.
+    """
+
+    global _node_status
+
+    with _node_status_lock:
+        if _node_status is None or time.monotonic() - _node_status.fetched_at >= max_age:
+            _node_status = fetch_node_status()
+        return _node_status
+
+
+def fetch_node_status() -> NodeStatus:
+    response = http_service.get_json(NODE_STATUS_ENDPOINT)
+    if response.status_code != 200:
+        logger.info("ConnectionError while requesting " + NODE_STATUS_ENDPOINT)
+        raise ConnectionError
+
+    return parse_node_status(response.json)
+
+
+def parse_node_status(status: dict) -> NodeStatus:
+    sync_info = status['result']['sync_info']
+
+    return NodeStatus(catching_up=bool(sync_info['catching_up']),
+                      latest_block_height=int(sync_info['latest_block_height']),
+                      latest_block_time=sync_info['latest_block_time'],
+                      fetched_at=time.monotonic())
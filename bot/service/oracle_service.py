@@ -0,0 +1,127 @@
+import threading
+import time
+from functools import partial
+from typing import Callable, Dict, Hashable, Iterable, List
+
+from constants.constants import ORACLE_VOTER_PREVOTES_ENDPOINT, ORACLE_DENOM_PREVOTES_ENDPOINT, \
+    ORACLE_ACTIVE_DENOMS_ENDPOINT, ORACLE_PREVOTE_MAX_AGE_IN_BLOCKS, ORACLE_ACTIVE_DENOMS_MAX_AGE_IN_SECONDS
+from constants.env_variables import DEBUG
+from constants.logger import logger
+from service import http_service
+
+ACTIVE_DENOMS = 'active_denoms'
+
+
+class OracleMonitor:
+    """
+    Price feed health of all monitored validators, fetched once per monitoring tick.
+    The prevotes are either fetched per validator or, if that needs fewer requests, per active denom for all
+    validators at once. A validator's price feed is unhealthy if one of its prevotes is too old.
+    """
+
+    def __init__(self, bulk=True, clock=time.monotonic):
+        self.bulk = bulk
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._active_denoms = None
+        self._active_denoms_fetched_at = None
+
+    def fetchers(self, addresses: Iterable[str]) -> Dict[Hashable, Callable]:
+        """
+        Return the fetchers of the prevotes of the given validators, to be run concurrently with other requests
+        """
+
+        addresses = list(addresses)
+        with self._lock:
+            active_denoms = self._active_denoms
+            are_active_denoms_stale = self._active_denoms_fetched_at is None or \
+                self.clock() - self._active_denoms_fetched_at >= ORACLE_ACTIVE_DENOMS_MAX_AGE_IN_SECONDS
+
+        if self.bulk and active_denoms and len(active_denoms) < len(addresses):
+            fetchers = {('denom_prevotes', denom): partial(get_denom_prevotes, denom) for denom in active_denoms}
+        else:
+            fetchers = {('voter_prevotes', address): partial(get_voter_prevotes, address) for address in addresses}
+
+        if self.bulk and are_active_denoms_stale:
+            fetchers[ACTIVE_DENOMS] = get_active_denoms
+        return fetchers
+
+    def price_feed_health(self, addresses: Iterable[str], results: Dict[Hashable, object]) -> Dict[str, bool]:
+        """
+        Return the price feed health of every given validator that could be determined from the fetch results
+        """
+
+        active_denoms = results.get(ACTIVE_DENOMS)
+        if active_denoms is not None and not _is_failure(ACTIVE_DENOMS, active_denoms):
+            with self._lock:
+                self._active_denoms = active_denoms
+                self._active_denoms_fetched_at = self.clock()
+
+        denom_prevotes = {key: result for key, result in results.items() if key[0] == 'denom_prevotes'}
+        if denom_prevotes:
+            # Prevotes of a failed denom could be stale, so nothing is known in that case
+            if any(_is_failure(key, result) for key, result in denom_prevotes.items()):
+                return {}
+
+            stale_voters = set()
+            for prevotes in denom_prevotes.values():
+                stale_voters.update(prevote['voter'] for prevote in prevotes['result'] if _is_stale(prevote, prevotes))
+            return {address: address not in stale_voters for address in addresses}
+
+        health = {}
+        for address in addresses:
+            key = ('voter_prevotes', address)
+            prevotes = results.get(key)
+            if prevotes is not None and not _is_failure(key, prevotes):
+                health[address] = not any(_is_stale(prevote, prevotes) for prevote in prevotes['result'])
+        return health
+
+
+def _is_stale(prevote, prevotes) -> bool:
+    return int(prevote['submit_block']) < int(prevotes['height']) - ORACLE_PREVOTE_MAX_AGE_IN_BLOCKS
+
+
+def _is_failure(key, result) -> bool:
+    if isinstance(result, (ConnectionError, TimeoutError)):
+        return True
+    elif isinstance(result, Exception):
+        logger.error(f"Fetching {key} failed: {result}", exc_info=result)
+        return True
+    return False
+
+
+def get_voter_prevotes(address) -> dict:
+    """
+    Return the current oracle prevotes of one validator
+    """
+
+    return _get_oracle_json(ORACLE_VOTER_PREVOTES_ENDPOINT.format(address))
+
+
+def get_denom_prevotes(denom) -> dict:
+    """
+    Return the current oracle prevotes of all validators for one denom
+    """
+
+    return _get_oracle_json(ORACLE_DENOM_PREVOTES_ENDPOINT.format(denom))
+
+
+def get_active_denoms() -> List[str]:
+    """
+    Return the denoms the validators currently vote on
+    """
+
+    return _get_oracle_json(ORACLE_ACTIVE_DENOMS_ENDPOINT)['result']
+
+
+def _get_oracle_json(url) -> dict:
+    response = http_service.get_json(url, detect_changes=True)
+    if response.status_code != 200:
+        logger.info("ConnectionError while requesting " + url)
+        raise ConnectionError
+    return response.json
+
+
+# The local mock API only serves the prevotes of a single validator
+oracle_monitor = OracleMonitor(bulk=not DEBUG)
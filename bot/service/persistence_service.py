@@ -0,0 +1,171 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import DefaultDict, Dict, Mapping, Optional
+
+from telegram.ext import BasePersistence
+
+from constants.logger import logger
+from service.metrics_service import increment, observe
+
+USER_DATA = 'user'
+CHAT_DATA = 'chat'
+BOT_DATA = 'bot'
+BOT_DATA_ID = 0
+# Per-user copies of global monitoring state from before it was tracked once in the bot data
+OBSOLETE_USER_DATA_KEYS = ['is_lcd_reachable', 'is_node_reachable', 'is_price_feed_healthy', 'is_catching_up',
+                           'block_height', 'block_height_stuck_count', 'validator_snapshot_version',
+                           'governance_proposals_version', 'governance_proposals_count', 'monitored_active_proposals']
+
+
+class SqlitePersistence(BasePersistence):
+    """
+    Persistence that keeps every user's and chat's data in its own row of a SQLite database in WAL mode.
+    The data of all users and the bot data are handed over after every update, and the bot data and the users a
+    monitoring tick changed after every tick; only rows whose pickled data changed are written.
+    """
+
+    def __init__(self, filename, pickle_filename=None):
+        super().__init__(store_user_data=True, store_chat_data=True, store_bot_data=True)
+        self.filename = filename
+        self.pickle_filename = pickle_filename
+
+        self._lock = threading.Lock()
+        self._connection = None
+        # Digests of the stored rows, to detect unchanged data without reading it back
+        self._digests = {}
+        self._conversations = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.filename)), exist_ok=True)
+            self._connection = sqlite3.connect(self.filename, check_same_thread=False, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            # With WAL, NORMAL only syncs at checkpoints and can never corrupt the database
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS data ('
+                                     'kind TEXT NOT NULL, id INTEGER NOT NULL, data BLOB NOT NULL, '
+                                     'PRIMARY KEY (kind, id)) WITHOUT ROWID')
+            self._migrate_pickle_file()
+        return self._connection
+
+    def _migrate_pickle_file(self):
+        if not self.pickle_filename or not os.path.exists(self.pickle_filename):
+            return
+        if self._connection.execute('SELECT 1 FROM data LIMIT 1').fetchone() is not None:
+            return
+
+        logger.info(f"Migrating {self.pickle_filename} to {self.filename}")
+        with open(self.pickle_filename, 'rb') as pickle_file:
+            data = pickle.load(pickle_file)
+
+        rows = [(USER_DATA, user_id, _dumps(user_data)) for user_id, user_data in data['user_data'].items()]
+        rows += [(CHAT_DATA, chat_id, _dumps(chat_data)) for chat_id, chat_data in data['chat_data'].items()]
+        rows.append((BOT_DATA, BOT_DATA_ID, _dumps(data.get('bot_data', {}))))
+
+        with self._connection:
+            self._connection.execute('BEGIN')
+            self._connection.executemany('INSERT INTO data (kind, id, data) VALUES (?, ?, ?)', rows)
+
+        # Keep the old file around, but make sure it is not migrated again
+        os.replace(self.pickle_filename, self.pickle_filename + '.migrated')
+
+    def _load(self, kind) -> Dict:
+        with self._lock:
+            rows = self._connect().execute('SELECT id, data FROM data WHERE kind = ?', (kind,)).fetchall()
+
+        data = {}
+        for row_id, blob in rows:
+            data[row_id] = pickle.loads(blob)
+            self._digests[(kind, row_id)] = _digest(blob)
+        return data
+
+    def _store(self, kind, row_id, data):
+        blob = _dumps(data)
+        digest = _digest(blob)
+
+        with self._lock:
+            if self._digests.get((kind, row_id)) == digest:
+                return
+
+            start = time.monotonic()
+            self._connect().execute('INSERT OR REPLACE INTO data (kind, id, data) VALUES (?, ?, ?)',
+                                    (kind, row_id, blob))
+            self._digests[(kind, row_id)] = digest
+            observe('persistence.write', time.monotonic() - start)
+            increment('persistence.rows_written')
+
+    def _drop(self, kind, row_id):
+        with self._lock:
+            self._connect().execute('DELETE FROM data WHERE kind = ? AND id = ?', (kind, row_id))
+            self._digests.pop((kind, row_id), None)
+
+    def get_user_data(self) -> DefaultDict[int, dict]:
+        return defaultdict(dict, self._load(USER_DATA))
+
+    def get_chat_data(self) -> DefaultDict[int, dict]:
+        return defaultdict(dict, self._load(CHAT_DATA))
+
+    def get_bot_data(self) -> dict:
+        return self._load(BOT_DATA).get(BOT_DATA_ID, {})
+
+    def get_conversations(self, name: str) -> Dict:
+        # The bot has no conversation handlers, so conversations are only kept in memory
+        return self._conversations.setdefault(name, {})
+
+    def update_conversation(self, name: str, key, new_state: Optional[object]):
+        self._conversations.setdefault(name, {})[key] = new_state
+
+    def update_user_data(self, user_id: int, data: dict):
+        self._store(USER_DATA, user_id, data)
+
+    def update_chat_data(self, chat_id: int, data: dict):
+        self._store(CHAT_DATA, chat_id, data)
+
+    def update_bot_data(self, data: dict):
+        self._store(BOT_DATA, BOT_DATA_ID, data)
+
+    def drop_user_data(self, user_id: int):
+        self._drop(USER_DATA, user_id)
+
+    def drop_chat_data(self, chat_id: int):
+        self._drop(CHAT_DATA, chat_id)
+
+    def flush(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                self._connection.close()
+                self._connection = None
+
+    def insert_bot(self, obj):
+        # The stored data never contains bot instances, which saves a deep copy of all data on every update
+        return obj
+
+    def replace_bot(self, obj):
+        return obj
+
+
+def compact_user_data(user_data: Mapping):
+    """
+    Migrate persisted user data to the compact format: the monitored nodes are a set of addresses, the validator
+    details are only kept in the shared validator snapshot and per-user copies of global state are dropped.
+    """
+
+    for data in user_data.values():
+        if isinstance(data.get('nodes'), dict):
+            data['nodes'] = set(data['nodes'])
+        for key in OBSOLETE_USER_DATA_KEYS:
+            data.pop(key, None)
+
+
+def _dumps(data) -> bytes:
+    return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _digest(blob: bytes) -> bytes:
+    return hashlib.blake2b(blob, digest_size=16).digest()
@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+from constants.constants import POLLING_INTERVALS_IN_SECONDS, POLLING_BACKOFF_AFTER_UNCHANGED_POLLS
+from service.metrics_service import increment, observe, set_gauge
+
+_NOT_POLLED = object()
+
+
+class PollingCadence:
+    """
+    When to poll one upstream data source next.
+    The source is polled every `interval` seconds, every `incident_interval` seconds while an incident is open and
+    the interval doubles up to `max_interval` once the data did not change for `backoff_after` polls in a row.
+    """
+
+    def __init__(self, source, interval, incident_interval, max_interval,
+                 backoff_after=POLLING_BACKOFF_AFTER_UNCHANGED_POLLS, clock=time.monotonic, wall_clock=time.time):
+        self.source = source
+        self.base_interval = interval
+        self.incident_interval = incident_interval
+        self.max_interval = max_interval
+        self.backoff_after = backoff_after
+        self.clock = clock
+        self.wall_clock = wall_clock
+
+        self.interval = interval
+        self.fingerprint = _NOT_POLLED
+        self._unchanged_polls = 0
+        self._polled_at = None
+        self._lock = threading.Lock()
+
+    def is_due(self) -> bool:
+        with self._lock:
+            return self._polled_at is None or self.clock() - self._polled_at >= self.interval
+
+    def polled(self, fingerprint: Hashable, is_incident=False, requests=1,
+               changed_at: Callable[[], Optional[float]] = None) -> bool:
+        """
+        Record a successful poll and return whether the data changed since the previous poll.
+        The fingerprint identifies the polled data, e.g. its version. Sources whose data tells when it changed pass
+        changed_at, which returns that Unix time and is only called for changed data.
+        """
+
+        with self._lock:
+            now = self.clock()
+            changed = self.fingerprint is not _NOT_POLLED and fingerprint != self.fingerprint
+            if changed:
+                # The change happened at some point since the previous poll
+                observe(f'polling.{self.source}.poll_interval_at_change', now - self._polled_at)
+                change_time = changed_at() if changed_at is not None else None
+                if change_time is not None:
+                    observe(f'polling.{self.source}.detection_latency', max(self.wall_clock() - change_time, 0))
+
+            if is_incident:
+                self.interval = self.incident_interval
+                self._unchanged_polls = 0
+            elif changed or self.fingerprint is _NOT_POLLED:
+                self.interval = self.base_interval
+                self._unchanged_polls = 0
+            else:
+                self._unchanged_polls += 1
+                if self._unchanged_polls >= self.backoff_after:
+                    self.interval = min(max(self.interval, self.base_interval) * 2, self.max_interval)
+                    self._unchanged_polls = 0
+
+            self.fingerprint = fingerprint
+            self._record_poll(now, requests)
+            return changed
+
+    def failed(self, is_incident=False, requests=1):
+        """
+        Record a failed poll. Failures of sources whose unavailability is an incident are polled faster.
+        """
+
+        with self._lock:
+            self.interval = self.incident_interval if is_incident else self.base_interval
+            self._unchanged_polls = 0
+            self._record_poll(self.clock(), requests)
+
+    def _record_poll(self, now, requests):
+        self._polled_at = now
+        increment(f'polling.{self.source}.requests', requests)
+        set_gauge(f'polling.{self.source}.interval', self.interval)
+
+
+def create_polling_cadences() -> Dict[str, PollingCadence]:
+    return {source: PollingCadence(source, *intervals) for source, intervals in POLLING_INTERVALS_IN_SECONDS.items()}
+
+
+polling_cadences = create_polling_cadences()
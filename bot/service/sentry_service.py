@@ -0,0 +1,139 @@
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from constants.constants import SENTRY_PROBE_CONCURRENCY, SENTRY_PROBE_TIMEOUT_IN_SECONDS, \
+    SENTRY_CHECK_DEADLINE_IN_SECONDS, SENTRY_STATE_CHANGE_AFTER_PROBES, SENTRY_PROBE_HISTORY_LENGTH
+from constants.logger import logger
+from service.fetch_service import fetch_concurrently
+from service.metrics_service import increment, observe, set_gauge
+from service.network_service import is_syncing
+
+
+class SentryProbe(NamedTuple):
+    # None if the probe failed or missed the deadline
+    syncing: Optional[bool]
+    latency: Optional[float]
+
+
+class SentryNodeHistory:
+    """
+    The latest probes of one sentry node
+    """
+
+    def __init__(self, length=SENTRY_PROBE_HISTORY_LENGTH):
+        self.probes = deque(maxlen=length)
+
+    def record(self, probe: SentryProbe):
+        self.probes.append(probe)
+
+    def recent_states(self, count) -> List[bool]:
+        """
+        Return the syncing states of the latest `count` successful probes, oldest first
+        """
+
+        states = [probe.syncing for probe in self.probes if probe.syncing is not None]
+        return states[-count:]
+
+    def median_latency(self) -> Optional[float]:
+        latencies = [probe.latency for probe in self.probes if probe.latency is not None]
+        return statistics.median(latencies) if latencies else None
+
+
+class SentryProber:
+    """
+    Prober of the syncing status of all sentry nodes at once.
+    The nodes are probed concurrently in dedicated worker threads, every probe has a timeout and the whole round a
+    deadline. A node's confirmed status, which is kept in the bot data, only changes once the latest
+    `confirm_after` successful probes agree on the new status.
+    """
+
+    def __init__(self, concurrency=SENTRY_PROBE_CONCURRENCY, timeout=SENTRY_PROBE_TIMEOUT_IN_SECONDS,
+                 deadline=SENTRY_CHECK_DEADLINE_IN_SECONDS, confirm_after=SENTRY_STATE_CHANGE_AFTER_PROBES,
+                 history_length=SENTRY_PROBE_HISTORY_LENGTH, clock=time.monotonic):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.deadline = deadline
+        self.confirm_after = confirm_after
+        self.history_length = history_length
+        self.clock = clock
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._histories: Dict[str, SentryNodeHistory] = {}
+        # Nodes whose latest successful probe disagrees with their confirmed status
+        self.pending_changes = set()
+
+    def probe(self, node_ips: Iterable[str], sentry_nodes_data: dict) -> List[Tuple[str, bool]]:
+        """
+        Probe all given nodes and return the nodes whose confirmed syncing status changed, with their new status
+        """
+
+        node_ips = list(node_ips)
+        results = fetch_concurrently({node_ip: partial(self._probe, node_ip) for node_ip in node_ips},
+                                     concurrency=self.concurrency,
+                                     deadlines={node_ip: self.deadline for node_ip in node_ips},
+                                     executor=self._get_executor())
+
+        changes = []
+        pending_changes = set()
+        for node_ip in node_ips:
+            probe = self._to_probe(node_ip, results[node_ip])
+            with self._lock:
+                history = self._histories.setdefault(node_ip, SentryNodeHistory(self.history_length))
+                history.record(probe)
+                recent_states = history.recent_states(self.confirm_after)
+
+            node_data = sentry_nodes_data.setdefault(node_ip, {})
+            was_syncing = node_data.setdefault('syncing', False)
+            disagreeing_states = [state for state in recent_states if state != was_syncing]
+            if len(disagreeing_states) == self.confirm_after:
+                node_data['syncing'] = not was_syncing
+                changes.append((node_ip, node_data['syncing']))
+            elif recent_states and recent_states[-1] != was_syncing:
+                pending_changes.add(node_ip)
+                increment('sentry_nodes.unconfirmed_changes')
+
+        self.pending_changes = pending_changes
+        set_gauge('sentry_nodes.syncing', sum(sentry_nodes_data[node_ip]['syncing'] for node_ip in node_ips))
+        histories = [self.history(node_ip) for node_ip in node_ips]
+        set_gauge('sentry_nodes.unknown', sum(history.probes[-1].syncing is None for history in histories))
+        latencies = [latency for latency in (history.median_latency() for history in histories) if latency is not None]
+        set_gauge('sentry_nodes.slowest_median_latency', max(latencies, default=0))
+        return changes
+
+    def history(self, node_ip) -> Optional[SentryNodeHistory]:
+        with self._lock:
+            return self._histories.get(node_ip)
+
+    def _probe(self, node_ip) -> SentryProbe:
+        start = self.clock()
+        syncing = is_syncing(node_ip, timeout=self.timeout)
+        return SentryProbe(syncing=syncing, latency=self.clock() - start)
+
+    def _to_probe(self, node_ip, result) -> SentryProbe:
+        if isinstance(result, TimeoutError):
+            increment('sentry_nodes.timeouts')
+            logger.warning(f"{result}, the status of sentry node {node_ip} is unknown")
+            return SentryProbe(syncing=None, latency=None)
+        elif isinstance(result, Exception):
+            increment('sentry_nodes.errors')
+            logger.info(f"Probing sentry node {node_ip} failed: {result}")
+            return SentryProbe(syncing=None, latency=None)
+
+        observe('sentry_nodes.probe', result.latency)
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use, so that no threads are started without sentry nodes
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='sentry_probe')
+            return self._executor
+
+
+sentry_prober = SentryProber()
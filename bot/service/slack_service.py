@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from typing import Callable, Hashable, List
+
+from constants.constants import SLACK_DEDUP_WINDOW_IN_SECONDS, SLACK_BATCH_DELAY_IN_SECONDS, SLACK_BATCH_SIZE, \
+    SLACK_MAX_ATTEMPTS, SLACK_RETRY_INITIAL_BACKOFF_IN_SECONDS, SLACK_RETRY_MAX_BACKOFF_IN_SECONDS
+from constants.env_variables import SLACK_WEBHOOK
+from constants.logger import logger
+from service import http_service
+from service.metrics_service import increment, set_gauge
+
+
+class SlackOutbox:
+    """
+    Background sender for Slack webhook messages.
+    A message that repeats the previous message of the same key within the dedup window is posted once, so a change
+    back and forth is still posted every time. Messages that arrive within the batch delay are posted together in
+    one webhook payload. Failed posts are retried with exponential backoff.
+    """
+
+    def __init__(self, post: Callable[[List[str]], bool], dedup_window, batch_delay, batch_size, max_attempts,
+                 initial_backoff, max_backoff, clock=time.monotonic):
+        self.post = post
+        self.dedup_window = dedup_window
+        self.batch_delay = batch_delay
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._in_flight = 0
+        self._last_queued_by_key = {}
+        self._sender = None
+
+    def put(self, text: str, key: Hashable = None):
+        """
+        Queue a message. The key identifies what the message is about, e.g. an event and its address, messages
+        without a key are only compared with the previous message without a key.
+        """
+
+        with self._condition:
+            now = self.clock()
+            self._last_queued_by_key = {
+                queued_key: (queued_text, queued_at)
+                for queued_key, (queued_text, queued_at) in self._last_queued_by_key.items()
+                if now - queued_at < self.dedup_window
+            }
+            if self._last_queued_by_key.get(key, (None,))[0] == text:
+                increment('slack.deduplicated')
+                return
+
+            self._last_queued_by_key[key] = (text, now)
+            self._pending.append(text)
+            set_gauge('slack.queue_depth', len(self._pending))
+
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._send_batches, name='slack_outbox', daemon=True)
+                self._sender.start()
+            self._condition.notify()
+
+    def join(self, timeout=None) -> bool:
+        """
+        Wait until all queued messages are posted or given up and return whether the outbox is empty
+        """
+
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def _send_batches(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+
+            # Give alerts of the same tick the chance to join the batch
+            time.sleep(self.batch_delay)
+
+            with self._condition:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                self._in_flight = len(batch)
+                set_gauge('slack.queue_depth', len(self._pending))
+
+            self._post_with_retries(batch)
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _post_with_retries(self, batch: List[str]):
+        backoff = self.initial_backoff
+        for attempt in range(1, self.max_attempts + 1):
+            if self.post(batch):
+                increment('slack.posted')
+                increment('slack.messages', len(batch))
+                return
+
+            increment('slack.errors')
+            if attempt < self.max_attempts:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+        logger.error(f"Giving up on {len(batch)} Slack messages after {self.max_attempts} attempts")
+        increment('slack.dropped', len(batch))
+
+
+def post_to_slack_webhook(texts: List[str]) -> bool:
+    """
+    Post the texts as one message to the Slack webhook and return whether Slack accepted it
+    """
+
+    try:
+        response = http_service.post(SLACK_WEBHOOK,
+                                     data=json.dumps({'text': '\n\n'.join(texts)}),
+                                     headers={'Content-Type': 'application/json'})
+    except ConnectionError as e:
+        logger.error(f"Slack Webhook post request failed with:\n{e}")
+        return False
+
+    if not response.ok:
+        logger.error(f"Slack Webhook post request failed with status {response.status_code}:\n{response.text}")
+    return response.ok
+
+
+slack_outbox = SlackOutbox(post=post_to_slack_webhook,
+                           dedup_window=SLACK_DEDUP_WINDOW_IN_SECONDS,
+                           batch_delay=SLACK_BATCH_DELAY_IN_SECONDS,
+                           batch_size=SLACK_BATCH_SIZE,
+                           max_attempts=SLACK_MAX_ATTEMPTS,
+                           initial_backoff=SLACK_RETRY_INITIAL_BACKOFF_IN_SECONDS,
+                           max_backoff=SLACK_RETRY_MAX_BACKOFF_IN_SECONDS)
@@ -0,0 +1,48 @@
+import threading
+from typing import FrozenSet, Mapping, Iterable
+
+
+class SubscriptionIndex:
+    """
+    Reverse index from validator operator address to the chats that monitor it.
+    The nodes in each user's data stay the source of truth, the index is kept in sync by the handlers that
+    add or remove nodes and is rebuilt from the persisted user data on startup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chat_ids_by_address = {}
+
+    def subscribe(self, chat_id, address):
+        with self._lock:
+            self._chat_ids_by_address.setdefault(address, set()).add(chat_id)
+
+    def unsubscribe(self, chat_id, addresses: Iterable[str]):
+        with self._lock:
+            for address in addresses:
+                chat_ids = self._chat_ids_by_address.get(address)
+                if chat_ids is None:
+                    continue
+                chat_ids.discard(chat_id)
+                if not chat_ids:
+                    del self._chat_ids_by_address[address]
+
+    def subscribers(self, address) -> FrozenSet:
+        with self._lock:
+            return frozenset(self._chat_ids_by_address.get(address, ()))
+
+    def addresses(self) -> FrozenSet[str]:
+        with self._lock:
+            return frozenset(self._chat_ids_by_address.keys())
+
+    def rebuild(self, user_data: Mapping):
+        chat_ids_by_address = {}
+        for chat_id, data in user_data.items():
+            for address in data.get('nodes', ()):
+                chat_ids_by_address.setdefault(address, set()).add(chat_id)
+
+        with self._lock:
+            self._chat_ids_by_address = chat_ids_by_address
+
+
+subscription_index = SubscriptionIndex()
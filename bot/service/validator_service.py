@@ -0,0 +1,143 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, FrozenSet, NamedTuple
+
+from constants.constants import VALIDATORS_ENDPOINT, VALIDATOR_QUERY_STATUSES, VALIDATOR_QUERY_LIMIT, \
+    JOB_INTERVAL_IN_SECONDS
+from constants.env_variables import DEBUG
+from constants.logger import logger
+from service import http_service, json_service
+from service.http_service import JsonResponse
+from service.lcd_health_service import is_lcd_available
+from service.metrics_service import increment
+
+
+class Validator(NamedTuple):
+    """
+    The attributes of a validator the bot works with. The state of all validators is held once in the
+    shared snapshot instead of in every user's data.
+    """
+
+    operator_address: str
+    status: int
+    jailed: bool
+    delegator_shares: str
+
+
+class ValidatorSnapshot:
+    """
+    All validators of a single LCD fetch, indexed by their operator address and by status and jailed flag.
+    The version is a digest of the LCD responses, so equal versions mean equal validator data.
+    A snapshot is only built when the data changed, which also rebuilds the indexes.
+    """
+
+    def __init__(self, validators: List[dict], version: str):
+        self.fetched_at = time.monotonic()
+        self.version = version
+        self.validators = {validator['operator_address']: Validator(**validator) for validator in validators}
+
+        addresses_by_status = {}
+        jailed_addresses = set()
+        for address, validator in self.validators.items():
+            addresses_by_status.setdefault(validator.status, set()).add(address)
+            if validator.jailed:
+                jailed_addresses.add(address)
+
+        self._addresses_by_status = {status: frozenset(addresses) for status, addresses in addresses_by_status.items()}
+        self._jailed_addresses = frozenset(jailed_addresses)
+
+    def get(self, address) -> Optional[Validator]:
+        return self.validators.get(address)
+
+    def addresses_with_status(self, status: int) -> FrozenSet[str]:
+        return self._addresses_by_status.get(status, frozenset())
+
+    def jailed_addresses(self) -> FrozenSet[str]:
+        return self._jailed_addresses
+
+    def __contains__(self, address) -> bool:
+        return address in self.validators
+
+    def __len__(self) -> int:
+        return len(self.validators)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+# The validators of every status are queried at once
+_page_executor = ThreadPoolExecutor(max_workers=len(VALIDATOR_QUERY_STATUSES), thread_name_prefix='validator_pages')
+
+
+def get_validator_snapshot(max_age=JOB_INTERVAL_IN_SECONDS) -> ValidatorSnapshot:
+    """
+    Return the validator snapshot shared by all users, refetching it if it is older than max_age seconds.
+    Concurrent callers wait for a running fetch instead of issuing their own.
+    """
+
+    global _snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or time.monotonic() - _snapshot.fetched_at >= max_age:
+            responses = fetch_validator_responses()
+
+            if _snapshot is not None and not any(response.changed for response in responses):
+                # Nothing changed upstream, so the snapshot is kept without parsing or indexing anything
+                increment('validators.snapshot_unchanged')
+                _snapshot.fetched_at = time.monotonic()
+            else:
+                version = hashlib.blake2b(''.join(response.digest for response in responses).encode(),
+                                          digest_size=16).hexdigest()
+                validators = [validator for response in responses for validator in response.json]
+                _snapshot = ValidatorSnapshot(validators, version)
+
+        return _snapshot
+
+
+def get_cached_validator_snapshot() -> ValidatorSnapshot:
+    """
+    Return the validator snapshot the monitoring job keeps up to date, without waiting for a running fetch.
+    It is only fetched if there is none yet. Raises ConnectionError if that is needed while the LCD is unavailable.
+    """
+
+    snapshot = _snapshot
+    if snapshot is not None:
+        return snapshot
+
+    if not is_lcd_available():
+        raise ConnectionError("The LCD is unavailable and no validator snapshot was fetched yet")
+    return get_validator_snapshot()
+
+
+def fetch_validator_responses() -> List[JsonResponse]:
+    """
+    Return the LCD responses that together contain the validators of all bonding statuses.
+    The statuses are queried concurrently, within the request deadline of the calling thread.
+    """
+
+    if DEBUG:
+        # The local mock file already contains validators of every status
+        return [_fetch_validators(params=None)]
+
+    deadline = http_service.current_request_deadline()
+    futures = [
+        _page_executor.submit(_fetch_validators, params={'status': status, 'limit': VALIDATOR_QUERY_LIMIT},
+                              deadline=deadline)
+        for status in VALIDATOR_QUERY_STATUSES
+    ]
+    return [future.result() for future in futures]
+
+
+def _fetch_validators(params, deadline=None) -> JsonResponse:
+    with http_service.request_deadline(deadline):
+        response = http_service.get_json(VALIDATORS_ENDPOINT,
+                                         params=params,
+                                         detect_changes=True,
+                                         decode=json_service.parse_validators)
+    if response.status_code != 200 or response.json is None:
+        logger.info("ConnectionError while requesting " + VALIDATORS_ENDPOINT)
+        raise ConnectionError
+
+    return response
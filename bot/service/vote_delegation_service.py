@@ -1,14 +1,14 @@
 from typing import Optional
 
-import requests
 from terra_sdk.core.gov import MsgVote
 
 from constants.constants import BACKEND_URL
 from constants.env_variables import TELEGRAM_BOT_TOKEN
+from service import http_service
 
 
 def get_wallet_addr(telegram_user_id: str) -> Optional[str]:
-    response = requests.get(f'{BACKEND_URL}msgauth/user/{telegram_user_id}')
+    response = http_service.get(f'{BACKEND_URL}msgauth/user/{telegram_user_id}')
 
     if not response.ok:
         return None
@@ -27,7 +27,9 @@ def vote_delegated(proposal_id, vote, telegram_user_id):
     )
     headers = {'token': TELEGRAM_BOT_TOKEN}
 
-    response = requests.post(f'{BACKEND_URL}msgauth/vote/{telegram_user_id}', json=msg_vote.to_data(), headers=headers)
+    response = http_service.post(f'{BACKEND_URL}msgauth/vote/{telegram_user_id}',
+                                 json=msg_vote.to_data(),
+                                 headers=headers)
 
     if not response.ok:
         raise ConnectionError()
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+"""
+Micro-benchmark of validator list decoding against the test/validators.json fixture.
+Run from the repository root: python3 test/benchmarks/json_decoding_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from service import json_service  # noqa: E402
+
+VALIDATORS_FIXTURE_PATH = os.sep.join([current_dir, os.path.pardir, 'validators.json'])
+ITERATIONS = 200
+
+
+def measure(name, function, body):
+    seconds = timeit.timeit(lambda: function(body), number=ITERATIONS) / ITERATIONS
+
+    tracemalloc.start()
+    result = function(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"{name:<32} {seconds * 1000:>8.3f} ms "
+          f"{peak / 1024:>10.1f} KiB peak {retained / 1024:>10.1f} KiB retained")
+
+
+def main():
+    with open(VALIDATORS_FIXTURE_PATH, 'rb') as validators_file:
+        body = validators_file.read()
+
+    print(f"Fixture: {len(body) / 1024:.1f} KiB, {len(json.loads(body)['result'])} validators, "
+          f"JSON backend: {json_service.JSON_BACKEND}, ijson: {json_service.ijson is not None}\n")
+
+    measure('json.loads (stdlib)', json.loads, body)
+    measure(f'json_service.loads ({json_service.JSON_BACKEND})', json_service.loads, body)
+    measure('parse_validators', lambda data: json_service.parse_validators(data, streaming=False), body)
+    if json_service.ijson is not None:
+        measure('parse_validators streaming', lambda data: json_service.parse_validators(data, streaming=True),
+                body)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import time
+
+"""
+Benchmark of persisting the bot data and the data of the users that changed after a monitoring tick in which the
+monitoring state and a single user changed, as node_checks does after every tick, with PicklePersistence and
+SqlitePersistence.
+Run from the repository root: python3 test/benchmarks/persistence_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from telegram.ext import PicklePersistence  # noqa: E402
+
+from service.persistence_service import SqlitePersistence  # noqa: E402
+
+USER_COUNTS = (1000, 5000, 10000)
+NODES_PER_USER = 3
+TICKS = 5
+
+
+def build_user_data(user_count):
+    return {
+        100000000 + user_id: {
+            'job_started': True,
+            'expected': None,
+            'nodes': {
+                f'terravaloper1{user_id * NODES_PER_USER + i:038d}': {
+                    'status': 2, 'jailed': False, 'delegator_shares': '1234567890.123456789012345678'
+                } for i in range(NODES_PER_USER)
+            },
+        } for user_id in range(user_count)
+    }
+
+
+def persist_tick(persistence, user_data, bot_data, user_ids):
+    # What helpers.persist_job_data hands over at the end of every monitoring tick
+    persistence.update_bot_data(bot_data)
+    for user_id in user_ids:
+        persistence.update_user_data(user_id, user_data[user_id])
+
+
+def measure(name, persistence, user_data, paths):
+    bot_data = {'monitoring': {'block_height': 0, 'block_height_stuck_count': 0}}
+    persist_tick(persistence, user_data, bot_data, user_data.keys())
+
+    changed_user_id = next(iter(user_data))
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        user_data[changed_user_id]['expected'] = tick
+        bot_data['monitoring']['block_height'] = tick + 1
+        persist_tick(persistence, user_data, bot_data, [changed_user_id])
+    seconds = (time.perf_counter() - start) / TICKS
+
+    size = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+    print(f"  {name:<20} {seconds * 1000:>10.1f} ms per tick {size / 1024 / 1024:>10.2f} MiB on disk")
+
+
+def main():
+    for user_count in USER_COUNTS:
+        user_data = build_user_data(user_count)
+        print(f"{user_count} users with {NODES_PER_USER} nodes each, one user changed per tick")
+
+        with tempfile.TemporaryDirectory() as directory:
+            pickle_path = os.path.join(directory, 'session.data')
+            measure('PicklePersistence', PicklePersistence(filename=pickle_path), user_data, [pickle_path])
+
+            database_path = os.path.join(directory, 'session.db')
+            measure('SqlitePersistence', SqlitePersistence(filename=database_path), user_data,
+                    [database_path, database_path + '-wal'])
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import os
+import sys
+
+"""
+Simulation of one day of polling with the previous fixed intervals against the adaptive polling cadences.
+Reports the upstream requests and the mean detection latency of changes per data source.
+Run from the repository root: python3 test/benchmarks/polling_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from constants.constants import MONITORING_TICK_IN_SECONDS, POLLING_INTERVALS_IN_SECONDS  # noqa: E402
+from service.polling_service import PollingCadence  # noqa: E402
+
+DAY_IN_SECONDS = 24 * 60 * 60
+# Previous fixed intervals of the monitoring and the sentry job
+FIXED_INTERVALS_IN_SECONDS = {'validators': 15, 'governance': 15, 'price_feeds': 15, 'node_status': 15,
+                              'sentry_nodes': 30}
+# Seconds between changes of each source, not aligned with the polling intervals
+CHANGE_INTERVALS_IN_SECONDS = {'validators': 1793, 'governance': 6 * 3600 + 11, 'price_feeds': 4 * 3600 + 17,
+                               'node_status': 6.1, 'sentry_nodes': 6 * 3600 + 23}
+CHANGE_PHASE_IN_SECONDS = 7.3
+# Every source has an incident of ten minutes in the middle of the day: the node is stuck, a price feed is
+# unhealthy or a sentry node is syncing. Validators and governance have no incidents.
+INCIDENT = (DAY_IN_SECONDS / 2 + CHANGE_PHASE_IN_SECONDS, DAY_IN_SECONDS / 2 + CHANGE_PHASE_IN_SECONDS + 600)
+INCIDENT_SOURCES = ('price_feeds', 'node_status', 'sentry_nodes')
+
+
+def state_at(source, now):
+    """
+    Return the version of the source's data and the time the version appeared
+    """
+
+    if source in INCIDENT_SOURCES and INCIDENT[0] <= now < INCIDENT[1]:
+        return 'incident', INCIDENT[0]
+    if source in INCIDENT_SOURCES and now >= INCIDENT[1] and source != 'node_status':
+        # The end of the incident is a change as well
+        changed_at = max(INCIDENT[1], _last_change(source, now))
+        return changed_at, changed_at
+    changed_at = _last_change(source, now)
+    return changed_at, changed_at
+
+
+def _last_change(source, now):
+    interval = CHANGE_INTERVALS_IN_SECONDS[source]
+    return max(0.0, (now - CHANGE_PHASE_IN_SECONDS) // interval * interval + CHANGE_PHASE_IN_SECONDS)
+
+
+def simulate(source, adaptive):
+    now = 0.0
+    clock = lambda: now  # noqa: E731
+    fixed_interval = FIXED_INTERVALS_IN_SECONDS[source]
+    intervals = POLLING_INTERVALS_IN_SECONDS[source] if adaptive else (fixed_interval,) * 3
+    cadence = PollingCadence(source, *intervals, clock=clock)
+
+    requests = 0
+    latencies = []
+    recovery_latency = None
+    previous_version = None
+    while now < DAY_IN_SECONDS:
+        if cadence.is_due():
+            version, changed_at = state_at(source, now)
+            requests += 1
+            if previous_version is not None and version != previous_version:
+                latencies.append(now - changed_at)
+                if previous_version == 'incident':
+                    recovery_latency = now - INCIDENT[1]
+            cadence.polled(version, is_incident=version == 'incident')
+            previous_version = version
+        now += MONITORING_TICK_IN_SECONDS
+
+    return requests, sum(latencies) / len(latencies), recovery_latency
+
+
+def main():
+    print(f"One simulated day, monitoring tick every {MONITORING_TICK_IN_SECONDS}s")
+    print(f"  {'source':<14}{'requests':>20}{'mean detection latency':>26}{'incident end detected after':>30}")
+    print(f"  {'':<14}{'fixed / adaptive':>20}{'fixed / adaptive':>26}{'fixed / adaptive':>30}")
+    for source in FIXED_INTERVALS_IN_SECONDS:
+        fixed_requests, fixed_latency, fixed_recovery = simulate(source, adaptive=False)
+        adaptive_requests, adaptive_latency, adaptive_recovery = simulate(source, adaptive=True)
+        recovery = f"{fixed_recovery:.1f}s / {adaptive_recovery:.1f}s" if source in INCIDENT_SOURCES else '-'
+        print(f"  {source:<14}{f'{fixed_requests} / {adaptive_requests}':>20}"
+              f"{f'{fixed_latency:.1f}s / {adaptive_latency:.1f}s':>26}{recovery:>30}")
+
+
+if __name__ == '__main__':
+    main()
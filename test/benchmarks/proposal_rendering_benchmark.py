@@ -0,0 +1,87 @@
+import os
+import sys
+import timeit
+
+import dateutil.parser
+
+"""
+Micro-benchmark of governance proposal rendering with a realistic proposal description.
+Run from the repository root: python3 test/benchmarks/proposal_rendering_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from telegram.utils.helpers import escape_markdown  # noqa: E402
+
+from constants.constants import TERRA_STATION_URL  # noqa: E402
+from constants.env_variables import NETWORK  # noqa: E402
+from service import governance_service  # noqa: E402
+
+ITERATIONS = 2000
+CHATS = 1000
+
+PARAGRAPH = "This proposal updates the *community_tax* parameter of the `distribution` module from 0.02 to 0.05 " \
+            "and allocates the_remaining funds to [the grants program](https://example.com/grants_program). " \
+            "See https://agora.terra.money/t/proposal_discussion_thread for details.\n\n"
+
+PROPOSAL = {
+    'id': '42',
+    'proposal_status': 'VotingPeriod',
+    'content': {
+        'type': 'distribution/CommunityPoolSpendProposal',
+        'value': {'title': 'Community_pool spend for *Terra* grants', 'description': PARAGRAPH * 12},
+    },
+    'voting_start_time': '2021-03-11T15:53:49.163387563Z',
+    'voting_end_time': '2021-03-18T15:53:49.163387563Z',
+}
+
+
+def proposal_to_text_with_dateutil(proposal: dict) -> str:
+    """
+    The rendering before the render cache and the fast timestamp parser
+    """
+
+    status = proposal['proposal_status']
+
+    text = f"*Title:*\n{escape_markdown(proposal['content']['value']['title'])}\n" + \
+           f"*Type:*\n{escape_markdown(proposal['content']['type'])}\n" + \
+           f"*Description:*\n{escape_markdown(proposal['content']['value']['description'])}\n\n" + \
+           f"*Voting Start Time:" \
+           f"* {dateutil.parser.parse(proposal['voting_start_time']).strftime('%A %B %d, %H:%M')} UTC\n" + \
+           f"*Voting End Time:" \
+           f"* {dateutil.parser.parse(proposal['voting_end_time']).strftime('%A %B %d, %H:%M')} UTC\n\n"
+    if status == "Rejected" or status == "Passed":
+        text += f"Result: *{status}*\n\n"
+    else:
+        text += f"Make sure to vote on this governance proposal until" \
+                f" *{dateutil.parser.parse(proposal['voting_end_time']).strftime('%A %B %d, %H:%M')} UTC*!"
+
+    text += f"\n\nClick here to see more details: [Terra Station]({TERRA_STATION_URL}proposal/{proposal['id']})\n" \
+            f"Make sure to choose *{NETWORK}* network."
+
+    return text
+
+
+def measure(name, function):
+    seconds = timeit.timeit(function, number=ITERATIONS) / ITERATIONS
+    print(f"{name:<40} {seconds * 1e6:>10.1f} µs per call {seconds * CHATS * 1000:>10.2f} ms per {CHATS} chats")
+
+
+def main():
+    print(f"Description: {len(PROPOSAL['content']['value']['description']) / 1024:.1f} KiB\n")
+
+    measure('before: dateutil, no cache', lambda: proposal_to_text_with_dateutil(PROPOSAL))
+    measure('fast timestamp parser, no cache', lambda: governance_service._render_proposal(PROPOSAL))
+    measure('fast timestamp parser, render cache', lambda: governance_service.proposal_to_text(PROPOSAL))
+    print()
+    measure('dateutil.parser.parse', lambda: dateutil.parser.parse(PROPOSAL['voting_end_time']))
+    measure('terra_timestamp_to_datetime',
+            lambda: governance_service.terra_timestamp_to_datetime(PROPOSAL['voting_end_time']))
+
+    assert proposal_to_text_with_dateutil(PROPOSAL) == governance_service.proposal_to_text(PROPOSAL)
+
+
+if __name__ == '__main__':
+    main()
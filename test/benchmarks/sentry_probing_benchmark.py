@@ -0,0 +1,79 @@
+import logging
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+"""
+Benchmark of probing a fleet of sentry nodes one after another against the concurrent sentry prober,
+and of the alerts sent for flaky probes with and without confirming status changes.
+Probes are simulated with a fixed latency, unreachable nodes only fail after the probe timeout.
+Run from the repository root: python3 test/benchmarks/sentry_probing_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from service.sentry_service import SentryProber  # noqa: E402
+
+SENTRY_NODES = [f'10.0.{i // 256}.{i % 256}:1317' for i in range(300)]
+UNREACHABLE_NODES = set(SENTRY_NODES[::20])
+PROBE_LATENCY_IN_SECONDS = 0.02
+PROBE_TIMEOUT_IN_SECONDS = 0.5
+# Share of probes that wrongly report a syncing node
+FLAKY_PROBE_RATE = 0.01
+ROUNDS = 200
+
+
+def probe(node_ip, timeout=None):
+    if node_ip in UNREACHABLE_NODES:
+        time.sleep(PROBE_TIMEOUT_IN_SECONDS)
+        raise ConnectionError(f"{node_ip} is unreachable")
+    time.sleep(PROBE_LATENCY_IN_SECONDS)
+    return False
+
+
+def sequential_round():
+    start = time.monotonic()
+    for node_ip in SENTRY_NODES:
+        try:
+            probe(node_ip)
+        except ConnectionError:
+            pass
+    return time.monotonic() - start
+
+
+def concurrent_round():
+    prober = SentryProber(timeout=PROBE_TIMEOUT_IN_SECONDS)
+    with patch('service.sentry_service.is_syncing', probe):
+        start = time.monotonic()
+        prober.probe(SENTRY_NODES, {})
+        return time.monotonic() - start
+
+
+def flaky_alerts(confirm_after):
+    random.seed(1)
+    prober = SentryProber(confirm_after=confirm_after)
+    sentry_nodes_data = {}
+    alerts = 0
+    flaky_probe = lambda node_ip, timeout: random.random() < FLAKY_PROBE_RATE  # noqa: E731
+    with patch('service.sentry_service.is_syncing', flaky_probe):
+        for _ in range(ROUNDS):
+            alerts += len(prober.probe(SENTRY_NODES, sentry_nodes_data))
+    return alerts
+
+
+def main():
+    logging.disable(logging.INFO)
+    print(f"Probing {len(SENTRY_NODES)} sentry nodes, {len(UNREACHABLE_NODES)} of them unreachable")
+    print(f"  one after another: {sequential_round():.2f}s per round")
+    print(f"  concurrently:      {concurrent_round():.2f}s per round")
+    print(f"Alerts in {ROUNDS} rounds with {FLAKY_PROBE_RATE:.0%} flaky probes and no real status change")
+    print(f"  every change alerted:          {flaky_alerts(confirm_after=1)}")
+    print(f"  changes confirmed by 3 probes: {flaky_alerts(confirm_after=3)}")
+
+
+if __name__ == '__main__':
+    main()
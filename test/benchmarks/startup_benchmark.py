@@ -0,0 +1,73 @@
+import os
+import sys
+import threading
+import time
+
+"""
+Benchmark of the time until the first user gets an answer after a restart, when the restart notices are sent
+one at a time before polling starts against queueing them behind replies in the rate limited message queue.
+Sending is simulated with a fixed Telegram API latency.
+Run from the repository root: python3 test/benchmarks/startup_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from constants.constants import TELEGRAM_SEND_CONCURRENCY, TELEGRAM_MESSAGES_PER_SECOND, \
+    TELEGRAM_CHAT_MESSAGE_INTERVAL_IN_SECONDS  # noqa: E402
+from service.message_queue_service import MessageQueue, NOTICE_PRIORITY, REPLY_PRIORITY  # noqa: E402
+
+CHATS = 300
+SEND_LATENCY_IN_SECONDS = 0.05
+# The first user writes to the bot shortly after the restart
+FIRST_UPDATE_AFTER_IN_SECONDS = 0.5
+
+
+def send():
+    time.sleep(SEND_LATENCY_IN_SECONDS)
+
+
+def sequential_startup():
+    start = time.monotonic()
+    for _ in range(CHATS):
+        send()
+    # Polling only starts now, so the waiting update is answered afterwards
+    polling_started = time.monotonic()
+    send()
+    return polling_started - start, max(time.monotonic() - start, FIRST_UPDATE_AFTER_IN_SECONDS)
+
+
+def background_startup():
+    queue = MessageQueue(workers=TELEGRAM_SEND_CONCURRENCY, messages_per_second=TELEGRAM_MESSAGES_PER_SECOND,
+                         chat_message_interval=TELEGRAM_CHAT_MESSAGE_INTERVAL_IN_SECONDS)
+    answered = threading.Event()
+
+    start = time.monotonic()
+    polling_started = time.monotonic()
+    for chat_id in range(CHATS):
+        queue.put(chat_id, send, priority=NOTICE_PRIORITY)
+
+    time.sleep(FIRST_UPDATE_AFTER_IN_SECONDS)
+    queue.put(CHATS, lambda: (send(), answered.set()), priority=REPLY_PRIORITY)
+    answered.wait()
+    first_response = time.monotonic() - start
+
+    queue.join()
+    return polling_started - start, first_response, time.monotonic() - start
+
+
+def main():
+    print(f"{CHATS} chats, {SEND_LATENCY_IN_SECONDS * 1000:.0f} ms per message, "
+          f"first update {FIRST_UPDATE_AFTER_IN_SECONDS}s after the restart")
+
+    to_polling, first_response = sequential_startup()
+    print(f"  sequential notices    polling after {to_polling:>7.2f}s, first response after {first_response:>7.2f}s")
+
+    to_polling, first_response, all_notices = background_startup()
+    print(f"  background notices    polling after {to_polling:>7.2f}s, first response after {first_response:>7.2f}s, "
+          f"all notices sent after {all_notices:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+"""
+Benchmark of the validator address to chats index against walking all user data.
+Run from the repository root: python3 test/benchmarks/subscription_index_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from service.subscription_service import SubscriptionIndex  # noqa: E402
+
+CHATS = 10000
+VALIDATORS = 150
+ITERATIONS = 20
+
+
+def build_user_data(nodes_per_chat):
+    addresses = [f'terravaloper1{i:038d}' for i in range(VALIDATORS)]
+    random.seed(42)
+    return {
+        100000000 + chat_id: {'nodes': set(random.sample(addresses, nodes_per_chat))}
+        for chat_id in range(CHATS)
+    }, addresses
+
+
+def subscribers_by_walking(user_data, address):
+    return [chat_id for chat_id, data in user_data.items() if address in data['nodes']]
+
+
+def measure(nodes_per_chat):
+    user_data, addresses = build_user_data(nodes_per_chat)
+    address = addresses[0]
+
+    tracemalloc.start()
+    index = SubscriptionIndex()
+    index.rebuild(user_data)
+    index_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rebuild = timeit.timeit(lambda: SubscriptionIndex().rebuild(user_data), number=ITERATIONS) / ITERATIONS
+    walk = timeit.timeit(lambda: subscribers_by_walking(user_data, address), number=ITERATIONS) / ITERATIONS
+    lookup = timeit.timeit(lambda: index.subscribers(address), number=ITERATIONS) / ITERATIONS
+
+    print(f"{CHATS} chats x {nodes_per_chat} of {VALIDATORS} validators, "
+          f"{len(index.subscribers(address))} subscribers of one validator")
+    print(f"  index memory                  {index_memory / 1024 / 1024:>10.2f} MiB")
+    print(f"  rebuild on startup            {rebuild * 1000:>10.2f} ms")
+    print(f"  subscribers by walking        {walk * 1000:>10.3f} ms")
+    print(f"  subscribers from the index    {lookup * 1000:>10.3f} ms\n")
+
+
+def main():
+    for nodes_per_chat in (1, 10, VALIDATORS):
+        measure(nodes_per_chat)
+
+
+if __name__ == '__main__':
+    main()
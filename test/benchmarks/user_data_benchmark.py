@@ -0,0 +1,83 @@
+import os
+import pickle
+import random
+import sys
+import tracemalloc
+
+"""
+Benchmark of the memory and persisted size of the user data with per-user copies of the validator details
+against the compact format that only keeps the monitored addresses per user.
+Run from the repository root: python3 test/benchmarks/user_data_benchmark.py
+"""
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.sep.join([current_dir, os.path.pardir, os.path.pardir, 'bot']))
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark')
+
+from service.validator_service import Validator  # noqa: E402
+
+CHATS = 10000
+VALIDATORS = 150
+
+
+def build_validators():
+    return {
+        address: Validator(operator_address=address, status=3, jailed=False,
+                           delegator_shares=f'{random.randint(10 ** 12, 10 ** 14)}.000000000000000000')
+        for address in (f'terravaloper1{i:038d}' for i in range(VALIDATORS))
+    }
+
+
+def build_previous_user_data(validators, nodes_per_chat):
+    # Every user kept a copy of the validator details and of the global monitoring state
+    return {
+        100000000 + chat_id: {
+            'job_started': True, 'is_lcd_reachable': True, 'is_node_reachable': True, 'is_catching_up': False,
+            'block_height': 5000000, 'block_height_stuck_count': 0, 'validator_snapshot_version': 'a' * 32,
+            'nodes': {address: {'status': validators[address].status,
+                                'jailed': validators[address].jailed,
+                                'delegator_shares': validators[address].delegator_shares}
+                      for address in random.sample(list(validators), nodes_per_chat)}
+        }
+        for chat_id in range(CHATS)
+    }
+
+
+def build_compact_user_data(validators, nodes_per_chat):
+    return {
+        100000000 + chat_id: {'job_started': True, 'nodes': set(random.sample(list(validators), nodes_per_chat))}
+        for chat_id in range(CHATS)
+    }
+
+
+def measure(build, validators, nodes_per_chat):
+    random.seed(42)
+    tracemalloc.start()
+    user_data = build(validators, nodes_per_chat)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    persisted_size = sum(len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)) for data in user_data.values())
+    return memory, persisted_size
+
+
+def main():
+    random.seed(42)
+    validators = build_validators()
+    snapshot_memory = sum(sys.getsizeof(validator) for validator in validators.values())
+
+    for nodes_per_chat in (3, VALIDATORS):
+        previous_memory, previous_size = measure(build_previous_user_data, validators, nodes_per_chat)
+        compact_memory, compact_size = measure(build_compact_user_data, validators, nodes_per_chat)
+
+        print(f"{CHATS} chats x {nodes_per_chat} of {VALIDATORS} validators")
+        print(f"  memory with per-user copies     {previous_memory / 1024 / 1024:>10.2f} MiB")
+        print(f"  memory compact                  {compact_memory / 1024 / 1024:>10.2f} MiB")
+        print(f"  persisted with per-user copies  {previous_size / 1024 / 1024:>10.2f} MiB")
+        print(f"  persisted compact               {compact_size / 1024 / 1024:>10.2f} MiB\n")
+
+    print(f"shared validator snapshot         {snapshot_memory / 1024:>10.2f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+
+async def websocket(request):
+    """
+    Only executed in Debug mode with NODE_WEBSOCKET=True
+    Stand-in for the Tendermint RPC websocket that sends a NewBlock event whenever the block height in status.json
+    increases
+    """
+
+    response = web.WebSocketResponse()
+    await response.prepare(request)
+
+    subscription = await response.receive_json()
+    await response.send_json({'jsonrpc': '2.0', 'id': subscription['id'], 'result': {}})
+
+    block_height = None
+    while not response.closed:
+        # In the test cases we change the filename, but we still need to read the block height from the renamed file.
+        filename = 'status.json' if os.path.exists('status.json') else 'status_renamed.json'
+        with open(filename) as json_read_file:
+            new_block_height = json.load(json_read_file)['result']['sync_info']['latest_block_height']
+
+        if new_block_height != block_height:
+            block_height = new_block_height
+            block_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            await response.send_json({'jsonrpc': '2.0', 'id': subscription['id'], 'result': {
+                'query': "tm.event='NewBlock'",
+                'data': {'type': 'tendermint/event/NewBlock',
+                         'value': {'block': {'header': {'height': block_height, 'time': block_time}}}}}})
+        await asyncio.sleep(1)
+
+    return response
+
+
+if __name__ == '__main__':
+    print("Streaming local blocks ...")
+    app = web.Application()
+    app.add_routes([web.get('/websocket', websocket)])
+    web.run_app(app, host='127.0.0.1', port=8001, print=None)
@@ -11,6 +11,18 @@ from subprocess import Popen
 from pyrogram import Client as TelegramClient
 
 NODE_STATUSES = ["Unbonded", "Unbonding", "Bonded"]
+# Waits for notifications, derived from the polling cadences of the bot plus its 3 second monitoring tick.
+# Validators are polled at most every 30 seconds while they do not change.
+NODE_CHANGE_NOTIFICATION_WAIT_IN_SECONDS = 40
+# A removed node is only reported once it is missing from a second fetch, which follows 15 seconds after the change.
+NODE_REMOVED_NOTIFICATION_WAIT_IN_SECONDS = 55
+# Price feeds are polled at most every 60 seconds while they are healthy and every 10 seconds while they are not.
+PRICE_FEED_STALE_SECONDS = 70
+PRICE_FEED_RECOVERY_WAIT_IN_SECONDS = 35
+# The node status is polled every 15 seconds and every 12 seconds during an incident.
+NODE_STATUS_NOTIFICATION_WAIT_IN_SECONDS = 25
+# The LCD is probed every 15 seconds and reported unreachable after two failed probes.
+LCD_NOTIFICATION_WAIT_IN_SECONDS = 40
 """
 ######################################################################################################################################################
 Test Cases
@@ -26,8 +38,9 @@ class TerraNodeBot(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         # Delete previous sessions for clean testing
-        if os.path.exists("../storage/session.data"):
-            os.remove("../storage/session.data")
+        for session_file in ["session.data", "session.db", "session.db-wal", "session.db-shm"]:
+            if os.path.exists("../storage/" + session_file):
+                os.remove("../storage/" + session_file)
 
         # Authenticate Telegram Client of this testing suite
         cls.telegram = TelegramClient(open('telegram_session.string').read(),
@@ -158,12 +171,14 @@ class TerraNodeBot(unittest.TestCase):
     def test_lcd_unreachable_notification(self):
         self.assert_unreachable_notification(file_name="node_info",
                                              expected1="The public Lite Client Daemon (LCD) cannot be reached!",
-                                             expected2="The public Lite Client Daemon (LCD) is reachable again!")
+                                             expected2="The public Lite Client Daemon (LCD) is reachable again!",
+                                             wait=LCD_NOTIFICATION_WAIT_IN_SECONDS)
 
     def test_node_unreachable_notification(self):
         self.assert_unreachable_notification(file_name="status",
                                              expected1="The specified Node cannot be reached!",
-                                             expected2="The specified Node is reachable again!")
+                                             expected2="The specified Node is reachable again!",
+                                             wait=NODE_STATUS_NOTIFICATION_WAIT_IN_SECONDS)
 
     """
     --------------------------------------------------------------------------------------------------------
@@ -361,7 +376,8 @@ class TerraNodeBot(unittest.TestCase):
         with open('validators.json', 'w') as json_write_file:
             json.dump(node_data_new, json_write_file)
 
-        time.sleep(20)
+        time.sleep(NODE_REMOVED_NOTIFICATION_WAIT_IN_SECONDS if field == "address"
+                   else NODE_CHANGE_NOTIFICATION_WAIT_IN_SECONDS)
         with self.telegram:
             first_response = next(itertools.islice(self.telegram.iter_history(self.BOT_ID), 1, None))
             second_response = next(itertools.islice(self.telegram.iter_history(self.BOT_ID), 0, None))
@@ -395,9 +411,9 @@ class TerraNodeBot(unittest.TestCase):
             data['result']['sync_info']['latest_block_height'] = str(new_block_height)
             with open(file_name, 'w') as json_write_file:
                 json.dump(data, json_write_file)
-            time.sleep(15)
+            time.sleep(NODE_STATUS_NOTIFICATION_WAIT_IN_SECONDS)
         elif monitoring_type == "price_feed":
-            for x in range(40):
+            for x in range(PRICE_FEED_STALE_SECONDS):
                 block_height = data['height']
                 new_block_height = int(block_height) + 20
                 data['height'] = str(new_block_height)
@@ -414,7 +430,8 @@ class TerraNodeBot(unittest.TestCase):
         self.assertTrue(re.search("I am your Terra Node Bot. 🤖", second_response.text, re.IGNORECASE),
                         "'I am your Terra Node Bot. 🤖' - not visible after block height notification.")
 
-        time.sleep(35)
+        time.sleep(PRICE_FEED_RECOVERY_WAIT_IN_SECONDS if monitoring_type == "price_feed"
+                   else NODE_STATUS_NOTIFICATION_WAIT_IN_SECONDS)
         with self.telegram:
             first_response = next(itertools.islice(self.telegram.iter_history(self.BOT_ID), 1, None))
             second_response = next(itertools.islice(self.telegram.iter_history(self.BOT_ID), 0, None))
@@ -442,9 +459,9 @@ class TerraNodeBot(unittest.TestCase):
             re.search("I am your Terra Node Bot. 🤖", second_response.text, re.IGNORECASE),
             "'I am your Terra Node Bot. 🤖' - not visible after catching_up=" + str(catching_up) + " notification")
 
-    def assert_unreachable_notification(self, file_name, expected1, expected2):
+    def assert_unreachable_notification(self, file_name, expected1, expected2, wait):
         os.rename(file_name + ".json", file_name + "_renamed.json")
-        time.sleep(20)
+        time.sleep(wait)
 
         with self.telegram:
             first_response = next(itertools.islice(self.telegram.iter_history(self.BOT_ID), 1, None))
@@ -456,7 +473,7 @@ class TerraNodeBot(unittest.TestCase):
                         "'I am your Terra Node Bot. 🤖' - not visible after node address change notification.")
 
         os.rename(file_name + "_renamed.json", file_name + ".json")
-        time.sleep(20)
+        time.sleep(wait)
 
         with self.telegram:
             first_response = next(itertools.islice(self.telegram.iter_history(self.BOT_ID), 1, None))
@@ -481,7 +498,7 @@ class TerraNodeBot(unittest.TestCase):
 
         with open('status.json', 'w') as json_write_file:
             json.dump(node_data, json_write_file)
-        time.sleep(20)
+        time.sleep(NODE_STATUS_NOTIFICATION_WAIT_IN_SECONDS)
 
         with open('status.json') as json_read_file:
             node_data = json.load(json_read_file)
@@ -490,7 +507,7 @@ class TerraNodeBot(unittest.TestCase):
 
         with open('status.json', 'w') as json_write_file:
             json.dump(node_data, json_write_file)
-        time.sleep(20)
+        time.sleep(NODE_STATUS_NOTIFICATION_WAIT_IN_SECONDS)
 
     def click_button(self, button):
         response = next(self.telegram.iter_history(self.BOT_ID))
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from aiohttp import web
+
+from service import metrics_service
+from service.block_stream_service import BlockStream, NEW_BLOCK_SUBSCRIPTION
+
+
+def new_block(height, block_time='2021-03-11T15:53:49.163387563Z'):
+    return {'jsonrpc': '2.0', 'id': 0, 'result': {
+        'query': "tm.event='NewBlock'",
+        'data': {'type': 'tendermint/event/NewBlock',
+                 'value': {'block': {'header': {'height': str(height), 'time': block_time}}}}}}
+
+
+class WebsocketStandIn:
+    """
+    Local stand-in for the Tendermint RPC websocket that sends the given messages to every connection
+    """
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.subscriptions = []
+        self._loop = asyncio.new_event_loop()
+        self._runner = None
+        self.port = None
+
+    async def _websocket(self, request):
+        response = web.WebSocketResponse()
+        await response.prepare(request)
+
+        self.subscriptions.append(await response.receive_json())
+        await response.send_json({'jsonrpc': '2.0', 'id': 0, 'result': {}})
+        for message in self.messages:
+            await response.send_json(message)
+        # Keep the connection open until the client closes it
+        async for _ in response:
+            pass
+        return response
+
+    async def _start(self):
+        app = web.Application()
+        app.add_routes([web.get('/websocket', self._websocket)])
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def start(self):
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result(timeout=5)
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class BlockStreamTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("Condition not met in time")
+            time.sleep(0.01)
+
+    def test_new_blocks_are_streamed(self):
+        stand_in = WebsocketStandIn([new_block(41), new_block(42)])
+        stand_in.start()
+        stream = BlockStream(f'ws://127.0.0.1:{stand_in.port}/websocket',
+                             wall_clock=lambda: 1615478029.163387 + 90)
+        self.assertIsNone(stream.node_status())
+
+        stream.start()
+        try:
+            self.wait_for(lambda: stream.latest_block() is not None and stream.latest_block().height == 42)
+        finally:
+            stream.stop(timeout=5)
+            stand_in.stop()
+
+        self.assertEqual(stand_in.subscriptions, [NEW_BLOCK_SUBSCRIPTION])
+        self.assertEqual(metrics_service.get_counter('block_stream.blocks'), 2)
+
+    def test_node_status_is_derived_from_the_latest_block(self):
+        stream = BlockStream('ws://127.0.0.1:1/websocket', wall_clock=lambda: 1615478029.163387 + 90)
+
+        stream._on_message('{"jsonrpc": "2.0", "id": 0, "result": {}}')
+        self.assertIsNone(stream.node_status())
+
+        stream._on_message(json.dumps(new_block(42, '2021-03-11T15:53:49.163387563Z')))
+        node_status = stream.node_status()
+        self.assertEqual(node_status.latest_block_height, 42)
+        # The block was received 90 seconds after its block time
+        self.assertTrue(node_status.catching_up)
+
+    def test_stream_reconnects_and_falls_back_to_polling_while_disconnected(self):
+        stream = BlockStream('ws://127.0.0.1:1/websocket', initial_backoff=0.01, max_backoff=0.02)
+
+        stream.start()
+        try:
+            self.wait_for(lambda: metrics_service.get_counter('block_stream.disconnects') >= 2)
+            self.assertIsNone(stream.node_status())
+        finally:
+            stream.stop(timeout=5)
@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from service import fetch_service, http_service
+from service.fetch_service import fetch_concurrently
+
+
+class FetchServiceTest(unittest.TestCase):
+
+    def release_and_wait(self, release: threading.Event):
+        release.set()
+        deadline = time.monotonic() + 1
+        while fetch_service._running_keys and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_fetches_run_concurrently(self):
+        def slow_fetch():
+            time.sleep(0.2)
+            return True
+
+        start = time.monotonic()
+        results = fetch_concurrently({index: slow_fetch for index in range(5)})
+
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(results, {index: True for index in range(5)})
+
+    def test_concurrency_limit_is_respected(self):
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        def tracked_fetch():
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        fetch_concurrently({index: tracked_fetch for index in range(6)}, concurrency=2)
+
+        self.assertEqual(max_running[0], 2)
+
+    def test_exceptions_are_returned_per_fetcher(self):
+        def failing_fetch():
+            raise ConnectionError
+
+        results = fetch_concurrently({'ok': lambda: 42, 'failing': failing_fetch})
+
+        self.assertEqual(results['ok'], 42)
+        self.assertIsInstance(results['failing'], ConnectionError)
+
+    def test_fetchers_that_miss_their_deadline_return_timeout_error(self):
+        release = threading.Event()
+
+        start = time.monotonic()
+        results = fetch_concurrently({'slow': release.wait, 'fast': lambda: True}, deadlines={'slow': 0.1})
+        self.release_and_wait(release)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertIsInstance(results['slow'], TimeoutError)
+        self.assertTrue(results['fast'])
+
+    def test_fetcher_is_not_started_again_while_still_running(self):
+        release = threading.Event()
+        self.addCleanup(self.release_and_wait, release)
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait()
+            return True
+
+        fetch_concurrently({'still_running': slow_fetch}, deadlines={'still_running': 0.1})
+        results = fetch_concurrently({'still_running': slow_fetch}, deadlines={'still_running': 0.1})
+
+        self.assertIsInstance(results['still_running'], TimeoutError)
+        self.assertEqual(len(calls), 1)
+
+        self.release_and_wait(release)
+        self.assertTrue(fetch_concurrently({'still_running': slow_fetch})['still_running'])
+
+    def test_fetchers_with_their_own_executor_do_not_wait_for_the_others(self):
+        release = threading.Event()
+        self.addCleanup(self.release_and_wait, release)
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+
+        fetchers = {index: release.wait for index in range(3)}
+        fetchers['health_check'] = lambda: True
+        results = fetch_concurrently(fetchers, concurrency=1, deadlines={key: 0.2 for key in fetchers},
+                                     executors={'health_check': executor})
+
+        self.assertTrue(results['health_check'])
+        self.assertIsInstance(results[0], TimeoutError)
+
+    def test_requests_of_fetchers_get_timeouts_within_their_deadline(self):
+        timeouts = []
+
+        def fetch():
+            timeouts.append(http_service._timeout_within_deadline((3.05, 10)))
+
+        fetch_concurrently({'deadline': fetch}, deadlines={'deadline': 3})
+        fetch_concurrently({'no_deadline': fetch})
+
+        self.assertTrue(all(timeout <= 3 / (http_service.HTTP_RETRIES + 1) for timeout in timeouts[0]))
+        self.assertEqual(timeouts[1], (3.05, 10))
@@ -0,0 +1,211 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+import dateutil.parser
+
+import service.governance_service as governance_service
+from service.governance_service import ProposalStore, _fetch_closed_proposal, track_proposal_lifecycle, \
+    proposal_to_text, terra_timestamp_to_datetime
+from service.http_service import JsonResponse
+
+
+def proposal(proposal_id, status):
+    return {'id': proposal_id, 'proposal_status': status, 'content': {'value': {'title': f'Proposal {proposal_id}'}}}
+
+
+class ProposalStoreTest(unittest.TestCase):
+
+    @patch('service.governance_service.get_governance_proposals')
+    def test_first_sync_downloads_all_proposals(self, get_proposals_mock: Mock):
+        get_proposals_mock.return_value = [proposal('10', 'VotingPeriod'), proposal('9', 'Passed')]
+
+        store = ProposalStore()
+        store.sync()
+
+        get_proposals_mock.assert_called_once_with()
+        self.assertEqual([p['id'] for p in store.all_proposals()], ['9', '10'])
+        self.assertEqual([p['id'] for p in store.active_proposals()], ['10'])
+
+    @patch('service.governance_service._fetch_closed_proposal')
+    @patch('service.governance_service.get_governance_proposals')
+    def test_later_syncs_only_fetch_open_proposals(self, get_proposals_mock: Mock, fetch_closed_mock: Mock):
+        get_proposals_mock.return_value = [proposal('1', 'Passed'), proposal('2', 'VotingPeriod'),
+                                           proposal('3', 'DepositPeriod')]
+        store = ProposalStore()
+        store.sync()
+        first_version = store.version
+
+        open_proposals = {'DepositPeriod': [proposal('4', 'DepositPeriod')], 'VotingPeriod': []}
+        get_proposals_mock.side_effect = lambda params: open_proposals[params['status']]
+        fetch_closed_mock.side_effect = lambda proposal_id: proposal('2', 'Rejected') if proposal_id == '2' else None
+        store.sync()
+
+        self.assertCountEqual([call.args[0] for call in fetch_closed_mock.call_args_list], ['2', '3'])
+        self.assertEqual([(p['id'], p['proposal_status']) for p in store.all_proposals()],
+                         [('1', 'Passed'), ('2', 'Rejected'), ('4', 'DepositPeriod')])
+        self.assertNotEqual(store.version, first_version)
+
+    @patch('service.governance_service.get_governance_proposals')
+    def test_version_ignores_unchanged_statuses(self, get_proposals_mock: Mock):
+        get_proposals_mock.return_value = [proposal('1', 'VotingPeriod')]
+        store = ProposalStore()
+        store.sync()
+        first_version = store.version
+
+        get_proposals_mock.side_effect = lambda params: [proposal('1', 'VotingPeriod')] \
+            if params['status'] == 'VotingPeriod' else []
+        store.sync()
+
+        self.assertEqual(store.version, first_version)
+
+    @patch('service.governance_service.get_governance_proposals')
+    def test_failed_sync_keeps_previous_proposals(self, get_proposals_mock: Mock):
+        get_proposals_mock.return_value = [proposal('1', 'VotingPeriod')]
+        store = ProposalStore()
+        store.sync()
+
+        get_proposals_mock.side_effect = ConnectionError
+        with self.assertRaises(ConnectionError):
+            store.sync()
+
+        self.assertEqual(store.get(1)['id'], '1')
+
+    @patch('service.governance_service.get_governance_proposals')
+    def test_proposals_can_be_read_during_a_sync(self, get_proposals_mock: Mock):
+        get_proposals_mock.return_value = [proposal('1', 'VotingPeriod')]
+        store = ProposalStore()
+        store.sync()
+
+        fetching = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_fetch(params):
+            fetching.set()
+            release.wait()
+            return [proposal('1', 'Passed')] if params['status'] == 'VotingPeriod' else []
+
+        get_proposals_mock.side_effect = slow_fetch
+        sync = threading.Thread(target=store.sync)
+        sync.start()
+        fetching.wait()
+
+        # A menu that reads the store is not blocked by the running sync
+        self.assertEqual(store.get(1)['proposal_status'], 'VotingPeriod')
+        release.set()
+        sync.join()
+        self.assertEqual(store.get(1)['proposal_status'], 'Passed')
+
+    @patch('service.governance_service.proposal_store', new_callable=ProposalStore)
+    @patch('service.governance_service.is_lcd_available')
+    @patch('service.governance_service.get_governance_proposals')
+    def test_store_is_not_synced_for_menus_while_lcd_is_unavailable(self, get_proposals_mock: Mock, lcd_mock: Mock,
+                                                                    store: ProposalStore):
+        lcd_mock.return_value = False
+        with self.assertRaises(ConnectionError):
+            governance_service.get_synced_proposal_store()
+        get_proposals_mock.assert_not_called()
+
+        lcd_mock.return_value = True
+        get_proposals_mock.return_value = [proposal('1', 'VotingPeriod')]
+        self.assertIs(governance_service.get_synced_proposal_store(), store)
+        get_proposals_mock.assert_called_once_with()
+
+        # An outdated store is served as is while the LCD is unavailable
+        store.synced_at -= 120
+        lcd_mock.return_value = False
+        self.assertEqual(governance_service.get_synced_proposal_store(max_age=60).get(1)['id'], '1')
+        self.assertEqual(get_proposals_mock.call_count, 1)
+
+    @patch('service.governance_service.proposal_store', new_callable=ProposalStore)
+    @patch('service.governance_service.is_lcd_available', Mock(return_value=True))
+    @patch('service.governance_service.get_governance_proposals')
+    def test_outdated_store_is_synced_again(self, get_proposals_mock: Mock, store: ProposalStore):
+        get_proposals_mock.return_value = [proposal('1', 'VotingPeriod')]
+        governance_service.get_synced_proposal_store()
+
+        get_proposals_mock.side_effect = lambda params: [proposal('1', 'Passed')] \
+            if params['status'] == 'VotingPeriod' else []
+        self.assertEqual(governance_service.get_synced_proposal_store(max_age=60).active_proposals()[0]['id'], '1')
+
+        store.synced_at -= 120
+        self.assertEqual(governance_service.get_synced_proposal_store(max_age=60).active_proposals(), [])
+
+    @patch('service.http_service.get_json')
+    def test_deleted_proposal_is_dropped(self, get_json_mock: Mock):
+        get_json_mock.return_value = JsonResponse(status_code=404, ok=False, json=None)
+        self.assertIsNone(_fetch_closed_proposal('5'))
+
+        get_json_mock.return_value = JsonResponse(status_code=500, ok=False, json=None)
+        with self.assertRaises(ConnectionError):
+            _fetch_closed_proposal('5')
+
+
+class ProposalChangeTimeTest(unittest.TestCase):
+
+    def test_latest_change_that_already_happened(self):
+        proposals = [
+            {'submit_time': '2021-03-01T10:00:00Z', 'voting_end_time': '2021-03-08T10:00:00Z'},
+            {'submit_time': '2021-03-05T10:00:00Z', 'voting_start_time': '0001-01-01T00:00:00Z',
+             'voting_end_time': '9999-01-01T00:00:00Z'},
+        ]
+
+        self.assertEqual(governance_service.latest_proposal_change_time(proposals),
+                         dateutil.parser.parse('2021-03-08T10:00:00Z').timestamp())
+        self.assertIsNone(governance_service.latest_proposal_change_time([proposal('1', 'VotingPeriod')]))
+
+
+class ProposalLifecycleTest(unittest.TestCase):
+
+    def test_first_call_reports_nothing(self):
+        tracking_data = {}
+        events = track_proposal_lifecycle(tracking_data, [proposal('1', 'VotingPeriod')], 'v1')
+
+        self.assertEqual(events.new_proposals, [])
+        self.assertEqual(events.ended_proposals, [])
+        self.assertEqual(tracking_data['voting_ids'], {'1'})
+
+    def test_new_and_ended_proposals_are_reported_once(self):
+        tracking_data = {}
+        track_proposal_lifecycle(tracking_data, [proposal('1', 'VotingPeriod'), proposal('2', 'VotingPeriod')], 'v1')
+
+        # The order of the LCD response does not matter
+        proposals = [proposal('10', 'VotingPeriod'), proposal('1', 'Passed'), proposal('9', 'DepositPeriod')]
+        events = track_proposal_lifecycle(tracking_data, proposals, 'v2')
+
+        self.assertEqual([p['id'] for p in events.new_proposals], ['9', '10'])
+        # Proposal 2 got deleted on chain and therefore has no result
+        self.assertEqual([p['id'] for p in events.ended_proposals], ['1'])
+
+        events = track_proposal_lifecycle(tracking_data, proposals, 'v3')
+        self.assertEqual(events.new_proposals, [])
+        self.assertEqual(events.ended_proposals, [])
+
+    def test_unchanged_version_is_skipped(self):
+        tracking_data = {}
+        track_proposal_lifecycle(tracking_data, [], 'v1')
+
+        events = track_proposal_lifecycle(tracking_data, [proposal('1', 'VotingPeriod')], 'v1')
+        self.assertEqual(events.new_proposals, [])
+        self.assertEqual(tracking_data['known_ids'], set())
+
+
+class ProposalRenderingTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        governance_service._rendered_proposals.clear()
+
+    def test_terra_timestamp_matches_dateutil(self):
+        for timestamp in ['2021-03-11T15:53:49.163387563Z', '2021-03-11T15:53:49.1Z', '2021-03-11T15:53:49Z',
+                          '0001-01-01T00:00:00Z', '2021-03-11T15:53:49+02:00']:
+            self.assertEqual(terra_timestamp_to_datetime(timestamp), dateutil.parser.parse(timestamp))
+
+    @patch('service.governance_service._render_proposal')
+    def test_proposal_is_rendered_once_per_status(self, render_mock: Mock):
+        proposal_to_text(proposal('1', 'VotingPeriod'))
+        proposal_to_text(proposal('1', 'VotingPeriod'))
+        self.assertEqual(render_mock.call_count, 1)
+
+        proposal_to_text(proposal('1', 'Passed'))
+        self.assertEqual(render_mock.call_count, 2)
@@ -0,0 +1,130 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from requests.exceptions import ReadTimeout
+
+from service import http_service, metrics_service
+from service.http_service import endpoint_label
+
+
+class HttpServiceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+
+    def test_endpoint_label_groups_resource_ids(self):
+        self.assertEqual(endpoint_label('https://lcd.terra.dev/staking/validators'),
+                         'lcd.terra.dev/staking/validators')
+        self.assertEqual(endpoint_label('https://lcd.terra.dev/oracle/voters/terravaloper1abc/prevotes'),
+                         'lcd.terra.dev/oracle/voters/{}/prevotes')
+        self.assertEqual(endpoint_label('https://lcd.terra.dev/gov/proposals/42'), 'lcd.terra.dev/gov/proposals/{}')
+
+    def test_sessions_are_pooled_per_host(self):
+        first = http_service._get_session('https://lcd.terra.dev/node_info')
+        second = http_service._get_session('https://lcd.terra.dev/staking/validators')
+        other = http_service._get_session('http://localhost:26657/status')
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    @patch('service.http_service._get_session')
+    def test_timeout_is_applied_and_latency_recorded(self, session_mock: Mock):
+        http_service.get('https://lcd.terra.dev/node_info')
+
+        _, kwargs = session_mock.return_value.request.call_args
+        self.assertIn('timeout', kwargs)
+        self.assertEqual(metrics_service.get_timing('http.lcd.terra.dev/node_info')['count'], 1)
+
+    @patch('service.http_service._get_session')
+    def test_timeouts_end_by_the_deadline(self, session_mock: Mock):
+        with http_service.request_deadline(time.monotonic() + 3):
+            http_service.get('https://lcd.terra.dev/node_info')
+        connect_timeout, read_timeout = session_mock.return_value.request.call_args.kwargs['timeout']
+        self.assertLessEqual(read_timeout * (http_service.HTTP_RETRIES + 1), 3)
+
+        with http_service.request_deadline(time.monotonic() - 1):
+            with self.assertRaises(ConnectionError):
+                http_service.get('https://lcd.terra.dev/node_info')
+        self.assertEqual(session_mock.return_value.request.call_count, 1)
+
+    @patch('service.http_service._get_session')
+    def test_request_errors_raise_connection_error(self, session_mock: Mock):
+        session_mock.return_value.request.side_effect = ReadTimeout()
+
+        with self.assertRaises(ConnectionError):
+            http_service.get('https://lcd.terra.dev/node_info')
+        self.assertEqual(metrics_service.get_counter('http.lcd.terra.dev/node_info.errors'), 1)
+
+    @patch('service.http_service.get')
+    def test_concurrent_identical_gets_are_coalesced(self, get_mock: Mock):
+        def slow_get(url, params=None):
+            time.sleep(0.2)
+            return Mock(status_code=200, ok=True, content=f'{{"result": "{url}"}}'.encode())
+
+        get_mock.side_effect = slow_get
+        responses = []
+        threads = [threading.Thread(target=lambda: responses.append(http_service.get_json('http://lcd/node_info')))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        get_mock.assert_called_once()
+        self.assertTrue(all(response is responses[0] for response in responses))
+        self.assertEqual(responses[0].json, {'result': 'http://lcd/node_info'})
+        self.assertEqual(metrics_service.get_counter('http.coalesced.misses'), 1)
+        self.assertEqual(metrics_service.get_counter('http.coalesced.hits'), 4)
+
+    @patch('service.http_service.get')
+    def test_sequential_gets_are_not_cached(self, get_mock: Mock):
+        get_mock.return_value = Mock(status_code=200, ok=True, content=b'{}')
+
+        http_service.get_json('http://lcd/node_info')
+        http_service.get_json('http://lcd/node_info')
+
+        self.assertEqual(get_mock.call_count, 2)
+
+    @patch('service.http_service.get')
+    def test_unchanged_body_is_not_parsed_again(self, get_mock: Mock):
+        get_mock.return_value = Mock(status_code=200, ok=True, content=b'{"result": []}', headers={})
+        decode_mock = Mock(return_value={'result': []})
+
+        first = http_service.get_json('http://lcd/tracked', detect_changes=True, decode=decode_mock)
+        second = http_service.get_json('http://lcd/tracked', detect_changes=True, decode=decode_mock)
+
+        self.assertTrue(first.changed)
+        self.assertFalse(second.changed)
+        self.assertIs(second.json, first.json)
+        decode_mock.assert_called_once()
+        self.assertEqual(metrics_service.get_counter('http.skipped_unchanged'), 1)
+
+    @patch('service.http_service.get')
+    def test_body_that_only_differs_in_height_is_unchanged(self, get_mock: Mock):
+        get_mock.return_value = Mock(status_code=200, ok=True, content=b'{"height": "10", "result": [1]}', headers={})
+        first = http_service.get_json('http://lcd/height', detect_changes=True)
+
+        get_mock.return_value = Mock(status_code=200, ok=True, content=b'{"height": "11", "result": [1]}', headers={})
+        second = http_service.get_json('http://lcd/height', detect_changes=True)
+
+        get_mock.return_value = Mock(status_code=200, ok=True, content=b'{"height": "12", "result": [2]}', headers={})
+        third = http_service.get_json('http://lcd/height', detect_changes=True)
+
+        self.assertFalse(second.changed)
+        self.assertEqual(second.json, {'height': '11', 'result': [1]})
+        self.assertEqual(first.json['height'], '10')
+        self.assertTrue(third.changed)
+
+    @patch('service.http_service.get')
+    def test_conditional_request_headers_are_sent(self, get_mock: Mock):
+        get_mock.return_value = Mock(status_code=200, ok=True, content=b'{}', headers={'ETag': '"v1"'})
+        http_service.get_json('http://lcd/etag', detect_changes=True)
+
+        get_mock.return_value = Mock(status_code=304, ok=False, content=b'', headers={})
+        response = http_service.get_json('http://lcd/etag', detect_changes=True)
+
+        self.assertEqual(get_mock.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertFalse(response.changed)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,370 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from jobs.events import ValidatorChanged, ValidatorRemoved, LcdReachabilityChanged, BlockHeightStuckChanged, \
+    ProposalEnded, PriceFeedHealthChanged
+from jobs.jobs import node_checks, MonitoringState, gather_monitoring_state, detect_events, notify_subscribers, \
+    check_node_block_height, check_new_blocks, check_price_feeder, count_skipped_job_run
+from service.block_stream_service import Block
+from service import fetch_service, metrics_service
+from service.node_status_service import NodeStatus
+from service.oracle_service import OracleMonitor
+from service.polling_service import create_polling_cadences
+from service.subscription_service import SubscriptionIndex
+from service.validator_service import ValidatorSnapshot, Validator
+
+
+def wait_for_running_fetchers():
+    deadline = time.monotonic() + 1
+    while fetch_service._running_keys and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def validator(address, status=2, jailed=False, delegator_shares='100.0'):
+    return {'operator_address': address, 'status': status, 'jailed': jailed, 'delegator_shares': delegator_shares}
+
+
+class JobsTest(unittest.TestCase):
+    context_mock = Mock()
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+        patcher = patch('jobs.jobs.polling_cadences', create_polling_cadences())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.context_mock.dispatcher.bot_data = {}
+        self.context_mock.dispatcher.user_data = {
+            1: {'job_started': True, 'nodes': set()},
+            2: {'job_started': True, 'nodes': set()},
+            3: {},
+        }
+
+    @patch('jobs.jobs.notify_subscribers')
+    @patch('jobs.jobs.detect_events')
+    @patch('jobs.jobs.gather_monitoring_state')
+    def test_global_state_is_gathered_and_diffed_once_per_tick(self, gather_mock: Mock, detect_mock: Mock,
+                                                               notify_mock: Mock):
+        detect_mock.return_value = []
+
+        node_checks(self.context_mock)
+
+        gather_mock.assert_called_once()
+        detect_mock.assert_called_once()
+        self.assertEqual([chat_id for chat_id, _ in notify_mock.call_args.args[1]], [1, 2])
+        self.assertEqual(metrics_service.get_timing('monitoring.tick')['count'], 1)
+        # The monitoring state is persisted after every tick, without pickling all users
+        persistence = self.context_mock.dispatcher.persistence
+        persistence.update_bot_data.assert_called_with(self.context_mock.dispatcher.bot_data)
+        persistence.update_user_data.assert_not_called()
+        self.context_mock.dispatcher.update_persistence.assert_not_called()
+
+    @patch('jobs.jobs.notify_subscribers')
+    @patch('jobs.jobs.detect_events')
+    @patch('jobs.jobs.gather_monitoring_state')
+    def test_only_changed_users_are_persisted(self, gather_mock: Mock, detect_mock: Mock, notify_mock: Mock):
+        detect_mock.return_value = []
+        notify_mock.return_value = {2}
+        persistence = Mock()
+
+        with patch.object(self.context_mock.dispatcher, 'persistence', persistence):
+            node_checks(self.context_mock)
+
+        persistence.update_user_data.assert_called_once_with(2, self.context_mock.dispatcher.user_data[2])
+
+    @patch('jobs.jobs.MONITORING_TICK_BUDGET_IN_SECONDS', -1)
+    @patch('jobs.jobs.notify_subscribers')
+    @patch('jobs.jobs.detect_events')
+    @patch('jobs.jobs.gather_monitoring_state')
+    def test_overrun_is_counted(self, gather_mock: Mock, detect_mock: Mock, _):
+        detect_mock.return_value = []
+
+        node_checks(self.context_mock)
+
+        self.assertEqual(metrics_service.get_counter('monitoring.tick_overrun'), 1)
+
+    @patch('jobs.jobs.MONITORING_TICK_IN_SECONDS', -1)
+    @patch('jobs.jobs.notify_subscribers')
+    @patch('jobs.jobs.detect_events')
+    @patch('jobs.jobs.gather_monitoring_state')
+    def test_tick_longer_than_the_interval_within_its_budget_is_no_overrun(self, gather_mock: Mock,
+                                                                           detect_mock: Mock, _):
+        detect_mock.return_value = []
+
+        node_checks(self.context_mock)
+
+        self.assertEqual(metrics_service.get_counter('monitoring.tick_overrun'), 0)
+
+    @patch('jobs.jobs.NODE_IP', None)
+    @patch('jobs.jobs.oracle_monitor', OracleMonitor(bulk=False))
+    @patch('service.oracle_service.get_voter_prevotes')
+    @patch('jobs.jobs.sync_governance_proposals')
+    @patch('jobs.jobs.get_validator_snapshot')
+    @patch('jobs.jobs.probe_lcd')
+    @patch('jobs.jobs.is_lcd_available')
+    def test_gather_fetches_price_feeds_once_per_address(self, lcd_mock: Mock, _, snapshot_mock: Mock,
+                                                         proposals_mock: Mock, prevotes_mock: Mock):
+        lcd_mock.return_value = True
+        proposals_mock.side_effect = ConnectionError
+        prevotes_mock.side_effect = lambda address: {'height': '100', 'result': [
+            {'voter': address, 'denom': 'uusd', 'submit_block': '100' if address == 'terravaloper1a' else '50'}]}
+
+        state = gather_monitoring_state({'terravaloper1a', 'terravaloper1b'})
+
+        self.assertIs(state.validator_snapshot, snapshot_mock.return_value)
+        self.assertIsNone(state.governance_proposals)
+        self.assertEqual(state.price_feed_health, {'terravaloper1a': True, 'terravaloper1b': False})
+        self.assertEqual(prevotes_mock.call_count, 2)
+        self.assertEqual(metrics_service.get_counter('polling.price_feeds.requests'), 2)
+
+    @patch('jobs.jobs.NODE_IP', None)
+    @patch('jobs.jobs.sync_governance_proposals')
+    @patch('jobs.jobs.get_validator_snapshot')
+    @patch('jobs.jobs.should_probe_lcd')
+    @patch('jobs.jobs.probe_lcd')
+    @patch('jobs.jobs.is_lcd_available')
+    def test_gather_skips_lcd_requests_while_circuit_is_open(self, lcd_mock: Mock, probe_mock: Mock,
+                                                             should_probe_mock: Mock, snapshot_mock: Mock,
+                                                             proposals_mock: Mock):
+        lcd_mock.return_value = False
+        should_probe_mock.return_value = False
+
+        state = gather_monitoring_state(set())
+
+        self.assertFalse(state.is_lcd_reachable)
+        self.assertIsNone(state.validator_snapshot)
+        probe_mock.assert_not_called()
+        snapshot_mock.assert_not_called()
+        proposals_mock.assert_not_called()
+
+    @patch('jobs.jobs.NODE_IP', None)
+    def test_validator_changes_are_detected_once(self):
+        bot_data = {}
+        state = MonitoringState()
+        state.is_lcd_reachable = True
+        state.validator_snapshot = ValidatorSnapshot([validator('terravaloper1a'), validator('terravaloper1b')], 'v1')
+        monitored_addresses = {'terravaloper1a', 'terravaloper1b', 'terravaloper1c'}
+
+        self.assertEqual(detect_events(bot_data, state, monitored_addresses), [])
+        self.assertEqual(detect_events(bot_data, state, monitored_addresses), [])
+
+        # Only a later fetch confirms that the validator is gone
+        state.validator_snapshot.fetched_at += 1
+        events = detect_events(bot_data, state, monitored_addresses)
+        self.assertEqual(events, [ValidatorRemoved('terravaloper1c')])
+
+        monitored_addresses.remove('terravaloper1c')
+        state.validator_snapshot = ValidatorSnapshot([validator('terravaloper1a', jailed=True),
+                                                      validator('terravaloper1b')], 'v2')
+        events = detect_events(bot_data, state, monitored_addresses)
+        self.assertEqual([(type(event), event.address) for event in events], [(ValidatorChanged, 'terravaloper1a')])
+
+        self.assertEqual(detect_events(bot_data, state, monitored_addresses), [])
+
+    @patch('jobs.jobs.NODE_IP', None)
+    def test_validator_missing_from_a_single_fetch_is_not_removed(self):
+        bot_data = {}
+        state = MonitoringState()
+        state.is_lcd_reachable = True
+        monitored_addresses = {'terravaloper1a', 'terravaloper1b'}
+
+        # terravaloper1b changed its status between the queries of the statuses
+        state.validator_snapshot = ValidatorSnapshot([validator('terravaloper1a')], 'v1')
+        self.assertEqual(detect_events(bot_data, state, monitored_addresses), [])
+
+        state.validator_snapshot = ValidatorSnapshot([validator('terravaloper1a'), validator('terravaloper1b')], 'v2')
+        self.assertEqual(detect_events(bot_data, state, monitored_addresses), [])
+
+        state.validator_snapshot = ValidatorSnapshot([validator('terravaloper1a')], 'v3')
+        self.assertEqual(detect_events(bot_data, state, monitored_addresses), [])
+
+    @patch('jobs.jobs.NODE_IP', None)
+    def test_lcd_and_price_feed_transitions(self):
+        bot_data = {}
+        state = MonitoringState()
+        state.is_lcd_reachable = True
+        state.price_feed_health = {'terravaloper1a': False}
+
+        self.assertEqual(detect_events(bot_data, state, set()), [PriceFeedHealthChanged('terravaloper1a', False)])
+
+        state.is_lcd_reachable = False
+        self.assertEqual(detect_events(bot_data, state, set()), [LcdReachabilityChanged(is_reachable=False)])
+        self.assertEqual(detect_events(bot_data, state, set()), [])
+
+    def test_price_feed_health_is_kept_per_validator(self):
+        monitoring_data = {}
+        monitored_addresses = {'terravaloper1a', 'terravaloper1b'}
+
+        self.assertEqual(check_price_feeder(monitoring_data, {'terravaloper1a': False, 'terravaloper1b': True},
+                                            monitored_addresses), [PriceFeedHealthChanged('terravaloper1a', False)])
+        self.assertEqual(check_price_feeder(monitoring_data, {'terravaloper1a': False, 'terravaloper1b': False},
+                                            monitored_addresses), [PriceFeedHealthChanged('terravaloper1b', False)])
+
+        # Validators nobody monitors anymore are forgotten
+        check_price_feeder(monitoring_data, {}, {'terravaloper1b'})
+        self.assertEqual(monitoring_data['price_feed_health'], {'terravaloper1b': False})
+
+    def test_block_height_stuck_and_increasing(self):
+        monitoring_data = {}
+
+        self.assertEqual(check_node_block_height(monitoring_data, NodeStatus(False, 1000, '', 0.0)), [])
+        self.assertEqual(check_node_block_height(monitoring_data, NodeStatus(False, 1000, '', 0.0)),
+                         [BlockHeightStuckChanged(is_stuck=True, block_height=1000)])
+        self.assertEqual(check_node_block_height(monitoring_data, NodeStatus(False, 1000, '', 0.0)), [])
+        self.assertEqual(check_node_block_height(monitoring_data, NodeStatus(False, 1001, '', 0.0)),
+                         [BlockHeightStuckChanged(is_stuck=False, block_height=1001)])
+
+    @patch('jobs.jobs.NODE_IP', '127.0.0.1')
+    @patch('jobs.jobs.block_stream')
+    @patch('jobs.jobs.get_node_status')
+    @patch('jobs.jobs.sync_governance_proposals')
+    @patch('jobs.jobs.get_validator_snapshot')
+    @patch('jobs.jobs.should_probe_lcd')
+    @patch('jobs.jobs.is_lcd_available')
+    def test_only_due_sources_are_polled(self, lcd_mock: Mock, should_probe_mock: Mock, snapshot_mock: Mock,
+                                         proposals_mock: Mock, node_status_mock: Mock, block_stream_mock: Mock):
+        lcd_mock.return_value = True
+        should_probe_mock.return_value = False
+        block_stream_mock.node_status.return_value = None
+        proposals_mock.return_value = ([], 'v1')
+        node_status_mock.return_value = NodeStatus(False, 1000, '', 0.0)
+
+        state = gather_monitoring_state(set())
+        self.assertTrue(state.is_node_status_checked)
+        self.assertEqual(metrics_service.get_counter('polling.validators.requests'), 1)
+
+        # Right after polling, no source is due again
+        state = gather_monitoring_state(set())
+        self.assertIsNone(state.validator_snapshot)
+        self.assertIsNone(state.governance_proposals)
+        self.assertFalse(state.is_node_status_checked)
+        self.assertEqual(snapshot_mock.call_count, 1)
+        self.assertEqual(proposals_mock.call_count, 1)
+        self.assertEqual(node_status_mock.call_count, 1)
+        # A node status that was not polled does not mean that the node is unreachable
+        self.assertEqual(detect_events({}, state, set()), [])
+
+    @patch('jobs.jobs.NODE_IP', '127.0.0.1')
+    @patch('jobs.jobs.block_stream')
+    @patch('jobs.jobs.get_node_status')
+    @patch('jobs.jobs.should_probe_lcd')
+    @patch('jobs.jobs.is_lcd_available')
+    def test_streamed_node_status_replaces_polling(self, lcd_mock: Mock, should_probe_mock: Mock,
+                                                   node_status_mock: Mock, block_stream_mock: Mock):
+        lcd_mock.return_value = False
+        should_probe_mock.return_value = False
+        streamed_node_status = NodeStatus(False, 1000, '', 0.0)
+        block_stream_mock.node_status.return_value = streamed_node_status
+
+        state = gather_monitoring_state(set())
+        self.assertIs(state.node_status, streamed_node_status)
+        self.assertTrue(state.is_node_status_streamed)
+        node_status_mock.assert_not_called()
+
+        # Without streamed blocks the node status is polled again
+        block_stream_mock.node_status.return_value = None
+        state = gather_monitoring_state(set())
+        self.assertIs(state.node_status, node_status_mock.return_value)
+        self.assertFalse(state.is_node_status_streamed)
+
+    @patch('jobs.jobs.NODE_IP', '127.0.0.1')
+    @patch('jobs.jobs.MONITORING_CHECK_DEADLINES_IN_SECONDS',
+           {'lcd_probe': 1, 'validators': 0.1, 'governance': 1, 'price_feeds': 1, 'node_status': 0.1})
+    @patch('jobs.jobs.block_stream')
+    @patch('jobs.jobs.get_node_status')
+    @patch('jobs.jobs.sync_governance_proposals')
+    @patch('jobs.jobs.get_validator_snapshot')
+    @patch('jobs.jobs.should_probe_lcd')
+    @patch('jobs.jobs.is_lcd_available')
+    def test_checks_that_miss_their_deadline_are_unknown(self, lcd_mock: Mock, should_probe_mock: Mock,
+                                                         snapshot_mock: Mock, proposals_mock: Mock,
+                                                         node_status_mock: Mock, block_stream_mock: Mock):
+        release = threading.Event()
+        self.addCleanup(wait_for_running_fetchers)
+        self.addCleanup(release.set)
+        lcd_mock.return_value = True
+        should_probe_mock.return_value = False
+        block_stream_mock.node_status.return_value = None
+        snapshot_mock.side_effect = lambda max_age: release.wait()
+        node_status_mock.side_effect = lambda max_age: release.wait()
+        proposals_mock.return_value = ([], 'v1')
+
+        start = time.monotonic()
+        state = gather_monitoring_state(set())
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(state.unknown_checks, {'validators', 'node_status'})
+        self.assertIsNone(state.validator_snapshot)
+        self.assertEqual(state.governance_proposals, [])
+        self.assertEqual(metrics_service.get_counter('monitoring.unknown.node_status'), 1)
+        # A slow node is not reported as unreachable
+        self.assertFalse(state.is_node_status_checked)
+        self.assertEqual(detect_events({}, state, set()), [])
+
+    def test_skipped_job_runs_are_counted(self):
+        scheduler = Mock()
+        scheduler.get_job.return_value.name = 'node_checks'
+
+        count_skipped_job_run(scheduler, Mock(job_id='a1b2'))
+
+        scheduler.get_job.assert_called_with('a1b2')
+        self.assertEqual(metrics_service.get_counter('jobs.node_checks.skipped'), 1)
+
+    def test_no_new_block_alert_from_block_stream(self):
+        monitoring_data = {}
+        block = Block(height=1000, time='', received_at=100.0, lag=1.0)
+
+        self.assertEqual(check_new_blocks(monitoring_data, block, now=110.0), [])
+        self.assertEqual(check_new_blocks(monitoring_data, block, now=125.0),
+                         [BlockHeightStuckChanged(is_stuck=True, block_height=1000, seconds_without_block=25)])
+        self.assertEqual(check_new_blocks(monitoring_data, block, now=126.0), [])
+
+        block = Block(height=1001, time='', received_at=130.0, lag=1.0)
+        self.assertEqual(check_new_blocks(monitoring_data, block, now=130.5),
+                         [BlockHeightStuckChanged(is_stuck=False, block_height=1001)])
+
+    @patch('jobs.jobs.send_slack_message')
+    @patch('jobs.jobs.try_message')
+    @patch('jobs.jobs.try_message_with_home_menu')
+    def test_events_are_rendered_once_and_sent_to_subscribers(self, try_message_with_menu_mock: Mock,
+                                                              try_message_mock: Mock, slack_mock: Mock):
+        self.context_mock.dispatcher.user_data = {
+            1: {'job_started': True, 'nodes': {'terravaloper1a'}},
+            2: {'job_started': True, 'nodes': {'terravaloper1a', 'terravaloper1b'}},
+            3: {'job_started': True, 'nodes': set()},
+        }
+        users = list(self.context_mock.dispatcher.user_data.items())
+        subscription_index = SubscriptionIndex()
+        subscription_index.rebuild(self.context_mock.dispatcher.user_data)
+
+        changed = ValidatorChanged('terravaloper1a', Validator(**validator('terravaloper1a')),
+                                   Validator(**validator('terravaloper1a', jailed=True)))
+        ended = ProposalEnded({'id': '1'})
+
+        with patch('jobs.jobs.subscription_index', subscription_index), \
+                patch.object(ValidatorChanged, 'to_text', return_value='changed') as changed_text_mock, \
+                patch.object(ProposalEnded, 'to_text', return_value='ended'), \
+                patch.object(ValidatorRemoved, 'to_text', return_value='removed'):
+            events = [changed, ended, ValidatorRemoved('terravaloper1b'), ValidatorRemoved('terravaloper1c')]
+            changed_chat_ids = notify_subscribers(self.context_mock, users, events)
+
+        changed_text_mock.assert_called_once()
+        self.assertEqual(sorted(call.kwargs['chat_id'] for call in try_message_with_menu_mock.call_args_list),
+                         [1, 2, 2])
+        self.assertEqual([call.kwargs['chat_id'] for call in try_message_mock.call_args_list], [1, 2, 3])
+        self.assertEqual([call.args[0] for call in slack_mock.call_args_list], ['changed', 'removed'])
+        self.assertEqual([call.kwargs['key'] for call in slack_mock.call_args_list],
+                         [('ValidatorChanged', 'terravaloper1a'), ('ValidatorRemoved', 'terravaloper1b')])
+        self.assertEqual(users[1][1]['nodes'], {'terravaloper1a'})
+        self.assertEqual(subscription_index.addresses(), {'terravaloper1a'})
+        self.assertEqual(changed_chat_ids, {2})
+
+    def test_validator_changed_text(self):
+        event = ValidatorChanged('terravaloper1a', Validator(**validator('terravaloper1a')),
+                                 Validator(**validator('terravaloper1a', jailed=True, delegator_shares='90.0')))
+
+        self.assertEqual(event.to_text(), 'Node: *terravaloper1a*\n'
+                                          'Status: *Bonded*\n'
+                                          'Jailed: *False* ➡️ *True*\n'
+                                          'Delegator Shares: *100* ➡️ *90* (*Δ* -10)')
@@ -0,0 +1,39 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from service import json_service
+from service.json_service import parse_validators, loads, VALIDATOR_FIELDS
+
+VALIDATORS_FIXTURE_PATH = os.sep.join([os.path.dirname(os.path.realpath(__file__)), os.path.pardir,
+                                       'validators.json'])
+
+
+class JsonServiceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(VALIDATORS_FIXTURE_PATH, 'rb') as validators_file:
+            self.validators_body = validators_file.read()
+        self.validators = json.loads(self.validators_body)['result']
+
+    def test_loads_matches_standard_library(self):
+        self.assertEqual(loads(self.validators_body), json.loads(self.validators_body))
+
+    def test_loads_raises_value_error_for_invalid_json(self):
+        with self.assertRaises(ValueError):
+            loads(b'{"result": [')
+
+    def test_parse_validators_keeps_only_used_fields(self):
+        expected = [{field: validator[field] for field in VALIDATOR_FIELDS} for validator in self.validators]
+
+        self.assertEqual(parse_validators(self.validators_body, streaming=False), expected)
+
+    @unittest.skipIf(json_service.ijson is None, 'ijson is not installed')
+    def test_streaming_parse_matches_full_parse(self):
+        self.assertEqual(parse_validators(self.validators_body, streaming=True),
+                         parse_validators(self.validators_body, streaming=False))
+
+    @patch('service.json_service.ijson', None)
+    def test_streaming_falls_back_without_ijson(self):
+        self.assertEqual(len(parse_validators(self.validators_body, streaming=True)), len(self.validators))
@@ -0,0 +1,66 @@
+import unittest
+
+from service.lcd_health_service import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 0
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, initial_backoff=10, max_backoff=30,
+                                              probe_interval=15, clock=lambda: self.now)
+
+    def test_opens_after_consecutive_failures(self):
+        self.circuit_breaker.record_failure()
+        self.assertEqual(self.circuit_breaker.state, CLOSED)
+
+        self.circuit_breaker.record_failure()
+        self.assertEqual(self.circuit_breaker.state, OPEN)
+        self.assertFalse(self.circuit_breaker.allow_request())
+
+    def test_success_resets_failures(self):
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_success()
+        self.circuit_breaker.record_failure()
+
+        self.assertEqual(self.circuit_breaker.state, CLOSED)
+
+    def test_half_open_probe_after_backoff(self):
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+
+        self.now = 10
+        self.assertTrue(self.circuit_breaker.allow_request())
+        self.assertEqual(self.circuit_breaker.state, HALF_OPEN)
+        # Only a single probe is let through while half open
+        self.assertFalse(self.circuit_breaker.allow_request())
+
+        self.circuit_breaker.record_success()
+        self.assertEqual(self.circuit_breaker.state, CLOSED)
+
+    def test_backoff_grows_with_failed_probes(self):
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+
+        for expected_backoff in [20, 30, 30]:
+            self.now += self.circuit_breaker.backoff
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.circuit_breaker.record_failure()
+            self.assertEqual(self.circuit_breaker.backoff, expected_backoff)
+            self.assertFalse(self.circuit_breaker.allow_request())
+
+    def test_closed_circuit_is_probed_at_probe_interval(self):
+        self.assertTrue(self.circuit_breaker.is_probe_due())
+        self.now = 14
+        self.assertFalse(self.circuit_breaker.is_probe_due())
+        self.now = 15
+        self.assertTrue(self.circuit_breaker.is_probe_due())
+
+        # Once open, the backoff decides when to probe
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        self.now = 24
+        self.assertFalse(self.circuit_breaker.is_probe_due())
+        self.now = 25
+        self.assertTrue(self.circuit_breaker.is_probe_due())
+        self.assertEqual(self.circuit_breaker.state, HALF_OPEN)
@@ -0,0 +1,86 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from telegram.error import RetryAfter
+
+from service import metrics_service
+from service.message_queue_service import MessageQueue, ALERT_PRIORITY, REPLY_PRIORITY, NOTICE_PRIORITY
+
+
+class MessageQueueTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+        self.sent = []
+
+    def recorder(self, name):
+        return lambda: self.sent.append((name, time.monotonic()))
+
+    def test_alerts_are_sent_before_replies_and_replies_before_notices(self):
+        queue = MessageQueue(workers=1, messages_per_second=1000, chat_message_interval=0)
+        blocker = threading.Event()
+
+        # Keep the single worker busy until all messages are queued
+        queue.put(0, blocker.wait)
+        queue.put(3, self.recorder('notice'), priority=NOTICE_PRIORITY)
+        queue.put(1, self.recorder('reply'), priority=REPLY_PRIORITY)
+        queue.put(2, self.recorder('alert'), priority=ALERT_PRIORITY)
+        blocker.set()
+
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual([name for name, _ in self.sent], ['alert', 'reply', 'notice'])
+
+    def test_messages_of_one_chat_are_sent_in_order_and_spaced(self):
+        queue = MessageQueue(workers=4, messages_per_second=1000, chat_message_interval=0.05)
+
+        for i in range(3):
+            queue.put(1, self.recorder(i))
+
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual([name for name, _ in self.sent], [0, 1, 2])
+        self.assertGreaterEqual(self.sent[2][1] - self.sent[0][1], 0.09)
+
+    def test_different_chats_are_sent_concurrently(self):
+        queue = MessageQueue(workers=2, messages_per_second=1000, chat_message_interval=0)
+        barrier = threading.Barrier(2, timeout=5)
+
+        queue.put(1, barrier.wait)
+        queue.put(2, barrier.wait)
+
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual(metrics_service.get_counter('telegram.sent'), 2)
+
+    def test_retry_after_sends_message_again(self):
+        queue = MessageQueue(workers=1, messages_per_second=1000, chat_message_interval=0)
+        send_mock = Mock(side_effect=[RetryAfter(0.01), None])
+
+        queue.put(1, send_mock)
+
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual(send_mock.call_count, 2)
+        self.assertEqual(metrics_service.get_counter('telegram.retry_after'), 1)
+
+    def test_failed_message_does_not_block_chat(self):
+        queue = MessageQueue(workers=1, messages_per_second=1000, chat_message_interval=0)
+
+        queue.put(1, Mock(side_effect=Exception('boom')))
+        queue.put(1, self.recorder('second'))
+
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual([name for name, _ in self.sent], ['second'])
+        self.assertEqual(metrics_service.get_counter('telegram.errors'), 1)
+
+    def test_queue_depth_and_latency_are_exposed(self):
+        queue = MessageQueue(workers=1, messages_per_second=1000, chat_message_interval=0)
+        blocker = threading.Event()
+
+        queue.put(1, blocker.wait)
+        queue.put(2, self.recorder('second'))
+        self.assertEqual(metrics_service.get_gauge('telegram.queue_depth'), 2)
+        blocker.set()
+
+        self.assertTrue(queue.join(timeout=5))
+        self.assertEqual(metrics_service.get_gauge('telegram.queue_depth'), 0)
+        self.assertEqual(metrics_service.get_timing('telegram.send_latency')['count'], 2)
@@ -0,0 +1,40 @@
+import json
+import os
+import unittest
+from unittest.mock import Mock, patch
+
+import service.node_status_service as node_status_service
+from service.http_service import JsonResponse
+from service.node_status_service import get_node_status, parse_node_status
+
+STATUS_FIXTURE_PATH = os.sep.join([os.path.dirname(os.path.realpath(__file__)), os.path.pardir, 'status.json'])
+
+
+class NodeStatusServiceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        node_status_service._node_status = None
+        with open(STATUS_FIXTURE_PATH) as status_file:
+            self.status = json.load(status_file)
+
+    def test_parse_node_status(self):
+        node_status = parse_node_status(self.status)
+
+        self.assertFalse(node_status.catching_up)
+        self.assertEqual(node_status.latest_block_height,
+                         int(self.status['result']['sync_info']['latest_block_height']))
+        self.assertEqual(node_status.latest_block_time, self.status['result']['sync_info']['latest_block_time'])
+
+    @patch('service.node_status_service.http_service.get_json')
+    def test_status_is_fetched_once_and_shared(self, get_json_mock: Mock):
+        get_json_mock.return_value = JsonResponse(status_code=200, ok=True, json=self.status)
+
+        self.assertIs(get_node_status(), get_node_status())
+        get_json_mock.assert_called_once()
+
+    @patch('service.node_status_service.http_service.get_json')
+    def test_unreachable_node_raises_connection_error(self, get_json_mock: Mock):
+        get_json_mock.return_value = JsonResponse(status_code=502, ok=False, json=None)
+
+        with self.assertRaises(ConnectionError):
+            get_node_status()
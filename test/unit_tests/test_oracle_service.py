@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from service.oracle_service import OracleMonitor, ACTIVE_DENOMS
+
+
+def prevotes(height, *prevoted):
+    return {'height': str(height), 'result': [{'voter': voter, 'denom': denom, 'submit_block': str(submit_block)}
+                                              for voter, denom, submit_block in prevoted]}
+
+
+class OracleMonitorTest(unittest.TestCase):
+    addresses = ['terravaloper1a', 'terravaloper1b', 'terravaloper1c']
+
+    def run_fetchers(self, fetchers):
+        return {key: fetcher() for key, fetcher in fetchers.items()}
+
+    @patch('service.oracle_service.get_active_denoms')
+    @patch('service.oracle_service.get_denom_prevotes')
+    @patch('service.oracle_service.get_voter_prevotes')
+    def test_prevotes_are_fetched_per_denom_when_that_needs_fewer_requests(self, voter_mock: Mock, denom_mock: Mock,
+                                                                           active_denoms_mock: Mock):
+        monitor = OracleMonitor(clock=lambda: 0)
+        voter_mock.side_effect = lambda address: prevotes(100, (address, 'uusd', 100))
+        active_denoms_mock.return_value = ['ukrw', 'uusd']
+
+        # The active denoms are not known yet
+        fetchers = monitor.fetchers(self.addresses)
+        self.assertEqual(set(fetchers), {ACTIVE_DENOMS} | {('voter_prevotes', address) for address in self.addresses})
+        monitor.price_feed_health(self.addresses, self.run_fetchers(fetchers))
+
+        denom_mock.side_effect = lambda denom: prevotes(100, ('terravaloper1a', denom, 100),
+                                                        ('terravaloper1b', denom, 80 if denom == 'uusd' else 100))
+        fetchers = monitor.fetchers(self.addresses)
+        self.assertEqual(set(fetchers), {('denom_prevotes', 'ukrw'), ('denom_prevotes', 'uusd')})
+
+        health = monitor.price_feed_health(self.addresses, self.run_fetchers(fetchers))
+        # One unhealthy price feed does not hide the others, validators without prevotes have no stale ones
+        self.assertEqual(health, {'terravaloper1a': True, 'terravaloper1b': False, 'terravaloper1c': True})
+
+        # Fewer validators than active denoms are fetched one by one
+        self.assertEqual(set(monitor.fetchers(['terravaloper1a'])), {('voter_prevotes', 'terravaloper1a')})
+
+    def test_failed_requests_leave_the_health_unknown(self):
+        monitor = OracleMonitor(bulk=False)
+
+        health = monitor.price_feed_health(self.addresses[:2], {
+            ('voter_prevotes', 'terravaloper1a'): prevotes(100, ('terravaloper1a', 'uusd', 89)),
+            ('voter_prevotes', 'terravaloper1b'): ConnectionError(),
+        })
+        self.assertEqual(health, {'terravaloper1a': False})
+
+        health = monitor.price_feed_health(self.addresses, {
+            ('denom_prevotes', 'ukrw'): prevotes(100, ('terravaloper1a', 'ukrw', 100)),
+            ('denom_prevotes', 'uusd'): ConnectionError(),
+        })
+        self.assertEqual(health, {})
@@ -0,0 +1,85 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from service import metrics_service
+from service.persistence_service import SqlitePersistence, compact_user_data
+
+
+class SqlitePersistenceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_path = os.path.join(self.directory.name, 'session.db')
+        self.pickle_path = os.path.join(self.directory.name, 'session.data')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def persistence(self):
+        return SqlitePersistence(filename=self.database_path, pickle_filename=self.pickle_path)
+
+    def test_data_survives_restart(self):
+        persistence = self.persistence()
+        persistence.update_user_data(1, {'nodes': {'terravaloper1a': {}}})
+        persistence.update_chat_data(1, {'foo': 'bar'})
+        persistence.update_bot_data({'sentry_nodes': {}})
+        persistence.flush()
+
+        restarted = self.persistence()
+        self.assertEqual(restarted.get_user_data(), {1: {'nodes': {'terravaloper1a': {}}}})
+        self.assertEqual(restarted.get_chat_data(), {1: {'foo': 'bar'}})
+        self.assertEqual(restarted.get_bot_data(), {'sentry_nodes': {}})
+        self.assertEqual(restarted.get_user_data()[2], {})
+
+    def test_only_changed_data_is_written(self):
+        persistence = self.persistence()
+        user_data = {1: {'nodes': {}}, 2: {'nodes': {}}}
+
+        for user_id, data in user_data.items():
+            persistence.update_user_data(user_id, data)
+        self.assertEqual(metrics_service.get_counter('persistence.rows_written'), 2)
+
+        user_data[2]['nodes']['terravaloper1a'] = {}
+        for user_id, data in user_data.items():
+            persistence.update_user_data(user_id, data)
+        self.assertEqual(metrics_service.get_counter('persistence.rows_written'), 3)
+
+    def test_dropped_data_is_deleted(self):
+        persistence = self.persistence()
+        persistence.update_user_data(1, {'nodes': {}})
+        persistence.update_user_data(2, {'nodes': {}})
+
+        persistence.drop_user_data(1)
+
+        self.assertEqual(self.persistence().get_user_data(), {2: {'nodes': {}}})
+
+    def test_pickle_file_is_migrated_once(self):
+        with open(self.pickle_path, 'wb') as pickle_file:
+            pickle.dump({'user_data': {1: {'job_started': True}}, 'chat_data': {1: {}},
+                         'bot_data': {'monitoring': {}}, 'conversations': {}}, pickle_file)
+
+        persistence = self.persistence()
+
+        self.assertEqual(persistence.get_user_data(), {1: {'job_started': True}})
+        self.assertEqual(persistence.get_bot_data(), {'monitoring': {}})
+        self.assertFalse(os.path.exists(self.pickle_path))
+        self.assertTrue(os.path.exists(self.pickle_path + '.migrated'))
+
+    def test_compact_user_data(self):
+        user_data = {
+            1: {'job_started': True, 'is_lcd_reachable': True, 'block_height': 1000,
+                'nodes': {'terravaloper1a': {'status': 3, 'jailed': False, 'delegator_shares': '100.0'}}},
+            2: {'job_started': True, 'nodes': {'terravaloper1b'}},
+            3: {},
+        }
+
+        compact_user_data(user_data)
+
+        self.assertEqual(user_data, {
+            1: {'job_started': True, 'nodes': {'terravaloper1a'}},
+            2: {'job_started': True, 'nodes': {'terravaloper1b'}},
+            3: {},
+        })
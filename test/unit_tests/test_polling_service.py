@@ -0,0 +1,79 @@
+import unittest
+
+from service import metrics_service
+from constants.constants import BLOCK_TIME_IN_SECONDS
+from service.polling_service import PollingCadence, create_polling_cadences
+
+
+class PollingCadenceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+        self.now = 0.0
+        self.cadence = PollingCadence('validators', interval=15, incident_interval=5, max_interval=60,
+                                      backoff_after=2, clock=lambda: self.now)
+
+    def poll_after(self, seconds, fingerprint, is_incident=False):
+        self.now += seconds
+        self.assertTrue(self.cadence.is_due())
+        return self.cadence.polled(fingerprint, is_incident=is_incident)
+
+    def test_due_after_interval(self):
+        self.assertTrue(self.cadence.is_due())
+        self.cadence.polled('v1')
+
+        self.now += 14
+        self.assertFalse(self.cadence.is_due())
+        self.now += 1
+        self.assertTrue(self.cadence.is_due())
+
+    def test_backs_off_while_unchanged_and_resets_on_change(self):
+        self.assertFalse(self.poll_after(0, 'v1'))
+        self.poll_after(15, 'v1')
+        self.poll_after(15, 'v1')
+        self.assertEqual(self.cadence.interval, 30)
+        self.poll_after(30, 'v1')
+        self.poll_after(30, 'v1')
+        self.poll_after(60, 'v1')
+        self.poll_after(60, 'v1')
+        self.assertEqual(self.cadence.interval, 60)
+
+        self.assertTrue(self.poll_after(60, 'v2'))
+        self.assertEqual(self.cadence.interval, 15)
+        self.assertEqual(metrics_service.get_timing('polling.validators.poll_interval_at_change')['count'], 1)
+        # Validators do not tell when they changed
+        self.assertEqual(metrics_service.get_timing('polling.validators.detection_latency')['count'], 0)
+        self.assertEqual(metrics_service.get_counter('polling.validators.requests'), 8)
+
+    def test_detection_latency_is_measured_from_the_change(self):
+        cadence = PollingCadence('node_status', interval=15, incident_interval=12, max_interval=15,
+                                 clock=lambda: self.now, wall_clock=lambda: 1000.0)
+        cadence.polled(100, changed_at=lambda: self.fail("The time of unchanged data is not needed"))
+        self.now += 15
+        cadence.polled(101, changed_at=lambda: 996.0)
+
+        self.assertEqual(metrics_service.get_timing('polling.node_status.detection_latency')['last'], 4.0)
+        self.assertEqual(metrics_service.get_timing('polling.node_status.poll_interval_at_change')['last'], 15.0)
+
+    def test_polls_faster_during_incidents(self):
+        self.poll_after(0, 100)
+        self.poll_after(15, 100, is_incident=True)
+        self.assertEqual(self.cadence.interval, 5)
+
+        self.cadence.failed(is_incident=True)
+        self.assertEqual(self.cadence.interval, 5)
+
+        self.poll_after(5, 101)
+        self.assertEqual(self.cadence.interval, 15)
+
+        self.cadence.failed()
+        self.assertEqual(self.cadence.interval, 15)
+
+    def test_node_status_incidents_are_polled_at_least_two_blocks_apart(self):
+        # Otherwise two polls within the same block would report a stuck block height
+        cadence = create_polling_cadences()['node_status']
+
+        cadence.failed(is_incident=True)
+        self.assertGreaterEqual(cadence.interval, 2 * BLOCK_TIME_IN_SECONDS)
+        cadence.polled(1000, is_incident=True)
+        self.assertGreaterEqual(cadence.interval, 2 * BLOCK_TIME_IN_SECONDS)
@@ -3,6 +3,7 @@ from unittest.mock import Mock, patch
 
 from constants.messages import NODE_STARTED_SYNCING_MSG, NODE_FINISHED_SYNCING_MSG
 from jobs.sentry_jobs import check_sentry_nodes_statuses
+from service.sentry_service import SentryProber
 
 
 class SentryJobsTest(unittest.TestCase):
@@ -13,9 +14,16 @@ class SentryJobsTest(unittest.TestCase):
     def setUp(self) -> None:
         self.context['bot_data'] = {}
         self.context_mock.job.context = self.context
+        self.cadence_mock = Mock()
+        self.cadence_mock.is_due.return_value = True
+        for target, value in [('jobs.sentry_jobs.polling_cadences', {'sentry_nodes': self.cadence_mock}),
+                              ('jobs.sentry_jobs.sentry_prober', SentryProber(confirm_after=2))]:
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
     @patch('jobs.sentry_jobs.SENTRY_NODES', [mock_ip])
-    @patch('jobs.sentry_jobs.is_syncing')
+    @patch('service.sentry_service.is_syncing')
     @patch('jobs.sentry_jobs.try_message_to_all_chats_and_platforms')
     def test_sentry_nodes_statuses_job(self, try_message_mock: Mock, is_syncing_mock: Mock):
         is_syncing_mock.return_value = False
@@ -24,24 +32,28 @@ class SentryJobsTest(unittest.TestCase):
 
         is_syncing_mock.return_value = True
         check_sentry_nodes_statuses(self.context_mock)
-        try_message_mock.assert_called_with(self.context_mock, NODE_STARTED_SYNCING_MSG.format(self.mock_ip),
-                                            remove_job_when_blocked=False)
+        try_message_mock.assert_not_called()
+        # An unconfirmed change is probed faster
+        self.cadence_mock.polled.assert_called_with((False,), is_incident=True, requests=1)
+        check_sentry_nodes_statuses(self.context_mock)
+        try_message_mock.assert_called_with(self.context_mock, NODE_STARTED_SYNCING_MSG.format(self.mock_ip))
 
-        is_syncing_mock.return_value = True
         check_sentry_nodes_statuses(self.context_mock)
         try_message_mock.assert_called_once()
 
         is_syncing_mock.return_value = False
         check_sentry_nodes_statuses(self.context_mock)
+        check_sentry_nodes_statuses(self.context_mock)
         self.assertEqual(try_message_mock.call_count, 2)
-        try_message_mock.assert_called_with(self.context_mock, NODE_FINISHED_SYNCING_MSG.format(self.mock_ip),
-                                            remove_job_when_blocked=False)
+        try_message_mock.assert_called_with(self.context_mock, NODE_FINISHED_SYNCING_MSG.format(self.mock_ip))
 
     @patch('jobs.sentry_jobs.SENTRY_NODES', [mock_ip])
-    @patch('jobs.sentry_jobs.is_syncing')
+    @patch('service.sentry_service.is_syncing')
     @patch('jobs.sentry_jobs.try_message_to_all_chats_and_platforms')
     def test_called_when_syncing_at_startup(self, try_message_mock: Mock, is_syncing_mock: Mock):
         is_syncing_mock.return_value = True
         check_sentry_nodes_statuses(self.context_mock)
-        try_message_mock.assert_called_with(self.context_mock, NODE_STARTED_SYNCING_MSG.format(self.mock_ip),
-                                            remove_job_when_blocked=False)
+        check_sentry_nodes_statuses(self.context_mock)
+        try_message_mock.assert_called_with(self.context_mock, NODE_STARTED_SYNCING_MSG.format(self.mock_ip))
+        # A syncing sentry node is polled faster
+        self.cadence_mock.polled.assert_called_with((True,), is_incident=True, requests=1)
@@ -0,0 +1,104 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from service import metrics_service
+from service.network_service import is_syncing
+from service.sentry_service import SentryProber
+
+
+class SentryProberTest(unittest.TestCase):
+    node_ips = ['192.168.1.1:1317', '192.168.1.2:1317']
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+        self.prober = SentryProber(concurrency=4, deadline=0.5, confirm_after=3)
+        self.sentry_nodes_data = {}
+
+    def probe(self, syncing_by_node_ip):
+        with patch('service.sentry_service.is_syncing') as is_syncing_mock:
+            is_syncing_mock.side_effect = lambda node_ip, timeout: syncing_by_node_ip[node_ip]()
+            return self.prober.probe(self.node_ips, self.sentry_nodes_data)
+
+    def test_status_only_changes_once_confirmed(self):
+        syncing = {node_ip: lambda: False for node_ip in self.node_ips}
+        syncing['192.168.1.1:1317'] = lambda: True
+
+        self.assertEqual(self.probe(syncing), [])
+        self.assertEqual(self.prober.pending_changes, {'192.168.1.1:1317'})
+        self.assertEqual(self.probe(syncing), [])
+        self.assertEqual(self.probe(syncing), [('192.168.1.1:1317', True)])
+        self.assertEqual(self.prober.pending_changes, set())
+        self.assertTrue(self.sentry_nodes_data['192.168.1.1:1317']['syncing'])
+        self.assertFalse(self.sentry_nodes_data['192.168.1.2:1317']['syncing'])
+
+    def test_single_bad_probe_does_not_flap(self):
+        syncing = {node_ip: lambda: False for node_ip in self.node_ips}
+        for result in [False, True, False, False, True, False]:
+            syncing['192.168.1.1:1317'] = lambda: result
+            self.assertEqual(self.probe(syncing), [])
+
+        self.assertEqual(metrics_service.get_counter('sentry_nodes.unconfirmed_changes'), 2)
+
+    def test_failed_probes_neither_confirm_nor_reset_a_change(self):
+        def unreachable():
+            raise ConnectionError
+
+        syncing = {node_ip: lambda: True for node_ip in self.node_ips}
+        self.probe(syncing)
+        self.probe(syncing)
+        syncing['192.168.1.1:1317'] = unreachable
+        self.assertEqual(self.probe(syncing), [('192.168.1.2:1317', True)])
+        self.assertEqual(metrics_service.get_gauge('sentry_nodes.unknown'), 1)
+
+        syncing['192.168.1.1:1317'] = lambda: True
+        self.assertEqual(self.probe(syncing), [('192.168.1.1:1317', True)])
+        self.assertEqual(len(self.prober.history('192.168.1.1:1317').probes), 4)
+
+    def test_slow_node_misses_the_deadline_without_holding_up_the_others(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        syncing = {'192.168.1.1:1317': lambda: release.wait(), '192.168.1.2:1317': lambda: True}
+
+        start = time.monotonic()
+        self.probe(syncing)
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(metrics_service.get_counter('sentry_nodes.timeouts'), 1)
+        self.assertIsNone(self.prober.history('192.168.1.1:1317').probes[-1].syncing)
+        self.assertIsNotNone(self.prober.history('192.168.1.2:1317').median_latency())
+
+    def test_probes_run_concurrently(self):
+        self.prober = SentryProber(concurrency=100, deadline=5, confirm_after=3)
+        self.node_ips = [f'10.0.{i // 256}.{i % 256}:1317' for i in range(200)]
+
+        def slow_probe():
+            time.sleep(0.05)
+            return False
+
+        start = time.monotonic()
+        self.probe({node_ip: slow_probe for node_ip in self.node_ips})
+
+        # 200 sequential probes would take 10 seconds
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(metrics_service.get_timing('sentry_nodes.probe')['count'], 200)
+
+
+class IsSyncingTest(unittest.TestCase):
+
+    @patch('service.network_service.http_service.get')
+    def test_syncing_is_read_from_the_response(self, get_mock: Mock):
+        get_mock.return_value = Mock(ok=True, content=b'{"syncing": true}')
+        self.assertTrue(is_syncing('localhost:1317', timeout=2))
+        get_mock.assert_called_with('http://localhost:1317/syncing', timeout=2)
+
+        get_mock.return_value = Mock(ok=True, content=b'{"syncing": false}')
+        self.assertFalse(is_syncing('https://sentry.example.com'))
+        get_mock.assert_called_with('https://sentry.example.com/syncing')
+
+    @patch('service.network_service.http_service.get')
+    def test_failed_requests_raise_connection_error(self, get_mock: Mock):
+        get_mock.return_value = Mock(ok=False, status_code=503, content=b'')
+        with self.assertRaises(ConnectionError):
+            is_syncing('localhost:1317')
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from service import metrics_service
+from service.slack_service import SlackOutbox, post_to_slack_webhook
+
+
+class SlackOutboxTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        metrics_service.reset_metrics()
+
+    def outbox(self, post, **kwargs):
+        settings = dict(dedup_window=60, batch_delay=0.05, batch_size=20, max_attempts=3, initial_backoff=0.01,
+                        max_backoff=0.02)
+        settings.update(kwargs)
+        return SlackOutbox(post=post, **settings)
+
+    def test_messages_are_batched_and_deduplicated(self):
+        post_mock = Mock(return_value=True)
+        outbox = self.outbox(post_mock)
+
+        outbox.put('Node jailed')
+        outbox.put('Node jailed')
+        outbox.put('Node unjailed')
+
+        self.assertTrue(outbox.join(timeout=5))
+        post_mock.assert_called_once_with(['Node jailed', 'Node unjailed'])
+        self.assertEqual(metrics_service.get_counter('slack.deduplicated'), 1)
+
+    def test_changes_back_and_forth_are_all_posted(self):
+        post_mock = Mock(return_value=True)
+        outbox = self.outbox(post_mock)
+
+        outbox.put('LCD cannot be reached', key='lcd')
+        outbox.put('LCD is reachable again', key='lcd')
+        outbox.put('LCD cannot be reached', key='lcd')
+        outbox.put('LCD cannot be reached', key='lcd')
+        outbox.put('Node jailed', key='node')
+
+        self.assertTrue(outbox.join(timeout=5))
+        post_mock.assert_called_once_with(['LCD cannot be reached', 'LCD is reachable again', 'LCD cannot be reached',
+                                           'Node jailed'])
+        self.assertEqual(metrics_service.get_counter('slack.deduplicated'), 1)
+
+    def test_same_message_is_posted_again_after_dedup_window(self):
+        post_mock = Mock(return_value=True)
+        outbox = self.outbox(post_mock, dedup_window=0)
+
+        outbox.put('Node jailed')
+        self.assertTrue(outbox.join(timeout=5))
+        outbox.put('Node jailed')
+        self.assertTrue(outbox.join(timeout=5))
+
+        self.assertEqual(post_mock.call_count, 2)
+
+    def test_batch_size_is_respected(self):
+        post_mock = Mock(return_value=True)
+        outbox = self.outbox(post_mock, batch_size=2)
+
+        for i in range(3):
+            outbox.put(str(i))
+
+        self.assertTrue(outbox.join(timeout=5))
+        self.assertEqual([call.args[0] for call in post_mock.call_args_list], [['0', '1'], ['2']])
+
+    def test_failed_posts_are_retried_with_backoff(self):
+        post_mock = Mock(side_effect=[False, False, True])
+        outbox = self.outbox(post_mock)
+
+        outbox.put('Node jailed')
+
+        self.assertTrue(outbox.join(timeout=5))
+        self.assertEqual(post_mock.call_count, 3)
+        self.assertEqual(metrics_service.get_counter('slack.posted'), 1)
+
+    def test_batch_is_dropped_after_max_attempts(self):
+        post_mock = Mock(return_value=False)
+        outbox = self.outbox(post_mock)
+
+        outbox.put('Node jailed')
+
+        self.assertTrue(outbox.join(timeout=5))
+        self.assertEqual(post_mock.call_count, 3)
+        self.assertEqual(metrics_service.get_counter('slack.dropped'), 1)
+
+    @patch('service.slack_service.http_service.post')
+    def test_post_to_slack_webhook(self, post_mock: Mock):
+        post_mock.return_value = Mock(ok=True)
+        self.assertTrue(post_to_slack_webhook(['a', 'b']))
+        self.assertEqual(post_mock.call_args.kwargs['data'], '{"text": "a\\n\\nb"}')
+
+        post_mock.side_effect = ConnectionError
+        self.assertFalse(post_to_slack_webhook(['a']))
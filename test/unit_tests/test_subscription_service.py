@@ -0,0 +1,34 @@
+import unittest
+
+from service.subscription_service import SubscriptionIndex
+
+
+class SubscriptionIndexTest(unittest.TestCase):
+
+    def test_subscribe_and_unsubscribe(self):
+        index = SubscriptionIndex()
+
+        index.subscribe(1, 'terravaloper1a')
+        index.subscribe(2, 'terravaloper1a')
+        index.subscribe(2, 'terravaloper1b')
+        self.assertEqual(index.subscribers('terravaloper1a'), {1, 2})
+        self.assertEqual(index.addresses(), {'terravaloper1a', 'terravaloper1b'})
+
+        index.unsubscribe(2, ['terravaloper1a', 'terravaloper1b', 'terravaloper1c'])
+        self.assertEqual(index.subscribers('terravaloper1a'), {1})
+        self.assertEqual(index.subscribers('terravaloper1b'), set())
+        self.assertEqual(index.addresses(), {'terravaloper1a'})
+
+    def test_rebuild_from_user_data(self):
+        index = SubscriptionIndex()
+        index.subscribe(3, 'terravaloper1c')
+
+        index.rebuild({
+            1: {'nodes': {'terravaloper1a'}},
+            2: {'nodes': {'terravaloper1a', 'terravaloper1b'}},
+            3: {},
+        })
+
+        self.assertEqual(index.subscribers('terravaloper1a'), {1, 2})
+        self.assertEqual(index.subscribers('terravaloper1b'), {2})
+        self.assertEqual(index.subscribers('terravaloper1c'), set())
@@ -0,0 +1,112 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+import service.validator_service as validator_service
+from constants.constants import VALIDATOR_QUERY_STATUSES
+from service import http_service
+from service.http_service import JsonResponse
+from service.validator_service import get_validator_snapshot, get_cached_validator_snapshot
+
+
+class ValidatorServiceTest(unittest.TestCase):
+    validators = [
+        {'operator_address': 'terravaloper1a', 'status': 2, 'jailed': False, 'delegator_shares': '1.0'},
+        {'operator_address': 'terravaloper1b', 'status': 0, 'jailed': True, 'delegator_shares': '2.0'},
+    ]
+
+    def setUp(self) -> None:
+        validator_service._snapshot = None
+
+    def validator_responses(self, changed=True, digest='digest'):
+        return [JsonResponse(status_code=200, ok=True, json=self.validators, changed=changed,
+                             digest=digest)]
+
+    @patch('service.validator_service.fetch_validator_responses')
+    def test_snapshot_is_shared_until_expired(self, fetch_mock: Mock):
+        fetch_mock.return_value = self.validator_responses()
+
+        first = get_validator_snapshot()
+        second = get_validator_snapshot()
+        self.assertIs(first, second)
+        fetch_mock.assert_called_once()
+
+        get_validator_snapshot(max_age=0)
+        self.assertEqual(fetch_mock.call_count, 2)
+
+    @patch('service.validator_service.fetch_validator_responses')
+    def test_snapshot_indexed_by_operator_address(self, fetch_mock: Mock):
+        fetch_mock.return_value = self.validator_responses()
+
+        snapshot = get_validator_snapshot()
+        self.assertEqual(len(snapshot), 2)
+        self.assertTrue(snapshot.get('terravaloper1b').jailed)
+        self.assertIsNone(snapshot.get('terravaloper1c'))
+
+    @patch('service.validator_service.fetch_validator_responses')
+    def test_failed_fetch_is_not_cached(self, fetch_mock: Mock):
+        fetch_mock.side_effect = ConnectionError
+        with self.assertRaises(ConnectionError):
+            get_validator_snapshot()
+
+        fetch_mock.side_effect = None
+        fetch_mock.return_value = self.validator_responses()
+        self.assertEqual(len(get_validator_snapshot()), 2)
+
+    @patch('service.validator_service.fetch_validator_responses')
+    def test_unchanged_responses_keep_snapshot_and_version(self, fetch_mock: Mock):
+        fetch_mock.return_value = self.validator_responses()
+        first = get_validator_snapshot()
+
+        fetch_mock.return_value = self.validator_responses(changed=False)
+        self.assertIs(get_validator_snapshot(max_age=0), first)
+
+        fetch_mock.return_value = self.validator_responses(digest='other')
+        changed = get_validator_snapshot(max_age=0)
+        self.assertIsNot(changed, first)
+        self.assertNotEqual(changed.version, first.version)
+
+    @patch('service.validator_service.fetch_validator_responses')
+    def test_secondary_indexes(self, fetch_mock: Mock):
+        fetch_mock.return_value = self.validator_responses()
+
+        snapshot = get_validator_snapshot()
+        self.assertEqual(snapshot.addresses_with_status(2), {'terravaloper1a'})
+        self.assertEqual(snapshot.addresses_with_status(0), {'terravaloper1b'})
+        self.assertEqual(snapshot.addresses_with_status(1), set())
+        self.assertEqual(snapshot.jailed_addresses(), {'terravaloper1b'})
+
+    @patch('service.validator_service.is_lcd_available')
+    @patch('service.validator_service.fetch_validator_responses')
+    def test_handlers_are_served_the_cached_snapshot(self, fetch_mock: Mock, lcd_mock: Mock):
+        fetch_mock.return_value = self.validator_responses()
+        lcd_mock.return_value = False
+
+        # Without any snapshot, an unavailable LCD is not asked
+        with self.assertRaises(ConnectionError):
+            get_cached_validator_snapshot()
+        fetch_mock.assert_not_called()
+
+        lcd_mock.return_value = True
+        first = get_cached_validator_snapshot()
+        self.assertIs(get_cached_validator_snapshot(), first)
+        fetch_mock.assert_called_once()
+
+    @patch('service.validator_service.DEBUG', False)
+    @patch('service.http_service.get_json')
+    def test_statuses_are_fetched_concurrently_within_the_deadline(self, get_json_mock: Mock):
+        release = threading.Barrier(len(VALIDATOR_QUERY_STATUSES), timeout=1)
+        deadlines = []
+
+        def get_json(*_, **__):
+            deadlines.append(http_service.current_request_deadline())
+            # Every query waits for the others, so this only passes if they run at the same time
+            release.wait()
+            return JsonResponse(status_code=200, ok=True, json=[], digest='d')
+
+        get_json_mock.side_effect = get_json
+        with http_service.request_deadline(123):
+            responses = validator_service.fetch_validator_responses()
+
+        self.assertEqual(len(responses), len(VALIDATOR_QUERY_STATUSES))
+        self.assertEqual(deadlines, [123] * len(VALIDATOR_QUERY_STATUSES))